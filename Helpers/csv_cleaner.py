@@ -7,25 +7,22 @@ seen_rows = set()
 rows_written = 0
 
 with open(input_file, newline='', encoding='utf-8') as infile, open(output_file, mode='w', newline='', encoding='utf-8') as outfile:
-    reader = csv.DictReader(infile)
-    fieldnames = reader.fieldnames
-    writer = csv.DictWriter(outfile, fieldnames=fieldnames)
-    writer.writeheader()
+    # Plain row tuples: no per-row dict, and the tuple doubles as the duplicate key
+    reader = csv.reader(infile)
+    writer = csv.writer(outfile)
+    writer.writerow(next(reader))
 
     for row in reader:
         # Remove leading/trailing whitespace from all fields
-        cleaned_row = {k: v.strip() for k, v in row.items()}
+        cleaned_row = tuple(v.strip() for v in row)
 
         # Skip rows with any empty fields
-        if not all(cleaned_row.values()):
+        if not all(cleaned_row):
             continue
 
-        # Create a tuple of values to check for duplicates
-        row_key = tuple(cleaned_row.values())
-
-        if row_key not in seen_rows:
+        if cleaned_row not in seen_rows:
             writer.writerow(cleaned_row)
-            seen_rows.add(row_key)
+            seen_rows.add(cleaned_row)
             rows_written += 1
 
 print(f"✅ Cleaned data saved to '{output_file}' ({rows_written} unique, complete rows written).")
@@ -0,0 +1,245 @@
+import argparse
+import csv
+import glob
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from multiprocessing import Pool
+
+# labels.py and quality.py live with the scrapers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Scrapers"))
+import labels  # noqa: E402
+import quality  # noqa: E402
+
+try:
+    import pyarrow as pa
+except ImportError:  # optional: JSONL shards need only the standard library
+    pa = None
+
+# ---------------- Config ----------------
+INPUT_GLOB = "../Datasets/*.csv"
+DERIVED_INPUTS = {"merged.csv"}   # csv_merger output: the same rows again, left out of the default glob
+OUTPUT_DIR = "../Datasets/shards"
+SHARD_ROWS = 5000        # rows per shard; the last shard may be smaller
+SEED = 13
+WORKERS = os.cpu_count() or 1
+MANIFEST = "manifest.json"
+LABEL_INDEX = "labels.json"    # label -> rows and shards, per multi-valued field
+DICTIONARY_FIELDS = ("domain",)  # low-cardinality string columns stored dictionary-encoded in Arrow
+
+
+def source_rules(rows):
+    """quality.RULES limited to the fields this source fills in at least once.
+
+    Field rules (required, min_length, unique_title) only apply to fields the
+    source provides: a CSV that never has an author, or has its own columns
+    altogether (papers.csv: Title, Description, ...), would otherwise lose
+    every row.
+    """
+    provided = {field for row in rows for field, value in row.items() if value and value not in quality.MISSING}
+    return quality.rules_with(
+        required=[f for f in quality.RULES["required"] if f in provided],
+        min_length={f: n for f, n in quality.RULES["min_length"].items() if f in provided},
+        unique_title=quality.RULES["unique_title"] and "title" in provided,
+    )
+
+
+def load_rows(paths, clean=True, workers=WORKERS):
+    """All rows of the input CSVs as (fieldnames, list of dicts, quality drop Counter), deduplicated by url.
+
+    Values are stripped as in csv_cleaner, and with `clean` each input goes
+    through the scrapers' quality rules (quality.apply, see `source_rules`)
+    before anything is sharded; an input that loses every row is reported.
+    Multi-valued fields (author, categories) become lists of canonical labels.
+    """
+    csv.field_size_limit(sys.maxsize)
+    fieldnames, rows, seen, drops = [], [], set(), Counter()
+    for path in paths:
+        source = []
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            for name in reader.fieldnames or []:
+                if name not in fieldnames:
+                    fieldnames.append(name)
+            for row in reader:
+                row = {k: v.strip() if isinstance(v, str) else v for k, v in row.items()}
+                key = row.get("url") or tuple(row.values())
+                if key in seen:
+                    continue
+                seen.add(key)
+                source.append(row)
+        if clean and source:
+            kept, dropped = quality.apply(source, source_rules(source), name=os.path.basename(path), workers=workers)
+            drops.update(dropped)
+            if not kept:
+                print(f"⚠️⚠️ {path}: quality dropped ALL {len(source)} rows ({dict(dropped)}); "
+                      f"this source is missing from the export")
+            source = kept
+        rows.extend(source)
+        print(f"📥 {path}: {len(rows)} rows so far")
+    for row in rows:
+        for field in labels.MULTI_VALUED:
+            if field in row:
+                row[field] = list(labels.values(field, row[field]))
+    labels.save()
+    return fieldnames, rows, drops
+
+
+def arrow_column(name, rows):
+    """One Arrow column; label lists become list<dictionary<string>>, see labels.encode."""
+    values = [row.get(name) for row in rows]
+    if name in labels.MULTI_VALUED:
+        offsets, codes, vocabulary = labels.encode([v or [] for v in values])
+        dictionary = pa.DictionaryArray.from_arrays(pa.array(codes, pa.int32()), pa.array(vocabulary, pa.string()))
+        return pa.ListArray.from_arrays(pa.array(offsets, pa.int32()), dictionary)
+    if name in DICTIONARY_FIELDS:
+        return pa.array(values, pa.string()).dictionary_encode()
+    return pa.array(values, pa.string())
+
+
+def write_shard(job):
+    """Worker: write one shard and return its manifest entry."""
+    path, fmt, fieldnames, rows = job
+    if fmt == "arrow":
+        table = pa.table({name: arrow_column(name, rows) for name in fieldnames})
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+            for row in rows:
+                f.write(json.dumps({name: row.get(name) for name in fieldnames}, ensure_ascii=False) + "\n")
+    return {
+        "file": os.path.basename(path),
+        "rows": len(rows),
+        "bytes": os.path.getsize(path),
+        "domains": dict(Counter(row.get("domain") or "-" for row in rows).most_common()),
+        "labels": {field: dict(Counter(label for row in rows for label in row.get(field) or ()))
+                   for field in labels.MULTI_VALUED if field in fieldnames},
+    }
+
+
+def export(paths, output_dir=OUTPUT_DIR, shard_rows=SHARD_ROWS, fmt="jsonl", seed=SEED, workers=WORKERS,
+           clean=True):
+    """Shuffle the rows of `paths` and write them as fixed-size compressed shards plus a manifest."""
+    if fmt == "arrow" and pa is None:
+        raise SystemExit("❌ Arrow shards need pyarrow (pip install pyarrow), or use --format jsonl")
+    fieldnames, rows, drops = load_rows(paths, clean, workers)
+    if not rows:
+        raise SystemExit("❌ No rows left to export.")
+    random.Random(seed).shuffle(rows)
+
+    os.makedirs(output_dir, exist_ok=True)
+    ext = "arrow" if fmt == "arrow" else "jsonl.gz"
+    jobs = [(os.path.join(output_dir, f"shard-{i:05d}.{ext}"), fmt, fieldnames, rows[start:start + shard_rows])
+            for i, start in enumerate(range(0, len(rows), shard_rows))]
+    t0 = time.time()
+    if workers > 1 and len(jobs) > 1:
+        with Pool(min(workers, len(jobs))) as pool:
+            shards = pool.map(write_shard, jobs)
+    else:
+        shards = [write_shard(job) for job in jobs]
+
+    domains = Counter()
+    index = {field: defaultdict(lambda: {"rows": 0, "shards": []}) for field in labels.MULTI_VALUED}
+    for shard in shards:
+        domains.update(shard["domains"])
+        for field, counts in shard.pop("labels").items():
+            for label, n in counts.items():
+                index[field][label]["rows"] += n
+                index[field][label]["shards"].append(shard["file"])
+    manifest = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "format": fmt,
+        "fields": fieldnames,
+        "seed": seed,
+        "shard_rows": shard_rows,
+        "total_rows": len(rows),
+        "total_bytes": sum(s["bytes"] for s in shards),
+        "sources": [os.path.basename(p) for p in paths],
+        "quality": {"applied": clean, "dropped": dict(drops.most_common())},
+        "domains": {d: {"rows": n, "share": round(n / len(rows), 4)} for d, n in domains.most_common()},
+        "multi_valued": [field for field in labels.MULTI_VALUED if field in fieldnames],
+        "label_index": LABEL_INDEX,
+        "shards": shards,
+    }
+    with open(os.path.join(output_dir, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    with open(os.path.join(output_dir, LABEL_INDEX), "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False)
+    print(f"✅ {len(rows)} rows -> {len(shards)} {fmt} shards in {output_dir} "
+          f"({manifest['total_bytes'] / 1e6:.1f} MB, {time.time() - t0:.1f}s)")
+    return manifest
+
+
+def read_shard(path, fmt):
+    if fmt == "arrow":
+        with pa.memory_map(path) as source:
+            yield from pa.ipc.open_file(source).read_all().to_pylist()
+    else:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+
+def label_shards(output_dir, field, label):
+    """Canonical form of `label` and the set of shard files containing it, from the label index."""
+    label = (labels.values(field, label) or ("",))[0]
+    with open(os.path.join(output_dir, LABEL_INDEX), encoding="utf-8") as f:
+        entry = json.load(f).get(field, {}).get(label)
+    return label, set(entry["shards"]) if entry else set()
+
+
+def iter_records(output_dir=OUTPUT_DIR, shards=None, author=None, category=None):
+    """Stream records back shard by shard, e.g. one worker per subset of `shards`.
+
+    `author` / `category` filters are looked up in the label index first, so
+    shards that don't contain the label are never opened.
+    """
+    with open(os.path.join(output_dir, MANIFEST), encoding="utf-8") as f:
+        manifest = json.load(f)
+    wanted = set(shards) if shards is not None else None
+    filters = []
+    for field, label in (("author", author), ("categories", category)):
+        if label:
+            label, files = label_shards(output_dir, field, label)
+            wanted = files if wanted is None else wanted & files
+            filters.append((field, label))
+    for shard in manifest["shards"]:
+        if wanted is not None and shard["file"] not in wanted:
+            continue
+        for record in read_shard(os.path.join(output_dir, shard["file"]), manifest["format"]):
+            if all(label in (record.get(field) or ()) for field, label in filters):
+                yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export dataset CSVs as shuffled, compressed training shards")
+    parser.add_argument("csv", nargs="*", help=f"Input CSVs (default: {INPUT_GLOB})")
+    parser.add_argument("-o", "--output", default=OUTPUT_DIR)
+    parser.add_argument("--shard-rows", type=int, default=SHARD_ROWS)
+    parser.add_argument("--format", choices=["jsonl", "arrow"], default="jsonl")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--no-quality", action="store_true", help="Export rows without the quality filter")
+    args = parser.parse_args()
+
+    paths = args.csv or sorted(p for p in glob.glob(INPUT_GLOB) if os.path.basename(p) not in DERIVED_INPUTS)
+    if not paths:
+        raise SystemExit("❌ No CSV files to export.")
+    manifest = export(paths, args.output, args.shard_rows, args.format, args.seed, args.workers,
+                      not args.no_quality)
+    with open(os.path.join(args.output, LABEL_INDEX), encoding="utf-8") as f:
+        index = json.load(f)
+    for field, entries in index.items():
+        print(f"🏷️ {field}: {len(entries)} distinct labels")
+    print("📊 Domain mix:")
+    for domain, mix in list(manifest["domains"].items())[:10]:
+        print(f"  {domain:<32} {mix['rows']:>7} ({mix['share']:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import argparse
+import csv
+import os
+import sys
+from collections import Counter
+
+# dates.py lives with the scrapers
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Scrapers"))
+import dates  # noqa: E402
+
+CHUNK_ROWS = 50_000   # rows normalized per batch
+
+
+def normalize_file(input_file, output_file, column="date", drop_unparsed=False):
+    """Rewrite one dataset CSV with its date column in ISO-8601 (partial dates stay partial).
+
+    Returns (rows, changed, unparsed).
+    """
+    csv.field_size_limit(sys.maxsize)
+    rows_total = changed = unparsed = 0
+    tmp = output_file + ".tmp"
+    with open(input_file, newline="", encoding="utf-8") as infile, \
+            open(tmp, "w", newline="", encoding="utf-8") as outfile:
+        reader = csv.DictReader(infile)
+        writer = csv.DictWriter(outfile, fieldnames=reader.fieldnames)
+        writer.writeheader()
+
+        def flush(chunk):
+            nonlocal changed, unparsed
+            values = [row.get(column) for row in chunk]
+            normalized = dates.normalize_many(values, [row.get("domain") for row in chunk],
+                                              keep_unparsed=not drop_unparsed)
+            for row, old, new in zip(chunk, values, normalized):
+                changed += old != new
+                unparsed += bool(old) and dates.NORMALIZED_RE.match(new or "") is None
+                row[column] = new
+            writer.writerows(chunk)
+
+        chunk = []
+        for row in reader:
+            chunk.append(row)
+            rows_total += 1
+            if len(chunk) >= CHUNK_ROWS:
+                flush(chunk)
+                chunk = []
+        flush(chunk)
+    os.replace(tmp, output_file)
+    return rows_total, changed, unparsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize dataset date columns to ISO-8601 (YYYY-MM-DD, YYYY-MM or YYYY)")
+    parser.add_argument("csv", nargs="+", help="Dataset CSV files")
+    parser.add_argument("--column", default="date")
+    parser.add_argument("--in-place", action="store_true", help="Overwrite the input files")
+    parser.add_argument("--suffix", default=".iso", help="Output name suffix when not in place (default: .iso)")
+    parser.add_argument("--drop-unparsed", action="store_true", help="Blank dates that can't be parsed")
+    args = parser.parse_args()
+
+    for path in args.csv:
+        root, ext = os.path.splitext(path)
+        output_file = path if args.in_place else f"{root}{args.suffix}{ext}"
+        rows, changed, unparsed = normalize_file(path, output_file, args.column, args.drop_unparsed)
+        print(f"📅 {path} -> {output_file}: {rows} rows, {changed} dates rewritten, {unparsed} unparsed")
+
+    formats = Counter(dates.detected_formats().values())
+    if formats:
+        print("🔍 Formats detected: " + ", ".join(f"{fmt} ({n} domains)" for fmt, n in formats.most_common()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,38 @@
+import argparse
+import collections
 import random
-import requests
+import re
 from bs4 import BeautifulSoup
 import csv
 import time
 from xml.etree import ElementTree as ET
 from urllib.parse import urlparse, urljoin
 
+import dates
+import fetcher
+import jsonld
+import ledger
+import metrics
+import pipeline
+import robots
+import search
+from budget import Budget
+from model import Article
+
 HEADERS = {"User-Agent": "Mozilla/5.0"}
+RATE = 1.5                # article requests per second
+BASE_URL = "https://apnews.com"
+LIMIT = 1000              # target number of articles
+OUTPUT_FILE = "ap_news_articles.csv"
+ARCHIVE_MONTHS = 12
+HUBS = ["politics", "business", "technology", "science", "entertainment", "sports", "health", "europe",
+        "asia-pacific", "latin-america", "africa"]
+HUB_PAGES = 5
+ARTICLE_LINK_RE = re.compile(rb'href="((?:https://apnews\.com)?/article/[^"#?]+)"')
 
 def fetch_sitemap_urls(sitemap_url, limit=1000):
     print(f"Fetching sitemap: {sitemap_url}")
-    res = requests.get(sitemap_url, headers=HEADERS, timeout=20)
+    res = fetcher.get(sitemap_url, headers=HEADERS, timeout=20)
     res.raise_for_status()
     root = ET.fromstring(res.text)
 
@@ -28,73 +50,73 @@ def fetch_sitemap_urls(sitemap_url, limit=1000):
     return urls
 
 
-import json
 from datetime import datetime, timedelta
 
 
-def extract_article_data(url):
-    print(f"Scraping: {url}")
-    res = requests.get(url, headers = HEADERS, timeout = 15)
-    soup = BeautifulSoup(res.text, "html.parser")
-
-    # Title
-    title = soup.select_one(".Page-headline")
-    title = title.get_text(strip = True) if title else ""
-
-    # Content - main article text is in the RichTextStoryBody div
-    content_block = soup.select_one(".RichTextStoryBody")
-    if content_block:
-        # Get all paragraphs, excluding any ads or non-content elements
-        content_paragraphs = []
-        for p in content_block.find_all("p"):
-            # Skip empty paragraphs and ad containers
-            if p.get_text(strip = True) and not p.find_parent(class_ = ["Advertisement", "FreeStar"]):
-                content_paragraphs.append(p.get_text(strip = True))
-        content = "\n".join(content_paragraphs)
-    else:
-        content = None
-
-    # Extract date from JSON-LD script tag
-    date = None
-    script_tag = soup.find('script', type = 'application/ld+json')
-    if script_tag:
-        try:
-            json_data = json.loads(script_tag.string)
-            if isinstance(json_data, list):
-                json_data = json_data[0]  # Take first item if it's a list
-
-            date_published = json_data.get('datePublished')
-            if date_published:
-                # Convert ISO format date to more readable format
-                dt = datetime.strptime(date_published, "%Y-%m-%dT%H:%M:%SZ")
-                date = dt.strftime("%B %d, %Y")  # e.g. "July 13, 2025"
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
-            print(f"Error parsing date from JSON-LD: {e}")
-
-    # Author - in the Page-authors section
-    author_element = soup.select_one(".Page-authors a")
-    if not author_element:
-        author_element = soup.select_one(".Page-authors")
-    author = author_element.get_text(strip = True) if author_element else None
-
-    # Domain
+def article_links(page):
+    """Article URLs linked from raw page bytes (no DOM needed)."""
+    return [urljoin(BASE_URL, m.decode()) for m in ARTICLE_LINK_RE.findall(page) if b"/live/" not in m]
+
+
+def fetch_article(url):
+    res = fetcher.get(url, headers = HEADERS, timeout = 15)
+    res.raise_for_status()
+    return res
+
+
+def extract_article_data(url, page=None):
+    page = fetch_article(url).content if page is None else page
     domain = urlparse(url).netloc
 
-    # Categories - from breadcrumb
-    cats = [a.get_text(strip = True) for a in soup.select(".Page-breadcrumbs a") if a.get("href")]
-    category = ", ".join(cats)
-
-    return {
-        "title": title,
-        "content": content,
-        "date": date,
-        "url": url,
-        "author": author,
-        "domain": domain,
-        "categories": category
-    }
-
-def save_csv(records, filename="ap_news_articles.csv"):
+    # Title, date, author and section straight from the JSON-LD/meta bytes
+    with metrics.timer("scan", domain = domain):
+        fields = jsonld.extract(page)
+    title, content = fields["title"], fields["content"] or None
+    author, category = fields["author"] or None, fields["categories"]
+    date = dates.normalize(fields["date"], domain)
+
+    # Only build the DOM for what the byte scan couldn't supply (usually the body)
+    if not (title and content and author and category):
+        metrics.inc("extract.fallback", domain = domain)
+        with metrics.timer("parse", domain = domain):
+            soup = BeautifulSoup(page, "html.parser")
+
+        if not title:
+            title = soup.select_one(".Page-headline")
+            title = title.get_text(strip = True) if title else ""
+
+        # Content - main article text is in the RichTextStoryBody div
+        content_block = soup.select_one(".RichTextStoryBody") if not content else None
+        if content_block:
+            # Get all paragraphs, excluding any ads or non-content elements
+            content_paragraphs = []
+            for p in content_block.find_all("p"):
+                # Skip empty paragraphs and ad containers
+                if p.get_text(strip = True) and not p.find_parent(class_ = ["Advertisement", "FreeStar"]):
+                    content_paragraphs.append(p.get_text(strip = True))
+            content = "\n".join(content_paragraphs)
+
+        # Author - in the Page-authors section
+        if not author:
+            author_element = soup.select_one(".Page-authors a") or soup.select_one(".Page-authors")
+            author = author_element.get_text(strip = True) if author_element else None
+
+        # Categories - from breadcrumb
+        if not category:
+            cats = [a.get_text(strip = True) for a in soup.select(".Page-breadcrumbs a") if a.get("href")]
+            category = ", ".join(cats)
+
+    return Article(
+        title=title,
+        content=content,
+        date=date,
+        url=url,
+        author=author,
+        domain=domain,
+        categories=category
+    )
+
+def save_csv(records, filename=OUTPUT_FILE):
     keys = ["title", "content", "date", "url", "author", "domain", "categories"]
     with open(filename, "w", encoding="utf-8", newline="") as file:
         writer = csv.DictWriter(file, fieldnames=keys)
@@ -103,129 +125,92 @@ def save_csv(records, filename="ap_news_articles.csv"):
     print(f"[✓] Saved {len(records)} records to '{filename}'")
 
 
-def fetch_archive_articles(limit=1000):
-    """Scrape articles from AP News archive pages"""
-    base_url = "https://apnews.com"
-    article_urls = set()
-
-    # 1. Archive Crawling (Month-by-Month)
+def discovery_pages(budget, related):
+    """Listing pages in priority order: monthly archives, topic hubs, then related links."""
     current_date = datetime.now()
-    months_to_check = 12  # Go back 12 months
+    for i in range(ARCHIVE_MONTHS):
+        date = current_date - timedelta(days = 30 * i)
+        yield f"{BASE_URL}/hub/archives?month={date.month}&year={date.year}"
+
+    for hub in HUBS:
+        for page in range(1, HUB_PAGES + 1):
+            # Page 1 is the hub itself (it used to be fetched twice)
+            yield f"{BASE_URL}/hub/{hub}" + (f"?page={page}" if page > 1 else "")
+
+    # Last resort: links harvested from articles already fetched, so no extra requests.
+    # None means "drain the related queue"; wait while in-flight articles may add more.
+    while not budget.saturated() and (related or budget.in_flight()):
+        if related:
+            yield None
+        else:
+            time.sleep(0.5)
+
+
+def list_candidates(page, budget, related):
+    """Candidate article URLs from one listing page, as many as the budget still wants."""
+    if page is None:
+        links = [related.popleft() for _ in range(len(related))]
+    else:
+        budget.spend()
+        res = fetcher.get(page, headers = HEADERS, timeout = 15)
+        res.raise_for_status()
+        links = article_links(res.content)
+        time.sleep(1 + random.random())
+    return budget.offer_all(u for u in links if robots.allowed(u))
 
-    for i in range(months_to_check):
-        if len(article_urls) >= limit:
-            break
 
-        date = current_date -   timedelta(days = 30 * i)
-        archive_url = f"{base_url}/hub/archives?month={date.month}&year={date.year}"
-
-        try:
-            print(f"Checking archive: {date.strftime('%B %Y')}")
-            res = requests.get(archive_url, headers = HEADERS, timeout = 15)
-            soup = BeautifulSoup(res.text, "html.parser")
-
-            for link in soup.select('a[href*="/article/"]:not([href*="/live/"])'):
-                full_url = urljoin(base_url, link['href'])
-                article_urls.add(full_url)
-                if len(article_urls) >= limit:
-                    break
-
-            time.sleep(1 + random.random())
-        except Exception as e:
-            print(f"Archive failed for {date.strftime('%B %Y')}: {e}")
-
-    # 2. Aggressive Topic Hub Crawling
-    if len(article_urls) < limit:
-        hubs = [
-            "politics", "business", "technology", "science",
-            "entertainment", "sports", "health", "europe",
-            "asia-pacific", "latin-america", "africa"
-        ]
-
-        for hub in hubs:
-            if len(article_urls) >= limit:
-                break
-
-            hub_url = f"{base_url}/hub/{hub}"
-            try:
-                print(f"Scraping hub: {hub}")
-                res = requests.get(hub_url, headers = HEADERS, timeout = 15)
-                soup = BeautifulSoup(res.text, "html.parser")
-
-                # Get all pagination pages (up to 5 pages per hub)
-                for page in range(1, 6):
-                    if len(article_urls) >= limit:
-                        break
-
-                    page_url = f"{hub_url}?page={page}"
-                    res = requests.get(page_url, headers = HEADERS, timeout = 15)
-                    soup = BeautifulSoup(res.text, "html.parser")
-
-                    for link in soup.select('a[href*="/article/"]:not([href*="/live/"])'):
-                        full_url = urljoin(base_url, link['href'])
-                        article_urls.add(full_url)
-                        if len(article_urls) >= limit:
-                            break
-
-                    time.sleep(1 + random.random())
-            except Exception as e:
-                print(f"Hub {hub} failed: {e}")
-
-    # 3. Related Articles Extraction
-    if len(article_urls) < limit:
-        # Make a copy to avoid modifying set during iteration
-        existing_urls = list(article_urls)[:100]  # Check first 100 articles
-        for url in existing_urls:
-            if len(article_urls) >= limit:
-                break
-
-            try:
-                print(f"Checking related articles for: {url[:60]}...")
-                res = requests.get(url, headers = HEADERS, timeout = 15)
-                soup = BeautifulSoup(res.text, "html.parser")
-
-                for link in soup.select('a[href*="/article/"]:not([href*="/live/"])'):
-                    full_url = urljoin(base_url, link['href'])
-                    article_urls.add(full_url)
-                    if len(article_urls) >= limit:
-                        break
-
-                time.sleep(1 + random.random())
-            except Exception as e:
-                print(f"Failed to get related articles for {url}: {e}")
-
-    return list(article_urls)[:limit]
-# (Keep your existing fetch_sitemap_urls, extract_article_data, save_csv functions)
-
-def main():
-    print("🚀 Starting URL discovery...")
-    urls = fetch_archive_articles(limit = 1000)
-    print(f"\nFound {len(urls)} article URLs. Sample:")
+def dry_run(limit):
+    """Walk discovery only (no article fetches) and show what a real run would scrape."""
+    budget = Budget(limit, "ap", prior_yield=1.0, margin=1.0)
+    urls = []
+    for page in budget.pages(discovery_pages(budget, collections.deque())):
+        found = list_candidates(page, budget, None)
+        for _ in found:
+            budget.record(True)   # assume every candidate yields, so nothing stays "in flight"
+        urls += found
+    print(f"\n🔍 Dry run: {len(urls)} candidate URLs from {budget.requests} listing pages. Sample:")
     for url in urls[:5]:
         print(f"  → {url}")
 
-    # SANITY CHECK
-    confirmation = input("\nType 'yes' to proceed with scraping (or anything else to abort): ").strip().lower()
-    if confirmation != "yes":
-        print("❌ Aborted by user")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape AP News articles")
+    parser.add_argument("--limit", type=int, default=LIMIT, help="Target number of articles")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--rate", type=float, default=RATE, help="Max article requests per second")
+    parser.add_argument("--dry-run", action="store_true", help="Discover and list candidate URLs, then stop")
+    args = parser.parse_args(argv)
+
+    if args.dry_run:
+        dry_run(args.limit)
         return
 
-    print("\n⏳ Starting article scraping...")
-    data_records = []
-    for i, url in enumerate(urls, 1):
-        try:
-            print(f"Processing {i}/{len(urls)}: {url[:80]}...")
-            record = extract_article_data(url)
-            if record and record.get('content'):
-                data_records.append(record)
-        except Exception as e:
-            print(f"⚠️ Failed on {url}: {e}")
-
-        # Dynamic delay
-        delay = 0.5 + (0.5 if i % 100 == 0 else 0)
-        time.sleep(delay + random.random() * 0.5)
-
-    save_csv(data_records)
+    run = ledger.start("ap")
+    print(f"🚀 AP News: discovering and scraping up to {args.limit} articles")
+
+    # Discovery stops as soon as the queued candidates cover the limit at the observed
+    # yield, and articles are scraped while discovery is still running.
+    budget = Budget(args.limit, "ap")
+    related = collections.deque()
+
+    def scrape(url):
+        res = fetch_article(url)
+        if not budget.saturated():
+            related.extend(article_links(res.content))
+        record = extract_article_data(url, res.content)
+        return record if record.get('content') else None
+
+    # Failed articles are retried in the background and dead-lettered under "ap"
+    indexer = search.Indexer(source = "ap")
+    data_records = pipeline.run(budget.pages(discovery_pages(budget, related)),
+                                lambda page: list_candidates(page, budget, related), budget.wrap(scrape),
+                                max_items = args.limit, rate = args.rate, name = "ap", on_record = indexer.add,
+                                stop_on_empty = False)
+    indexer.close()
+    budget.summary()
+
+    save_csv(data_records, args.output)
+    run.finish(discovered=budget.queued, written=len(data_records))
     print("✅ All done!")
 
 
@@ -0,0 +1,240 @@
+import argparse
+import glob
+import json
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional: fall back to zlib, which every Python has
+    zstandard = None
+
+import metrics
+
+# ---------------- Config ----------------
+ARCHIVE_DIR = "page_archive"
+SEGMENT_SIZE = 256 * 1024 * 1024    # roll over to a new segment file past this many bytes
+LEVEL = 3                           # zstd level (zlib uses 6)
+
+MAGIC = b"PGA1"
+HEADER = struct.Struct("<4sBIII")   # magic, codec, url length, raw length, compressed length
+CODEC_ZLIB, CODEC_ZSTD = 0, 1
+
+
+# ---------------- Codecs ----------------
+_local = threading.local()
+
+
+def _compress(body):
+    if zstandard is not None:
+        if not hasattr(_local, "zc"):
+            _local.zc = zstandard.ZstdCompressor(level=LEVEL)
+        return CODEC_ZSTD, _local.zc.compress(body)
+    return CODEC_ZLIB, zlib.compress(body, 6)
+
+
+def _decompress(codec, data, raw_len):
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    if zstandard is None:
+        raise RuntimeError("page archive segment is zstd-compressed; pip install zstandard to read it")
+    if not hasattr(_local, "zd"):
+        _local.zd = zstandard.ZstdDecompressor()
+    return _local.zd.decompress(data, max_output_size=raw_len)
+
+
+def _read_record(buf, offset):
+    """Decode the record at `offset` of a segment buffer -> (url, body, next offset)."""
+    magic, codec, url_len, raw_len, comp_len = HEADER.unpack_from(buf, offset)
+    if magic != MAGIC:
+        raise ValueError(f"corrupt page archive record at offset {offset}")
+    start = offset + HEADER.size
+    url = bytes(buf[start:start + url_len]).decode("utf-8")
+    data = buf[start + url_len:start + url_len + comp_len]
+    return url, _decompress(codec, data, raw_len), start + url_len + comp_len
+
+
+def _complete(buf, offset):
+    """True if a whole record (header, url and data) starts at `offset`."""
+    if offset + HEADER.size > len(buf):
+        return False
+    _, _, url_len, _, comp_len = HEADER.unpack_from(buf, offset)
+    return offset + HEADER.size + url_len + comp_len <= len(buf)
+
+
+def iter_segment(path):
+    """Yield (url, body) for every record in one segment file, in write order.
+
+    Segments are independent, so a process pool can map this over
+    `PageArchive.segments()` to scan an archive in parallel.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            offset = 0
+            while offset < len(buf):
+                if not _complete(buf, offset):
+                    # Torn last record from a crashed writer: everything before it is intact
+                    metrics.inc("archive.torn")
+                    return
+                url, body, offset = _read_record(buf, offset)
+                yield url, body
+
+
+# ---------------- Archive ----------------
+class PageArchive:
+    """Append-only archive of raw fetched pages with random access by URL.
+
+    Pages are compressed one record at a time (zstd when installed, zlib
+    otherwise) into segment files; each writer process appends to its own
+    segments and to a matching `.idx` file of url/offset lines, so several
+    scrapers can archive into the same directory at once. Readers mmap the
+    segments, so any number of threads or processes can read concurrently.
+    The newest copy of a URL wins on lookup.
+    """
+
+    def __init__(self, path=ARCHIVE_DIR, segment_size=SEGMENT_SIZE, load_index=True):
+        self.path = path
+        self.segment_size = segment_size
+        self._index = {}           # url -> (segment path, offset, length, status, fetched_at)
+        self._maps = {}
+        self._lock = threading.Lock()
+        self._segment = None
+        self._idx = None
+        self._seq = 0
+        if load_index:             # write-only users (the fetcher) skip reading old indexes
+            self._load_index()
+
+    # ---- writing ----
+    def put(self, url, body, status=200):
+        """Compress and append one page. Returns its (segment, offset)."""
+        codec, data = _compress(body)
+        raw_url = url.encode("utf-8")
+        record = HEADER.pack(MAGIC, codec, len(raw_url), len(body), len(data)) + raw_url + data
+        fetched_at = int(time.time())
+        with self._lock:
+            if self._segment is None or self._segment.tell() >= self.segment_size:
+                self._roll()
+            offset = self._segment.tell()
+            self._segment.write(record)
+            self._segment.flush()
+            # JSON-quoted so tabs and newlines in a URL can't break the line format
+            self._idx.write(f"{json.dumps(url, ensure_ascii=False)}\t{offset}\t{len(record)}\t{status}\t{fetched_at}\n")
+            self._idx.flush()
+            segment = self._segment.name
+            self._index[url] = (segment, offset, len(record), status, fetched_at)
+        metrics.inc("archive.pages")
+        metrics.inc("archive.bytes", len(record))
+        return segment, offset
+
+    def _roll(self):
+        self.close_writer()
+        os.makedirs(self.path, exist_ok=True)
+        self._seq += 1
+        name = os.path.join(self.path, f"seg-{time.strftime('%Y%m%d%H%M%S')}-{os.getpid()}-{self._seq:04d}")
+        self._segment = open(name + ".pga", "ab")
+        self._idx = open(name + ".idx", "a", encoding="utf-8")
+
+    def close_writer(self):
+        if self._segment is not None:
+            self._segment.close()
+            self._idx.close()
+            self._segment = self._idx = None
+
+    # ---- reading ----
+    def _load_index(self):
+        for idx_path in sorted(glob.glob(os.path.join(self.path, "*.idx"))):
+            segment = idx_path[:-4] + ".pga"
+            with open(idx_path, encoding="utf-8") as f:
+                for line in f:
+                    parts = line.rstrip("\n").split("\t")
+                    if len(parts) != 5:
+                        continue  # torn last line from a crashed writer
+                    url, offset, length, status, fetched_at = parts
+                    if url.startswith('"'):   # older indexes hold the raw URL
+                        url = json.loads(url)
+                    self._index[url] = (segment, int(offset), int(length), int(status), int(fetched_at))
+
+    def _map(self, segment, min_size=0):
+        buf = self._maps.get(segment)
+        if buf is None or len(buf) < min_size:
+            # (Re)map; a segment we are still writing may have grown since the last map.
+            # Old maps are left to the GC so concurrent readers never see them closed.
+            with open(segment, "rb") as f:
+                buf = self._maps[segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return buf
+
+    def get(self, url):
+        """Raw body of the newest archived copy of `url`, or None."""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        segment, offset, length = entry[:3]
+        return _read_record(self._map(segment, offset + length), offset)[1]
+
+    def info(self, url):
+        """(status, fetched_at) of the newest copy of `url`, or None."""
+        entry = self._index.get(url)
+        return entry[3:] if entry else None
+
+    def urls(self):
+        return list(self._index)
+
+    def segments(self):
+        return sorted(glob.glob(os.path.join(self.path, "*.pga")))
+
+    def __contains__(self, url):
+        return url in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __iter__(self):
+        """Every archived (url, body) in write order, older copies included."""
+        for segment in self.segments():
+            yield from iter_segment(segment)
+
+    def close(self):
+        self.close_writer()
+        for buf in self._maps.values():
+            buf.close()
+        self._maps.clear()
+
+
+# ---------------- CLI ----------------
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the raw page archive")
+    parser.add_argument("--path", default=ARCHIVE_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats", help="Pages, segments and compression ratio")
+    sub.add_parser("ls", help="List archived URLs")
+    get = sub.add_parser("get", help="Print the archived body of a URL")
+    get.add_argument("url")
+    args = parser.parse_args()
+
+    archive = PageArchive(args.path)
+    if args.command == "ls":
+        for url in archive.urls():
+            print(url)
+    elif args.command == "get":
+        body = archive.get(args.url)
+        if body is None:
+            raise SystemExit(f"❌ {args.url} is not archived")
+        print(body.decode("utf-8", "replace"))
+    else:
+        segments = archive.segments()
+        stored = sum(os.path.getsize(s) for s in segments)
+        raw = sum(len(body) for _, body in archive)
+        print(f"📦 {len(archive)} URLs in {len(segments)} segments, {stored / 1e6:.1f} MB stored, "
+              f"{raw / 1e6:.1f} MB raw ({raw / stored if stored else 0:.1f}x), "
+              f"codec: {'zstd' if zstandard else 'zlib'}")
+    archive.close()
+
+
+if __name__ == "__main__":
+    main()
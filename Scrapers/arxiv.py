@@ -0,0 +1,197 @@
+import argparse
+import csv
+import io
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree.ElementTree import iterparse
+
+import fetcher
+import ledger
+import metrics
+from crawler import RateLimiter
+from model import Article
+
+# ---------------- Config ----------------
+API_URL = "https://export.arxiv.org/api/query"
+OUTPUT_FILE = os.path.join("scraped_papers", "arxiv_papers.csv")
+CHECKPOINT_FILE = os.path.join("scraped_papers", "arxiv_checkpoint.json")
+FIELDS = ["title", "content", "date", "url", "author", "domain", "categories"]
+QUERIES = ["machine learning", "climate", "neuroscience", "statistics"]
+PAGE_SIZE = 1000           # arXiv allows up to 2000 results per call
+RATE = 1 / 3               # arXiv API policy: one request every 3 seconds
+EMPTY_RETRIES = 3          # arXiv occasionally returns an empty page mid-result-set
+HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; ResearchScraper/1.0)"}
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+OPENSEARCH = "{http://a9.com/-/spec/opensearch/1.1/}"
+VERSION_RE = re.compile(r"v\d+$")
+
+# One limiter for the whole process: concurrent queries share arXiv's budget
+LIMITER = RateLimiter(RATE)
+
+
+# ---------------- Helpers ----------------
+def clean_text(text):
+    return " ".join(text.split())[:5000] if text else "N/A"
+
+
+def base_id(entry_id):
+    """'http://arxiv.org/abs/2101.00001v2' -> '2101.00001' (version-free dedup key)."""
+    return VERSION_RE.sub("", entry_id.rsplit("/abs/", 1)[-1])
+
+
+# ---------------- Streaming Parse ----------------
+def parse_feed(stream):
+    """Yield ('total', n) once, then ('entry', record) per Atom entry.
+
+    Entries are cleared as soon as they are converted, so a 1000-entry page
+    never materializes as a full tree.
+    """
+    for _, elem in iterparse(stream, events=("end",)):
+        if elem.tag == OPENSEARCH + "totalResults":
+            yield "total", int(elem.text or 0)
+        elif elem.tag == ATOM + "entry":
+            arxiv_id = base_id(elem.findtext(ATOM + "id", ""))
+            published = elem.findtext(ATOM + "published", "")
+            authors = [a.findtext(ATOM + "name", "") for a in elem.iter(ATOM + "author")]
+            cats = [c.get("term") for c in elem.iter(ATOM + "category") if c.get("term")]
+            yield "entry", Article(
+                title=clean_text(elem.findtext(ATOM + "title")),
+                content=clean_text(elem.findtext(ATOM + "summary")),
+                date=published.split("T")[0] if published else "N/A",
+                url=f"https://arxiv.org/abs/{arxiv_id}",
+                author=", ".join(a for a in authors if a) or "Multiple Authors",
+                domain="arxiv.org",
+                categories=", ".join(cats) or "arxiv, research",
+            )
+            elem.clear()
+
+
+def fetch_page(query, start, page_size=PAGE_SIZE):
+    """Return (total_results, records) for one page of `query`."""
+    params = {"search_query": f"all:{query}", "start": start, "max_results": page_size,
+              "sortBy": "submittedDate", "sortOrder": "descending"}
+    LIMITER.wait()
+    res = fetcher.get(API_URL, headers=HEADERS, timeout=60, params=params)
+    res.raise_for_status()
+    total, records = 0, []
+    with metrics.timer("parse", domain="arxiv.org"):
+        for kind, value in parse_feed(io.BytesIO(res.content)):
+            if kind == "total":
+                total = value
+            else:
+                records.append(value)
+    return total, records
+
+
+# ---------------- Harvest ----------------
+class Checkpoint:
+    """Per-query `start` offsets persisted atomically after every page."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.offsets = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.offsets = json.load(f)
+
+    def get(self, query):
+        return self.offsets.get(query, 0)
+
+    def set(self, query, start):
+        with self._lock:
+            self.offsets[query] = start
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.offsets, f, indent=2)
+            os.replace(tmp, self.path)
+
+
+def _existing_ids(output_file):
+    if not os.path.exists(output_file):
+        return set()
+    with open(output_file, newline="", encoding="utf-8") as f:
+        return {base_id(row["url"]) for row in csv.DictReader(f)}
+
+
+def harvest(queries=QUERIES, max_per_query=250, output_file=OUTPUT_FILE,
+            checkpoint_file=CHECKPOINT_FILE, page_size=PAGE_SIZE):
+    """Harvest every query concurrently into `output_file`, resuming from the checkpoint.
+
+    Records are appended as each page arrives; versioned IDs are deduplicated
+    across queries and across restarts. Returns the number of new records.
+    """
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    checkpoint = Checkpoint(checkpoint_file)
+    seen = _existing_ids(output_file)
+    write_lock = threading.Lock()
+    new_file = not os.path.exists(output_file)
+
+    with open(output_file, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if new_file:
+            writer.writeheader()
+
+        def run(query):
+            start, written, empty = checkpoint.get(query), 0, 0
+            while start < max_per_query:
+                size = min(page_size, max_per_query - start)
+                try:
+                    total, records = fetch_page(query, start, size)
+                except Exception as e:
+                    metrics.inc("extract.errors", domain="arxiv.org")
+                    metrics.log("arxiv-error", query=query, start=start, error=repr(e), interval=0)
+                    break
+                if not records:
+                    empty += 1
+                    if start >= total or empty > EMPTY_RETRIES:
+                        break
+                    continue
+                with write_lock, metrics.timer("write"):
+                    for record in records:
+                        key = base_id(record["url"])
+                        if key not in seen and record["title"] != "N/A" and record["content"] != "N/A":
+                            seen.add(key)
+                            writer.writerow(record)
+                            written += 1
+                    f.flush()
+                start += len(records)
+                checkpoint.set(query, start)
+                metrics.log(f"arxiv:{query}", start=start, total=total, written=written)
+            return written
+
+        with ThreadPoolExecutor(max_workers=len(queries) or 1) as executor:
+            counts = list(executor.map(metrics.bind(run), queries))
+
+    print(f"✅ arXiv harvest wrote {sum(counts)} new records to {output_file}")
+    return sum(counts)
+
+
+def load_records(output_file=OUTPUT_FILE):
+    with open(output_file, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+# ---------------- Main ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumable arXiv abstract harvester")
+    parser.add_argument("queries", nargs="*", default=QUERIES)
+    parser.add_argument("--max_per_query", type=int, default=10000)
+    parser.add_argument("--page_size", type=int, default=PAGE_SIZE)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE)
+    args = parser.parse_args(argv)
+
+    t0 = time.time()
+    run = ledger.start("arxiv")
+    run.finish(written=harvest(args.queries, args.max_per_query, args.output, args.checkpoint, args.page_size))
+    print(f"⏱ Finished in {round(time.time() - t0, 2)} sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import math
+import threading
+
+import metrics
+
+# ---------------- Config ----------------
+PRIOR_YIELD = 0.7          # assumed share of candidates that become records, before any are extracted
+PRIOR_WEIGHT = 10          # how many extractions the prior is worth
+MARGIN = 1.2               # queue this much more than the yield estimate says is needed
+
+
+class Budget:
+    """Target-yield budget that couples discovery to extraction for one source.
+
+    Discovery `offer()`s candidate URLs; extraction reports each outcome via
+    `record()` (or by running through `wrap()`). The running yield estimate,
+    started from PRIOR_YIELD, says how many candidates are still needed to
+    reach `target` records, so discovery stops as soon as the queue already
+    holds enough and no listing page is fetched just to be thrown away.
+    """
+
+    def __init__(self, target, name, prior_yield=PRIOR_YIELD, margin=MARGIN):
+        self.target = target
+        self.name = name
+        self.prior_yield = prior_yield
+        self.margin = margin
+        self.seen = set()
+        self.queued = 0            # candidates accepted for extraction
+        self.attempted = 0         # extractions finished (record or not)
+        self.valid = 0             # extractions that produced a record
+        self.requests = 0          # discovery requests spent
+        self._lock = threading.Lock()
+
+    # ---- estimates ----
+    def yield_estimate(self):
+        return (self.valid + self.prior_yield * PRIOR_WEIGHT) / (self.attempted + PRIOR_WEIGHT)
+
+    def in_flight(self):
+        return max(0, self.queued - self.attempted)   # retried failures count twice
+
+    def needed(self):
+        """Candidates still to discover, given what is queued and the yield so far."""
+        remaining = self.target - self.valid
+        if remaining <= 0:
+            return 0
+        return max(0, math.ceil(remaining / max(self.yield_estimate(), 0.05) * self.margin) - self.in_flight())
+
+    def done(self):
+        return self.valid >= self.target
+
+    def saturated(self):
+        """True once the queue holds enough candidates: discovery should stop."""
+        return self.done() or self.needed() == 0
+
+    # ---- discovery side ----
+    def offer(self, url):
+        """Accept a candidate unless it is a duplicate or the budget is already covered."""
+        with self._lock:
+            if url in self.seen or self.saturated():
+                return False
+            self.seen.add(url)
+            self.queued += 1
+        return True
+
+    def offer_all(self, urls):
+        return [url for url in urls if self.offer(url)]
+
+    def spend(self, requests=1):
+        """Count a discovery request (listing page, hub, archive)."""
+        with self._lock:
+            self.requests += requests
+        metrics.inc("budget.discovery_requests", requests, source=self.name)
+
+    def pages(self, pages):
+        """Yield listing pages only while more candidates are needed.
+
+        `pages` is consumed lazily, so a generator of page URLs is never
+        advanced (or fetched) past the point the budget is covered.
+        """
+        for page in pages:
+            if self.saturated():
+                break
+            yield page
+
+    # ---- extraction side ----
+    def record(self, ok):
+        with self._lock:
+            self.attempted += 1
+            self.valid += bool(ok)
+
+    def wrap(self, fetch_detail):
+        """`fetch_detail` that reports each outcome; failures count as misses and re-raise."""
+        def run(item):
+            try:
+                record = fetch_detail(item)
+            except Exception:
+                self.record(False)
+                raise
+            self.record(record is not None)
+            return record
+        return run
+
+    def summary(self):
+        metrics.set_gauge("budget.yield", round(self.yield_estimate(), 3), source=self.name)
+        print(f"🎯 {self.name}: {self.valid}/{self.target} records from {self.attempted} candidates "
+              f"({self.queued} queued, yield {self.yield_estimate():.0%}), {self.requests} discovery requests")
@@ -0,0 +1,182 @@
+import argparse
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter
+
+import metrics
+
+# ---------------- Config ----------------
+HASH_FIELDS = ("title", "content")   # what counts as a change to an article
+INDEX_SUFFIX = ".index.json"
+FEED_SUFFIX = ".changes.jsonl"
+
+
+def digest(data):
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def content_hash(record, fields=HASH_FIELDS):
+    """Hash of the record's normalized text: whitespace and case differences don't count."""
+    text = "\x1f".join(" ".join(str(record.get(f) or "").split()).lower() for f in fields)
+    return digest(text)
+
+
+class ChangeIndex:
+    """Per-URL content hashes kept next to a dataset, used to emit deltas.
+
+    `body_unchanged(url, body)` lets a scraper skip parsing when the raw
+    page is byte-identical to last run; `observe(record)` classifies an
+    extracted record as added / updated / unchanged. `commit()` appends the
+    run's changes (plus URLs that disappeared from the source) to the change
+    feed and saves the index.
+    """
+
+    def __init__(self, path, feed_path=None, key="url"):
+        self.path = path
+        self.feed_path = feed_path
+        self.key = key
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self._bodies = {}
+        self._changes = []
+        self._unchanged = 0
+        self._lock = threading.Lock()
+
+    def body_unchanged(self, url, body):
+        """True if the raw body matches last run's, so extraction can be skipped."""
+        h = digest(body)
+        with self._lock:
+            self._bodies[url] = h
+            entry = self.entries.get(url)
+            unchanged = entry is not None and entry.get("body") == h
+            self._unchanged += unchanged
+        if unchanged:
+            metrics.inc("changes.skipped", stage="extract")
+        return unchanged
+
+    def observe(self, record):
+        """Classify and remember one extracted record. Returns 'added', 'updated' or 'unchanged'."""
+        url = record[self.key]
+        h = content_hash(record)
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                status = "added"
+            elif entry["hash"] != h:
+                status = "updated"
+            else:
+                status = "unchanged"
+            now = time.time()
+            self.entries[url] = {
+                "hash": h,
+                "body": self._bodies.pop(url, entry.get("body") if entry else None),
+                "first_seen": entry["first_seen"] if entry else now,
+                "changed": now if status != "unchanged" else entry["changed"],
+            }
+            if status == "unchanged":
+                self._unchanged += 1
+            else:
+                self._changes.append({"op": status, "url": url, "hash": h, "record": dict(record)})
+        metrics.inc("changes." + status)
+        return status
+
+    def removed(self, current):
+        """Indexed URLs that are no longer listed by the source."""
+        current = set(current)
+        return [url for url in self.entries if url not in current]
+
+    def commit(self, current=None):
+        """Append this run's changes to the feed and save the index.
+
+        Pass the source's full URL listing as `current` to also record
+        removals; without it (or with an empty one) nothing is considered
+        removed. Only pass a listing that was fetched completely. Returns
+        (counts, removed_urls).
+        """
+        if current is not None and not current:
+            # An empty listing is a failed fetch far more often than a source that really emptied
+            print("⚠️ Empty listing: not treating any known URL as removed")
+            current = None
+        removed = self.removed(current) if current is not None else []
+        run_at = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        for url in removed:
+            self._changes.append({"op": "removed", "url": url, "hash": self.entries.pop(url)["hash"]})
+        if self.feed_path and self._changes:
+            with open(self.feed_path, "a", encoding="utf-8") as f:
+                for change in self._changes:
+                    f.write(json.dumps({"run": run_at, **change}, ensure_ascii=False) + "\n")
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp, self.path)
+
+        counts = Counter(change["op"] for change in self._changes)
+        counts["unchanged"] = self._unchanged
+        print(f"🔁 Changes: {counts['added']} added, {counts['updated']} updated, "
+              f"{counts['removed']} removed, {counts['unchanged']} unchanged")
+        self._changes, self._unchanged = [], 0
+        return counts, removed
+
+
+def for_dataset(dataset_path):
+    """Index and change feed stored alongside `dataset_path`."""
+    return ChangeIndex(dataset_path + INDEX_SUFFIX, dataset_path + FEED_SUFFIX)
+
+
+def merge_csv(path, fieldnames, changed, removed=(), key="url"):
+    """Apply changed records and removals to an existing CSV snapshot.
+
+    Unchanged rows are streamed through as-is; nothing is rewritten when
+    there is nothing to apply.
+    """
+    if not changed and not removed and os.path.exists(path):
+        print(f"✅ {path} already up to date")
+        return
+    replace = {r[key] for r in changed} | set(removed)
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        kept = 0
+        if os.path.exists(path):
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    if row.get(key) not in replace:
+                        writer.writerow(row)
+                        kept += 1
+        writer.writerows(changed)
+    os.replace(tmp, path)
+    print(f"💾 {path}: {kept} kept, {len(changed)} written, {len(removed)} removed")
+
+
+def load_feed(path, since=None):
+    """Read a change feed, optionally only runs at or after the ISO timestamp `since`."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return [e for e in entries if since is None or e["run"] >= since]
+
+
+# ---------------- CLI ----------------
+def main():
+    parser = argparse.ArgumentParser(description="Summarise a dataset's change feed")
+    parser.add_argument("dataset", help="CSV the feed belongs to (reads <dataset>.changes.jsonl)")
+    parser.add_argument("--since", help="Only runs at or after this ISO timestamp")
+    args = parser.parse_args()
+
+    entries = load_feed(args.dataset + FEED_SUFFIX, args.since)
+    for (run, op), n in sorted(Counter((e["run"], e["op"]) for e in entries).items()):
+        print(f"  {run}  {op:<8} {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import threading
+import time
+
+import metrics
+
+# ---------------- Config ----------------
+INITIAL_LIMIT = 4          # concurrent requests per host at start
+MIN_LIMIT = 1
+MAX_LIMIT = 64
+POOL_SIZE = MAX_LIMIT      # thread pools only need to be as large as the highest host limit
+WINDOW = 20                # completions per evaluation window
+LATENCY_TOLERANCE = 1.5    # p95 may drift this far above baseline and still count as flat
+MAX_ERROR_RATE = 0.05      # error rate above which the limit stops growing
+BACKOFF = 0.5              # multiplicative decrease on timeouts / 429 / 503
+THROTTLE_STATUSES = (429, 503)
+
+
+class HostController:
+    """AIMD concurrency limit for one host.
+
+    Every WINDOW completions the p95 latency and error rate are compared to
+    the best p95 seen so far: if both are flat the limit grows by one,
+    if latency climbs the limit shrinks gently. Timeouts, 429s and 503s halve
+    the limit immediately (at most once per window) and honour Retry-After.
+    A minimum interval between request starts (robots.txt Crawl-delay) is
+    enforced on top of the concurrency limit.
+    """
+
+    def __init__(self, host, initial=INITIAL_LIMIT, min_limit=MIN_LIMIT, max_limit=MAX_LIMIT):
+        self.host = host
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.min_interval = 0.0     # e.g. robots.txt Crawl-delay
+        self._next_start = 0.0
+        self.baseline = None
+        self._latencies = []
+        self._errors = 0
+        self._peak = 0
+        self._since_backoff = WINDOW
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        with self._cond:
+            while True:
+                wait = self.paused_until - time.monotonic()
+                if wait <= 0 and self.in_flight < int(self.limit):
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+            self._peak = max(self._peak, self.in_flight)
+            start = max(time.monotonic(), self._next_start)
+            self._next_start = start + self.min_interval
+        delay = start - time.monotonic()
+        if delay > 0:
+            try:
+                time.sleep(delay)
+            except BaseException:   # e.g. KeyboardInterrupt: the caller never gets the slot to release
+                with self._cond:
+                    self.in_flight -= 1
+                    self._cond.notify_all()
+                raise
+
+    def set_min_interval(self, seconds):
+        """Space request starts to this host at least `seconds` apart."""
+        with self._cond:
+            self.min_interval = max(0.0, seconds or 0.0)
+
+    def release(self, latency, outcome="ok", retry_after=None):
+        """outcome: 'ok', 'error' (counts toward error rate) or 'throttled' (back off now)."""
+        with self._cond:
+            self.in_flight -= 1
+            self._since_backoff += 1
+            if outcome == "throttled":
+                if self._since_backoff >= WINDOW:
+                    self.limit = max(self.min_limit, self.limit * BACKOFF)
+                    self._since_backoff = 0
+                    self._reset_window()
+                if retry_after:
+                    self.paused_until = max(self.paused_until, time.monotonic() + retry_after)
+            else:
+                self._latencies.append(latency)
+                self._errors += outcome == "error"
+                if len(self._latencies) >= WINDOW:
+                    self._evaluate()
+            metrics.set_gauge("concurrency.limit", int(self.limit), domain=self.host)
+            self._cond.notify_all()
+
+    def _evaluate(self):
+        latencies = sorted(self._latencies)
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        error_rate = self._errors / len(latencies)
+        if self.baseline is None or p95 < self.baseline:
+            self.baseline = p95
+        if error_rate <= MAX_ERROR_RATE and p95 <= self.baseline * LATENCY_TOLERANCE:
+            # Only grow if callers actually filled the current limit
+            if self._peak >= int(self.limit):
+                self.limit = min(self.max_limit, self.limit + 1)
+        elif p95 > self.baseline * LATENCY_TOLERANCE * 2 or error_rate > MAX_ERROR_RATE:
+            self.limit = max(self.min_limit, self.limit * 0.9)
+        self._reset_window()
+
+    def _reset_window(self):
+        self._latencies = []
+        self._errors = 0
+        self._peak = self.in_flight
+
+
+# ---------------- Registry ----------------
+_controllers = {}
+_lock = threading.Lock()
+_settings = {"initial": INITIAL_LIMIT, "min_limit": MIN_LIMIT, "max_limit": MAX_LIMIT}
+
+
+def configure(**settings):
+    """Override initial/min_limit/max_limit for controllers created after this call."""
+    _settings.update(settings)
+
+
+def for_host(host):
+    controller = _controllers.get(host)
+    if controller is None:
+        with _lock:
+            controller = _controllers.setdefault(host, HostController(host, **_settings))
+    return controller
+
+
+def classify(status_code):
+    """Map a response status to a controller outcome."""
+    if status_code in THROTTLE_STATUSES:
+        return "throttled"
+    return "error" if status_code >= 500 else "ok"
+
+
+def parse_retry_after(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
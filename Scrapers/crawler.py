@@ -0,0 +1,134 @@
+import collections
+import html
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urljoin, urlparse
+
+import concurrency
+import fetcher
+import metrics
+import retry
+import robots
+from frontier import Frontier
+from model import Batch
+
+# ---------------- Config ----------------
+WORKERS = concurrency.POOL_SIZE   # thread ceiling; fetcher adapts per-host concurrency
+RATE = 4.0                # max requests per second per site
+TIMEOUT = 15
+
+# Matches the href of every <a> tag without building a DOM
+HREF_RE = re.compile(r"""<a\s[^>]*?href\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+
+
+# ---------------- Link Extraction ----------------
+def extract_links(page_html):
+    """Fast path: return raw href values from anchor tags via a regex scan."""
+    return [html.unescape(a or b or c) for a, b, c in HREF_RE.findall(page_html)]
+
+
+# ---------------- Rate Limiting ----------------
+class RateLimiter:
+    """Spaces calls at least 1/rate seconds apart across all threads."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+# ---------------- Crawl ----------------
+def crawl(start_urls, base_url, link_filter, extract, max_pages, max_depth=2,
+          workers=WORKERS, rate=RATE, headers=None, timeout=TIMEOUT, name=None, respect_robots=True,
+          on_record=None):
+    """Concurrent BFS crawl of one site.
+
+    `extract(url, page_html)` returns a record or None. `link_filter(href)`
+    decides which raw hrefs are followed; accepted links are joined against
+    `base_url` and deduplicated by the frontier when enqueued. Up to
+    `workers` fetches run in parallel, never faster than `rate` requests/sec
+    (or the site's robots.txt Crawl-delay, whichever is slower). URLs
+    disallowed by robots.txt are dropped at enqueue time. Transient failures
+    are re-queued after a jittered backoff; pages that keep failing go to the
+    dead-letter file. `on_record(record)` sees each kept record as it arrives.
+    """
+    name = name or urlparse(base_url).netloc
+    frontier = Frontier(max_depth=max_depth, allow=robots.allowed if respect_robots else None)
+    for url in start_urls:
+        frontier.push(url, 0)
+    limiter = RateLimiter(rate)
+    records = Batch()
+
+    def visit(url, depth):
+        limiter.wait()
+        response = fetcher.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        page_html = response.text
+        links = []
+        if depth < max_depth:
+            with metrics.timer("links", site=name):
+                links = [urljoin(base_url, h) for h in extract_links(page_html) if link_filter(h)]
+        with metrics.timer("extract", site=name):
+            record = extract(url, page_html)
+        return record, links
+
+    # Retries come back through `ready` once their backoff expires
+    ready = collections.deque()
+    retries = retry.RetryScheduler(lambda item, attempt: ready.append((item, attempt)), source=name)
+
+    def next_item():
+        if ready:
+            return ready.popleft()
+        item = frontier.pop()
+        return (item, 1) if item else None
+
+    visit = metrics.bind(visit)   # count fetches under the caller's run
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        in_flight = {}
+        while len(records) < max_pages:
+            while len(in_flight) < workers and len(records) + len(in_flight) < max_pages:
+                entry = next_item()
+                if entry is None:
+                    break
+                in_flight[executor.submit(visit, *entry[0])] = entry
+            if not in_flight:
+                if ready or retries.pending:
+                    time.sleep(0.1)
+                    continue
+                break
+
+            done, _ = wait(in_flight, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in done:
+                (url, depth), attempt = in_flight.pop(future)
+                try:
+                    record, links = future.result()
+                except Exception as e:
+                    metrics.inc("extract.errors", domain=urlparse(url).netloc)
+                    metrics.log(f"{name}-error", url=url, error=repr(e), attempt=attempt, interval=0.5)
+                    retries.failed((url, depth), e, attempt)
+                    continue
+                for link in links:
+                    frontier.push(link, depth + 1)
+                if record and len(records) < max_pages:
+                    records.append(record)
+                    if on_record:
+                        on_record(record)
+            metrics.set_gauge("queue.depth", len(frontier), site=name)
+            metrics.log(name, collected=len(records), queued=len(frontier), in_flight=len(in_flight))
+
+        for future in in_flight:
+            future.cancel()
+        retries.close()
+    frontier.close()
+
+    return records
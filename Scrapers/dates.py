@@ -0,0 +1,153 @@
+import re
+import threading
+from datetime import date, datetime, timezone
+
+import metrics
+
+# ---------------- Config ----------------
+# Tried in order until one parses; the winner is remembered per domain
+FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%B %d, %Y",
+    "%b %d, %Y",
+    "%d %B %Y",
+    "%d %b %Y",
+    "%A, %B %d, %Y",
+    "%a, %d %b %Y %H:%M:%S",
+    "%a, %d %b %Y",                # RFC 2822 once TAIL_RE has stripped "14:03:00 GMT" / "+0000"
+    "%B %d, %Y %I:%M %p",
+    "%b. %d, %Y",
+    "%Y/%m/%d",
+    "%m/%d/%Y",
+    "%d.%m.%Y",
+    "%B %Y",
+    "%b %Y",
+    "%Y-%m",
+    "%Y",
+]
+# Formats without a day (or month): normalized to YYYY-MM / YYYY instead of inventing the 1st
+PARTIAL = {"%B %Y": 7, "%b %Y": 7, "%Y-%m": 7, "%Y": 4}
+NORMALIZED_RE = re.compile(r"^\d{4}(?:-\d{2}(?:-\d{2})?)?$")   # what normalize() returns: YYYY[-MM[-DD]]
+
+ISO_RE = re.compile(r"^(\d{4})-(\d{2})-(\d{2})(?:$|[T ])")
+# Boilerplate around the date itself: "This page was last edited on …", "Published: …", "Updated …"
+PREFIX_RE = re.compile(r"^(?:this page was last edited on|last (?:edited|updated|modified)(?: on)?|"
+                       r"published(?: on)?|posted(?: on)?|updated(?: on)?|date)\s*:?\s*", re.IGNORECASE)
+ORDINAL_RE = re.compile(r"(\d)(?:st|nd|rd|th)\b")
+# Trailing time zones and "at 12:30" / ", 14:05 (UTC)" tails the formats don't cover
+TAIL_RE = re.compile(r"(?:,?\s+(?:at\s+)?\d{1,2}:\d{2}(?::\d{2})?\s*(?:[AaPp]\.?[Mm]\.?)?)?\s*"
+                     r"(?:\(?(?:UTC|GMT|[A-Z]{2,4}T|Z|[+-]\d{2}:?\d{2})\)?)?\s*$")
+
+_domain_formats = {}
+_lock = threading.Lock()
+
+
+def today():
+    """Today's date (UTC) as ISO-8601, for sources that have no publication date."""
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def _clean(value):
+    text = " ".join(str(value).split())
+    text = PREFIX_RE.sub("", text)
+    text = ORDINAL_RE.sub(r"\1", text)
+    return text.strip(" .,")
+
+
+def _parse(text, fmt):
+    try:
+        return datetime.strptime(text, fmt).date()
+    except ValueError:
+        return None
+
+
+def _detect(value, domain=None):
+    """(date, format) for a free-text date, or (None, None). ISO values report format "iso"."""
+    if value is None or value == "":
+        return None, None
+    if isinstance(value, datetime):
+        return value.date(), "iso"
+    if isinstance(value, date):
+        return value, "iso"
+    text = str(value).strip()
+    match = ISO_RE.match(text)
+    if match:
+        try:
+            return date(*map(int, match.groups())), "iso"
+        except ValueError:
+            return None, None
+
+    text = _clean(text)
+    candidates = [text]
+    stripped = TAIL_RE.sub("", text).strip(" .,")
+    if stripped and stripped != text:
+        candidates.append(stripped)
+
+    known = _domain_formats.get(domain)
+    if known:
+        for candidate in candidates:
+            parsed = _parse(candidate, known)
+            if parsed:
+                return parsed, known
+    for candidate in candidates:
+        for fmt in FORMATS:
+            if fmt == known:
+                continue
+            parsed = _parse(candidate, fmt)
+            if parsed:
+                if domain is not None:
+                    with _lock:
+                        _domain_formats[domain] = fmt
+                metrics.inc("dates.detected", domain=domain or "-", format=fmt)
+                return parsed, fmt
+    return None, None
+
+
+def parse(value, domain=None):
+    """Parse a free-text date into a `date`, or None.
+
+    ISO strings take a regex fast path. Otherwise the format that last
+    worked for `domain` is tried first, so each site costs one strptime per
+    value once its format has been learned. Month- or year-only values
+    return None: they have no day to put in a `date`.
+    """
+    parsed, fmt = _detect(value, domain)
+    return None if fmt in PARTIAL else parsed
+
+
+def normalize(value, domain=None, default=None):
+    """ISO-8601 form of `value` (YYYY-MM-DD, or YYYY-MM / YYYY for partial dates), or `default`."""
+    parsed, fmt = _detect(value, domain)
+    if parsed is None:
+        if value:
+            metrics.inc("dates.unparsed", domain=domain or "-")
+        return default
+    return parsed.isoformat()[:PARTIAL.get(fmt, 10)]
+
+
+def normalize_many(values, domains=None, keep_unparsed=True):
+    """Batch mode for whole columns: each distinct (value, domain) is parsed once.
+
+    Dataset date columns repeat heavily (one value per day per site), so
+    deduplicating first makes this close to linear in the number of
+    distinct dates rather than rows. Unparseable values are kept as-is
+    unless `keep_unparsed` is False, in which case they become "".
+    """
+    values = list(values)
+    domains = list(domains) if domains is not None else [None] * len(values)
+    cache = {}
+    out = []
+    for value, domain in zip(values, domains):
+        key = (value, domain)
+        result = cache.get(key)
+        if result is None:
+            result = cache[key] = normalize(value, domain, default=value if keep_unparsed else "")
+        out.append(result)
+    return out
+
+
+def detected_formats():
+    """Per-domain formats learned so far (for logging / debugging)."""
+    return dict(_domain_formats)
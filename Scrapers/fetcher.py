@@ -0,0 +1,138 @@
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+import archive
+import concurrency
+import metrics
+
+# ---------------- Config ----------------
+DEFAULT_HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; SuperScraper/5.0)"}
+DEFAULT_TIMEOUT = 15
+POOL_SIZE = 128           # keep-alive connections per host (>= concurrency.MAX_LIMIT)
+ARCHIVE_DIR = os.environ.get("SCRAPER_ARCHIVE", archive.ARCHIVE_DIR)   # "" disables the page archive
+
+
+# ---------------- Timed Connections ----------------
+class _TimedConnectionMixin:
+    """Records DNS and connect (TCP + TLS) time for every new connection."""
+
+    def connect(self):
+        host = self.host
+        original = self._dns_host
+        t0 = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(original, self.port, 0, socket.SOCK_STREAM)
+            self._dns_host = infos[0][4][0]  # connect to the address we already resolved
+        except OSError:
+            pass  # let urllib3 raise its usual NameResolutionError
+        t1 = time.perf_counter()
+        metrics.observe("fetch.dns", t1 - t0, domain=host)
+        try:
+            super().connect()
+        finally:
+            self._dns_host = original
+        metrics.observe("fetch.connect", time.perf_counter() - t1, domain=host)
+
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class InstrumentedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+def make_session(max_retries=0):
+    session = requests.Session()
+    adapter = InstrumentedAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=max_retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+SESSION = make_session()
+
+
+# ---------------- Page Archive ----------------
+_archive = None
+_archive_lock = threading.Lock()
+
+
+def page_archive():
+    """Process-wide raw page archive, opened on first use (None if disabled)."""
+    global _archive
+    if _archive is None and ARCHIVE_DIR:
+        with _archive_lock:
+            if _archive is None:
+                _archive = archive.PageArchive(ARCHIVE_DIR, load_index=False)
+    return _archive
+
+
+# ---------------- Fetch ----------------
+def get(url, session=None, headers=None, timeout=DEFAULT_TIMEOUT, **kwargs):
+    """GET `url` through the shared instrumented session.
+
+    Behaves like `requests.get` (callers still call raise_for_status), and
+    records request counts, TTFB, download time, bytes and per-domain errors.
+    Each request holds a slot from the host's adaptive concurrency controller,
+    so callers can use large thread pools without overrunning a site.
+    Successful bodies are appended to the raw page archive.
+    """
+    session = session or SESSION
+    domain = urlparse(url).hostname or url
+    controller = concurrency.for_host(domain)
+    controller.acquire()
+    scope = metrics.current_scope() or "-"
+    metrics.inc("fetch.requests", domain=domain, scope=scope)
+    t0 = time.perf_counter()
+    ttfb, outcome, retry_after = None, "error", None
+    try:
+        response = session.get(url, headers=headers or DEFAULT_HEADERS, timeout=timeout, stream=True, **kwargs)
+        ttfb = time.perf_counter() - t0
+        body = response.content  # read the body so download time is measured separately
+        outcome = concurrency.classify(response.status_code)
+        retry_after = concurrency.parse_retry_after(response.headers.get("Retry-After"))
+    except BaseException as e:
+        # Not only RequestException: decode errors, bad kwargs or Ctrl-C must not leak the host slot
+        if isinstance(e, (requests.Timeout, requests.ConnectionError)):
+            outcome = "throttled"
+        metrics.inc("fetch.errors", domain=domain, kind=type(e).__name__, scope=scope)
+        raise
+    finally:
+        controller.release(ttfb if ttfb is not None else time.perf_counter() - t0, outcome, retry_after)
+    metrics.observe("fetch.ttfb", ttfb, domain=domain)
+    metrics.observe("fetch.download", time.perf_counter() - t0 - ttfb, domain=domain)
+    metrics.inc("fetch.bytes", len(body), domain=domain, scope=scope)
+    if response.status_code >= 400:
+        metrics.inc("fetch.errors", domain=domain, kind=f"http_{response.status_code}", scope=scope)
+    elif body and page_archive() is not None:
+        # Keyed by the requested URL (query params included, before redirects)
+        requested = (response.history[0] if response.history else response).url
+        with metrics.timer("archive", domain=domain):
+            page_archive().put(requested, body, response.status_code)
+    return response
@@ -1,19 +1,30 @@
-import requests
-import csv
 import time
 import argparse
+import json
+import math
 import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
-from playwright.sync_api import sync_playwright
-from datetime import datetime
+
+import concurrency
+import dates
+import fetcher
+import labels
+import ledger
+import maintext
+import metrics
+import quality
+import retry
+from budget import Budget
+from model import Article, Batch, read_csv
 
 # Set up session with retries
-session = requests.Session()
 retries = Retry(total=3, backoff_factor=2, status_forcelist=[429, 500, 502, 503, 504])
-session.mount("https://", HTTPAdapter(max_retries=retries))
+session = fetcher.make_session(max_retries=retries)
 
 # Headers for scraping
 HEADERS = {
@@ -22,6 +33,14 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.5"
 }
 
+# World Bank indicator notes are short, so they get a lower content minimum
+WORLDBANK_RULES = quality.rules_with(min_length={"title": 3, "content": 30})
+SOURCE_RULES = {"data.worldbank.org": WORLDBANK_RULES}   # domain -> quality rules; others use quality.RULES
+WORLDBANK_API = "https://api.worldbank.org/v2"
+WORLDBANK_PER_PAGE = 5000       # the API accepts large pages; the indicator catalog is ~30k entries
+WORLDBANK_STATE = "../Datasets/worldbank_sources.json"   # lastupdated per source database, for --worldbank_incremental
+WORKERS = concurrency.POOL_SIZE  # thread ceiling; fetcher adapts per-host concurrency
+
 
 def extract_domain(url):
     """Extract domain from URL."""
@@ -34,7 +53,7 @@ def extract_domain(url):
 
 def get_current_date():
     """Get current date in YYYY-MM-DD format."""
-    return datetime.now().strftime("%Y-%m-%d")
+    return dates.today()
 
 
 def clean_text(text):
@@ -54,8 +73,10 @@ def fetch_investopedia_articles(query, max_articles=400):
     """Scrape financial articles and definitions from Investopedia using Playwright."""
     print("[*] Collecting Investopedia articles...")
     articles = []
-    visited_urls = set()
     base_url = "https://www.investopedia.com"
+    # Start pages are only opened while the queue can't cover max_articles at the observed yield
+    budget = Budget(max_articles, "investopedia")
+    queue = deque()
 
     # Expanded start URLs to get more articles
     start_urls = [
@@ -69,16 +90,15 @@ def fetch_investopedia_articles(query, max_articles=400):
     count = 0
 
     try:
+        from playwright.sync_api import sync_playwright   # heavy; only the Investopedia path needs it
+
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
             page = browser.new_page()
 
-            # Collect article URLs from start pages
-            article_urls = set()
-            for start_url in start_urls:
-                if len(article_urls) >= max_articles * 2:  # Get more URLs than needed
-                    break
+            for start_url in budget.pages(start_urls):
                 print(f"[*] Fetching Investopedia page: {start_url}")
+                budget.spend()
                 try:
                     page.goto(start_url, timeout=30000)
                     page.wait_for_timeout(3000)
@@ -98,75 +118,24 @@ def fetch_investopedia_articles(query, max_articles=400):
                         if href and (
                                 "/terms/" in href or "/articles/" in href or "/investing/" in href or "/personal-finance/" in href):
                             full_url = urljoin(base_url, href)
-                            if full_url not in visited_urls:
-                                article_urls.add(full_url)
+                            if budget.offer(full_url):
+                                queue.append(full_url)
 
                 except Exception as e:
                     print(f"[!] Error fetching start page {start_url}: {e}")
                     continue
 
-            print(f"[*] Collected {len(article_urls)} unique article URLs")
-
-            # Scrape each article
-            for i, url in enumerate(list(article_urls)[:max_articles]):
-                if count >= max_articles:
-                    break
-                try:
-                    print(f"[*] Scraping Investopedia article {count + 1}/{max_articles}: {url}")
-                    page.goto(url, timeout=30000)
-                    page.wait_for_timeout(2000)
-                    content = page.content()
-                    soup = BeautifulSoup(content, 'html.parser')
-
-                    # Extract title
-                    title_tag = soup.find("h1") or soup.find("title")
-                    title = clean_text(title_tag.get_text()) if title_tag else "N/A"
-
-                    # Extract author
-                    author_tag = soup.find("span", class_=lambda x: x and "author" in x.lower()) or \
-                                 soup.find("div", class_=lambda x: x and "author" in x.lower()) or \
-                                 soup.find("a", class_=lambda x: x and "author" in x.lower())
-                    author = clean_text(author_tag.get_text()) if author_tag else "Investopedia Editorial Team"
-
-                    # Extract date
-                    date_tag = soup.find("time") or \
-                               soup.find("span", class_=lambda x: x and "date" in x.lower()) or \
-                               soup.find("div", class_=lambda x: x and "date" in x.lower())
-                    date = clean_text(date_tag.get_text()) if date_tag else get_current_date()
-
-                    # Extract content
-                    content_div = soup.find("div", class_=lambda x: x and "article-content" in x.lower()) or \
-                                  soup.find("main") or soup.find("article")
-                    if content_div:
-                        # Remove unwanted elements
-                        for unwanted in content_div.find_all(["nav", "aside", "footer", "script", "style", "ad"]):
-                            unwanted.decompose()
-                        content = clean_text(content_div.get_text(separator=" "))
-                    else:
-                        content = "N/A"
-
-                    # Only add if we have valid title and content
-                    if title != "N/A" and content != "N/A" and len(content) > 50:
-                        articles.append({
-                            'title': title,
-                            'content': content,
-                            'date': date,
-                            'url': url,
-                            'author': author,
-                            'domain': "investopedia.com",
-                            'categories': "finance, investment, financial education"
-                        })
-                        count += 1
-                        print(f"[+] Collected Investopedia article: {title}")
-
-                    visited_urls.add(url)
-                    time.sleep(0.5)  # Reduced delay for faster scraping
+                print(f"[*] {len(queue)} article URLs queued")
 
-                except Exception as e:
-                    print(f"[!] Error scraping Investopedia article {url}: {e}")
-                    continue
+                # Scrape what this start page yielded before deciding whether to open the next one
+                while queue and count < max_articles:
+                    url = queue.popleft()
+                    ok = scrape_investopedia_article(page, url, articles)
+                    budget.record(ok)
+                    count += ok
 
             browser.close()
+        budget.summary()
         print(f"[+] Total Investopedia articles collected: {len(articles)}")
         return articles
     except Exception as e:
@@ -174,62 +143,170 @@ def fetch_investopedia_articles(query, max_articles=400):
         return articles
 
 
-def fetch_worldbank_datasets(query, max_datasets=400):
-    """Fetch datasets from World Bank Open Data API with pagination."""
-    print("[*] Collecting World Bank datasets...")
-    datasets = []
-    rows = 100  # Increased results per request
-    page = 1
-    base_url = "https://api.worldbank.org/v2/indicator"
-
-    while len(datasets) < max_datasets:
-        params = {
-            "format": "json",
-            "per_page": rows,
-            "page": page
-        }
-        try:
-            print(f"[*] Fetching World Bank page {page}")
-            response = session.get(base_url, params=params, timeout=20, headers=HEADERS)
-            response.raise_for_status()
-            data = response.json()
-
-            if not data or len(data) < 2 or not data[1]:
-                print("[!] No more World Bank data available.")
-                break
-
-            results = data[1]  # Data[1] contains the actual results
-
-            for item in results:
-                if len(datasets) >= max_datasets:
-                    break
-
-                title = clean_text(item.get('name', ''))
-                content = clean_text(item.get('sourceNote', ''))
-
-                if title != "N/A" and content != "N/A" and len(content) > 30:
-                    datasets.append({
-                        'title': title,
-                        'content': content,
-                        'date': get_current_date(),
-                        'url': f"https://data.worldbank.org/indicator/{item.get('id', 'unknown')}",
-                        'author': "World Bank Group",
-                        'domain': "data.worldbank.org",
-                        'categories': "economics, development, statistics, global data"
-                    })
-                    print(f"[+] Collected World Bank dataset: {title[:50]}...")
-
-            if len(results) < rows:
-                print("[!] Reached end of World Bank results.")
-                break
+def scrape_investopedia_article(page, url, articles):
+    """Load one article in the shared Playwright page; append it to `articles` if it passes. Returns True if kept."""
+    try:
+        page.goto(url, timeout=30000)
+        page.wait_for_timeout(2000)
+        content = page.content()
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # Extract title
+        title_tag = soup.find("h1") or soup.find("title")
+        title = clean_text(title_tag.get_text()) if title_tag else "N/A"
+
+        # Extract author
+        author_tag = soup.find("span", class_=lambda x: x and "author" in x.lower()) or \
+                     soup.find("div", class_=lambda x: x and "author" in x.lower()) or \
+                     soup.find("a", class_=lambda x: x and "author" in x.lower())
+        author = clean_text(author_tag.get_text()) if author_tag else "Investopedia Editorial Team"
+
+        # Extract date
+        date_tag = soup.find("time") or \
+                   soup.find("span", class_=lambda x: x and "date" in x.lower()) or \
+                   soup.find("div", class_=lambda x: x and "date" in x.lower())
+        raw_date = clean_text(date_tag.get("datetime") or date_tag.get_text()) if date_tag else None
+        date = dates.normalize(raw_date, "www.investopedia.com") or get_current_date()
+
+        # Extract content (density-scored, drops the video player and promo chrome)
+        content = clean_text(maintext.extract_text(content))
+
+        record = Article(
+            title=title,
+            content=content,
+            date=date,
+            url=url,
+            author=author,
+            domain="investopedia.com",
+            categories="finance, investment, financial education"
+        )
+        time.sleep(0.5)  # Reduced delay for faster scraping
+        articles.append(record)
+        metrics.log("investopedia", collected=len(articles))
+        return True
 
-            page += 1
-            time.sleep(0.5)  # Reduced delay
+    except Exception as e:
+        metrics.inc("extract.errors", domain=extract_domain(url))
+        metrics.log("investopedia-error", url=url, error=repr(e), interval=0.5)
+        retry.record_failure("investopedia", url, e)
+        return False
+
+
+
+def worldbank_get(path, page=1, per_page=WORLDBANK_PER_PAGE):
+    """One page of a World Bank API v2 listing as (header, items)."""
+    params = {"format": "json", "per_page": per_page, "page": page}
+    response = fetcher.get(f"{WORLDBANK_API}/{path}", session=session, params=params, timeout=60, headers=HEADERS)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data, list) or len(data) < 2:
+        # Errors come back as [{"message": [...]}] with a 200 status
+        raise ValueError(f"World Bank API error for {path}: {data}")
+    return data[0], data[1] or []
+
+
+def worldbank_listing(path, max_items=None, per_page=WORLDBANK_PER_PAGE):
+    """Every item of a paged World Bank listing.
+
+    The first response reports the page count, so the remaining pages are
+    requested concurrently (fetcher still limits per-host concurrency) and
+    reassembled in page order. With `max_items`, only the pages needed to
+    cover it are fetched.
+    """
+    header, items = worldbank_get(path, 1, per_page)
+    pages = int(header.get("pages") or 1)
+    if max_items:
+        pages = min(pages, math.ceil(max_items / per_page))
+    metrics.log("worldbank", path=path, pages=pages, total=header.get("total"))
+    if pages > 1:
+        with ThreadPoolExecutor(max_workers=min(WORKERS, pages - 1)) as executor:
+            fetch_page = metrics.bind(lambda page: worldbank_get(path, page, per_page))
+            for _, more in executor.map(fetch_page, range(2, pages + 1)):
+                items.extend(more)
+    return items
+
+
+def query_terms(query):
+    """'finance OR economics' -> stems matched as word prefixes ('finan', 'econom'); '' or '*' matches all."""
+    terms = [t.strip().lower() for t in (query or "").split(" OR ") if t.strip() not in ("", "*")]
+    return [t[:max(5, len(t) - 3)] for t in terms]
+
+
+def worldbank_matches(item, terms):
+    if not terms:
+        return True
+    text = " ".join([item.get("name") or "", item.get("sourceNote") or ""] +
+                    [topic.get("value") or "" for topic in item.get("topics") or []]).lower()
+    return any(re.search(r"\b" + re.escape(term), text) for term in terms)
+
+
+def load_worldbank_state(path=WORLDBANK_STATE):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def fetch_worldbank_datasets(query, max_datasets=400, incremental=False, previous_file=None):
+    """Fetch World Bank indicators matching `query` from the API v2 catalog.
+
+    Pages are fetched concurrently at WORLDBANK_PER_PAGE. Each indicator is
+    dated by its source database's `lastupdated`. With `incremental`, only
+    databases whose `lastupdated` changed since the previous run (recorded in
+    WORLDBANK_STATE) are re-listed, and indicators from unchanged databases
+    are carried over from `previous_file`. `max_datasets` of 0/None means
+    the whole catalog.
+    """
+    print("[*] Collecting World Bank datasets...")
+    terms = query_terms(query)
+    try:
+        sources = {str(src["id"]): src for src in worldbank_listing("sources")}
+        updated = {sid: src.get("lastupdated") for sid, src in sources.items()}
+        state = load_worldbank_state(WORLDBANK_STATE)
+
+        previous = []
+        if incremental and state and previous_file and os.path.exists(previous_file):
+            previous = [row for row in read_csv(previous_file) if row.domain == "data.worldbank.org"]
+            changed = [sid for sid, stamp in updated.items() if state.get(sid) != stamp]
+            print(f"[*] {len(changed)} of {len(sources)} World Bank databases changed since the last run")
+            # Per-database listings are small; fetch them side by side
+            with ThreadPoolExecutor(max_workers=min(WORKERS, len(changed) or 1)) as executor:
+                list_source = metrics.bind(lambda sid: worldbank_listing(f"sources/{sid}/indicators"))
+                items = [item for listing in executor.map(list_source, changed) for item in listing]
+        else:
+            items = worldbank_listing("indicator", None if terms else max_datasets)
+    except Exception as e:
+        print(f"[!] Error fetching World Bank datasets: {e}")
+        return []
 
-        except Exception as e:
-            print(f"[!] Error fetching World Bank datasets: {e}")
+    datasets = []
+    for item in items:
+        if max_datasets and len(datasets) >= max_datasets:
             break
-
+        if not worldbank_matches(item, terms):
+            continue
+        source_id = str((item.get("source") or {}).get("id"))
+        record = Article(
+            title=clean_text(item.get('name', '')),
+            content=clean_text(item.get('sourceNote', '')),
+            date=dates.normalize(updated.get(source_id), "data.worldbank.org") or get_current_date(),
+            url=f"https://data.worldbank.org/indicator/{item.get('id', 'unknown')}",
+            author=clean_text(item.get('sourceOrganization') or "World Bank Group"),
+            domain="data.worldbank.org",
+            categories="economics, development, statistics, global data"
+        )
+        datasets.append(record)
+
+    if previous:
+        refreshed = {record.url for record in datasets}
+        carried = [row for row in previous if row.url not in refreshed]
+        print(f"[*] Refreshed {len(datasets)} indicators, kept {len(carried)} unchanged")
+        datasets += carried
+
+    os.makedirs(os.path.dirname(WORLDBANK_STATE) or ".", exist_ok=True)
+    with open(WORLDBANK_STATE, "w", encoding="utf-8") as f:
+        json.dump(updated, f, indent=2, sort_keys=True)
     print(f"[+] Total World Bank datasets collected: {len(datasets)}")
     return datasets
 
@@ -255,7 +332,7 @@ def fetch_imf_datasets(query, max_datasets=400):
 
         try:
             print(f"[*] Fetching IMF publications from: {search_url}")
-            response = session.get(search_url, timeout=20, headers=HEADERS)
+            response = fetcher.get(search_url, session=session, timeout=20, headers=HEADERS)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -274,41 +351,30 @@ def fetch_imf_datasets(query, max_datasets=400):
                     break
 
                 try:
-                    print(f"[*] Scraping IMF publication {len(datasets) + 1}/{max_datasets}")
-                    response = session.get(url, timeout=15, headers=HEADERS)
+                    response = fetcher.get(url, session=session, timeout=15, headers=HEADERS)
                     response.raise_for_status()
-                    soup = BeautifulSoup(response.text, 'html.parser')
-
-                    # Extract title
-                    title_tag = soup.find("h1") or soup.find("title")
-                    title = clean_text(title_tag.get_text()) if title_tag else "N/A"
-
-                    # Extract content/description
-                    content_tags = soup.find_all("p")
-                    content_parts = []
-                    for p in content_tags[:8]:  # Increased to get more content
-                        text = clean_text(p.get_text())
-                        if text != "N/A" and len(text) > 20:
-                            content_parts.append(text)
-
-                    content = " ".join(content_parts) if content_parts else "N/A"
-
-                    if title != "N/A" and content != "N/A" and len(content) > 50:
-                        datasets.append({
-                            'title': title,
-                            'content': content,
-                            'date': get_current_date(),
-                            'url': url,
-                            'author': "International Monetary Fund",
-                            'domain': "imf.org",
-                            'categories': "economics, monetary policy, global finance, IMF reports"
-                        })
-                        print(f"[+] Collected IMF publication: {title[:50]}...")
+                    page = maintext.extract(response.text)
+                    title = clean_text(page["title"])
+                    content = clean_text(page["content"])
+
+                    record = Article(
+                        title=title,
+                        content=content,
+                        date=get_current_date(),
+                        url=url,
+                        author="International Monetary Fund",
+                        domain="imf.org",
+                        categories="economics, monetary policy, global finance, IMF reports"
+                    )
+                    datasets.append(record)
+                    metrics.log("imf", collected=len(datasets), target=max_datasets)
 
                     time.sleep(0.5)  # Reduced delay
 
                 except Exception as e:
-                    print(f"[!] Error scraping IMF publication {url}: {e}")
+                    metrics.inc("extract.errors", domain=extract_domain(url))
+                    metrics.log("imf-error", url=url, error=repr(e), interval=0.5)
+                    retry.record_failure("imf", url, e)
                     continue
 
         except Exception as e:
@@ -339,7 +405,7 @@ def fetch_reuters_articles(query, max_articles=400):
                 break
 
             print(f"[*] Fetching Reuters articles from: {reuters_url}")
-            response = session.get(reuters_url, timeout=20, headers=HEADERS)
+            response = fetcher.get(reuters_url, session=session, timeout=20, headers=HEADERS)
             response.raise_for_status()
             soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -362,41 +428,30 @@ def fetch_reuters_articles(query, max_articles=400):
                     break
 
                 try:
-                    print(f"[*] Scraping Reuters article {len(articles) + 1}/{max_articles}")
-                    response = session.get(url, timeout=15, headers=HEADERS)
+                    response = fetcher.get(url, session=session, timeout=15, headers=HEADERS)
                     response.raise_for_status()
-                    soup = BeautifulSoup(response.text, 'html.parser')
-
-                    # Extract title
-                    title_tag = soup.find("h1") or soup.find("title")
-                    title = clean_text(title_tag.get_text()) if title_tag else "N/A"
-
-                    # Extract content
-                    content_divs = soup.find_all("p")
-                    content_parts = []
-                    for p in content_divs[:10]:
-                        text = clean_text(p.get_text())
-                        if text != "N/A" and len(text) > 20:
-                            content_parts.append(text)
-
-                    content = " ".join(content_parts) if content_parts else "N/A"
-
-                    if title != "N/A" and content != "N/A" and len(content) > 50:
-                        articles.append({
-                            'title': title,
-                            'content': content,
-                            'date': get_current_date(),
-                            'url': url,
-                            'author': "Reuters Editorial Team",
-                            'domain': "reuters.com",
-                            'categories': "news, finance, business, markets"
-                        })
-                        print(f"[+] Collected Reuters article: {title[:50]}...")
+                    page = maintext.extract(response.text)
+                    title = clean_text(page["title"])
+                    content = clean_text(page["content"])
+
+                    record = Article(
+                        title=title,
+                        content=content,
+                        date=get_current_date(),
+                        url=url,
+                        author="Reuters Editorial Team",
+                        domain="reuters.com",
+                        categories="news, finance, business, markets"
+                    )
+                    articles.append(record)
+                    metrics.log("reuters", collected=len(articles), target=max_articles)
 
                     time.sleep(0.5)
 
                 except Exception as e:
-                    print(f"[!] Error scraping Reuters article {url}: {e}")
+                    metrics.inc("extract.errors", domain=extract_domain(url))
+                    metrics.log("reuters-error", url=url, error=repr(e), interval=0.5)
+                    retry.record_failure("reuters", url, e)
                     continue
 
     except Exception as e:
@@ -406,58 +461,32 @@ def fetch_reuters_articles(query, max_articles=400):
     return articles
 
 
-def validate_row(row):
-    """Validate that row has all required fields and no empty values."""
-    required_fields = ["title", "content", "date", "url", "author", "domain", "categories"]
-
-    for field in required_fields:
-        value = row.get(field, "")
-        if not value or value.strip() == "" or value == "N/A":
-            return False
-
-    return True
-
-
 def save_to_csv(data, filename="finance.csv"):
     """Save the scraped data to a CSV file with complete fields."""
     REQUIRED_FIELDS = ["title", "content", "date", "url", "author", "domain", "categories"]
 
-    # Create output directory if needed
-    output_dir = os.path.dirname(filename)
-    if output_dir:
-        os.makedirs(output_dir, exist_ok=True)
-
-    # Filter out rows with missing data
-    valid_data = []
-    seen_titles = set()  # For deduplication
-
     for row in data:
-        # Ensure all fields exist and have values
-        cleaned_row = {
-            "title": clean_text(row.get("title", "")),
-            "content": clean_text(row.get("content", "")),
-            "date": row.get("date", get_current_date()),
-            "url": row.get("url", "N/A"),
-            "author": clean_text(row.get("author", "Unknown")),
-            "domain": row.get("domain") or extract_domain(row.get("url", "")),
-            "categories": row.get("categories", "general")
-        }
-
-        # Only include rows where critical fields are not "N/A" and no duplicates
-        if (cleaned_row["title"] != "N/A" and
-                cleaned_row["content"] != "N/A" and
-                cleaned_row["url"] != "N/A" and
-                len(cleaned_row["content"]) > 50 and
-                cleaned_row["title"] not in seen_titles):
-            valid_data.append(cleaned_row)
-            seen_titles.add(cleaned_row["title"])
-
+        # Clean in place: records are Articles, so there is no per-row copy
+        row.title = clean_text(row.title)
+        row.content = clean_text(row.content)
+        row.date = dates.normalize(row.date, row.domain) or get_current_date()
+        row.url = row.url or "N/A"
+        row["author"] = clean_text(row.author or "Unknown")
+        row["domain"] = row.domain or extract_domain(row.url)
+        row["categories"] = row.categories or "general"
+
+    # Required fields, length, language, boilerplate and duplicate titles: one stage per source, with its rules
+    by_domain = {}
+    for row in data:
+        by_domain.setdefault(row.domain, []).append(row)
+    valid_data = Batch()
+    for domain, rows in by_domain.items():
+        kept, _ = quality.apply(rows, SOURCE_RULES.get(domain), name=f"finance:{domain}")
+        valid_data.extend(kept)
+    labels.apply(valid_data, name="finance")
     print(f"[*] Writing {len(valid_data)} valid records to CSV (filtered from {len(data)} total)")
 
-    with open(filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=REQUIRED_FIELDS)
-        writer.writeheader()
-        writer.writerows(valid_data)
+    valid_data.write_csv(filename, REQUIRED_FIELDS)
 
     print(f"[+] Data saved to {filename}")
     print(f"[+] Total valid records: {len(valid_data)}")
@@ -468,9 +497,10 @@ def save_to_csv(data, filename="finance.csv"):
         sample = valid_data[0]
         for field in REQUIRED_FIELDS:
             print(f"  {field}: {sample[field][:100]}{'...' if len(sample[field]) > 100 else ''}")
+    return len(valid_data)
 
 
-def main():
+def main(argv=None):
     """Main function to orchestrate the scraping and saving process."""
     # Set up command-line argument parser
     parser = argparse.ArgumentParser(
@@ -484,25 +514,29 @@ def main():
     parser.add_argument("--max_investopedia", type=int, default=400,
                         help="Maximum number of Investopedia articles to fetch")
     parser.add_argument("--max_worldbank", type=int, default=400,
-                        help="Maximum number of World Bank datasets to fetch")
+                        help="Maximum number of World Bank datasets to fetch (0 = whole catalog)")
+    parser.add_argument("--worldbank_incremental", action="store_true",
+                        help="Only re-list World Bank databases updated since the last run")
     parser.add_argument("--max_imf", type=int, default=400,
                         help="Maximum number of IMF datasets to fetch")
     parser.add_argument("--max_reuters", type=int, default=400,
                         help="Maximum number of Reuters articles to fetch")
     parser.add_argument("--output", default="finance.csv",
                         help="Output CSV file name")
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     # Estimate and display the target number of data rows
     estimated_rows = estimate_total_rows(args.max_investopedia, args.max_worldbank, args.max_imf, args.max_reuters)
     print(f"[*] Estimated total data rows to be generated: {estimated_rows}")
+    run = ledger.start("finance")
 
     # Fetch data from each source
     print("\n" + "=" * 60)
     investopedia_articles = fetch_investopedia_articles(args.investopedia_query, max_articles=args.max_investopedia)
 
     print("\n" + "=" * 60)
-    worldbank_datasets = fetch_worldbank_datasets(args.worldbank_query, max_datasets=args.max_worldbank)
+    worldbank_datasets = fetch_worldbank_datasets(args.worldbank_query, max_datasets=args.max_worldbank,
+                                                  incremental=args.worldbank_incremental, previous_file=args.output)
 
     print("\n" + "=" * 60)
     imf_datasets = fetch_imf_datasets(args.imf_query, max_datasets=args.max_imf)
@@ -515,10 +549,12 @@ def main():
 
     # Save to CSV
     print("\n" + "=" * 60)
+    written = 0
     if all_data:
-        save_to_csv(all_data, filename=args.output)
+        written = save_to_csv(all_data, filename=args.output)
     else:
         print("[!] No data collected from any source.")
+    run.finish(discovered=len(all_data), written=written)
 
     print(f"[+] Total data rows actually collected: {len(all_data)}")
     print("[+] Scraping completed successfully!")
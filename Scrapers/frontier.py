@@ -0,0 +1,145 @@
+import hashlib
+import heapq
+import itertools
+import os
+import sys
+import tempfile
+import threading
+from urllib.parse import urldefrag, urlsplit
+
+# ---------------- Config ----------------
+HOT_LIMIT = 50_000         # queued URLs kept in memory before spilling to disk
+SPILL_CHUNK = 10_000       # URLs read back from disk per refill
+
+
+def normalize_url(url):
+    """Canonical form used for dedup: no fragment, no trailing '#'."""
+    return urldefrag(url)[0]
+
+
+def fingerprint(url):
+    """64-bit hash of a normalized URL; what the seen-set stores instead of the string."""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+def _split(url):
+    """Split into (interned origin, rest) so queued URLs share one copy of each host."""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    return sys.intern(origin), url[len(origin):]
+
+
+class Frontier:
+    """Crawl frontier that dedups on enqueue and pops shallowest-first.
+
+    Entries are ordered by (depth, priority, insertion order), so a crawl is
+    breadth-first by default and `priority` breaks ties within a depth
+    (lower pops first). A URL is accepted at most once for the lifetime of
+    the frontier, which keeps the queue free of duplicates. `allow(url)`
+    (e.g. robots.allowed) filters URLs before they are ever queued.
+
+    Memory stays bounded: the seen-set holds 64-bit fingerprints rather than
+    URLs, and once `hot_limit` URLs are queued further ones are appended to
+    per-depth spill files and read back in chunks when their depth comes up.
+    Spilled URLs keep their depth ordering; priority is only honoured within
+    each chunk read back.
+    """
+
+    def __init__(self, max_depth=None, allow=None, hot_limit=HOT_LIMIT, spill_dir=None):
+        self.max_depth = max_depth
+        self.allow = allow
+        self.hot_limit = hot_limit
+        self.spill_dir = spill_dir
+        self._heap = []
+        self._seen = set()
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._tmp = None
+        self._spills = {}          # depth -> [file, read offset, entries left]
+        self._spilled = 0
+
+    def push(self, url, depth=0, priority=0):
+        """Queue `url` unless it was already seen or is too deep. Returns True if queued."""
+        if self.max_depth is not None and depth > self.max_depth:
+            return False
+        url = normalize_url(url)
+        fp = fingerprint(url)
+        with self._lock:
+            if fp in self._seen:
+                return False
+            self._seen.add(fp)
+        if self.allow is not None and not self.allow(url):
+            return False
+        with self._lock:
+            if len(self._heap) < self.hot_limit:
+                heapq.heappush(self._heap, (depth, priority, next(self._order), *_split(url)))
+            else:
+                self._spill(url, depth, priority)
+        return True
+
+    def pop(self):
+        """Return the next (url, depth) or None when empty."""
+        with self._lock:
+            if self._spills:
+                shallowest = min(self._spills)
+                if not self._heap or shallowest < self._heap[0][0]:
+                    self._refill(shallowest)
+            if not self._heap:
+                return None
+            depth, _, _, origin, rest = heapq.heappop(self._heap)
+        return origin + rest, depth
+
+    def seen(self, url):
+        return fingerprint(normalize_url(url)) in self._seen
+
+    @property
+    def seen_count(self):
+        return len(self._seen)
+
+    @property
+    def spilled(self):
+        return self._spilled
+
+    def __len__(self):
+        return len(self._heap) + self._spilled
+
+    def close(self):
+        """Delete any spill files."""
+        with self._lock:
+            for f, _, _ in self._spills.values():
+                f.close()
+            self._spills.clear()
+            self._spilled = 0
+            if self._tmp is not None:
+                self._tmp.cleanup()
+                self._tmp = None
+
+    # ---- disk spill (caller holds the lock) ----
+    def _spill(self, url, depth, priority):
+        spill = self._spills.get(depth)
+        if spill is None:
+            if self._tmp is None:
+                self._tmp = tempfile.TemporaryDirectory(prefix="frontier-", dir=self.spill_dir)
+            path = os.path.join(self._tmp.name, f"depth-{depth}.txt")
+            spill = self._spills[depth] = [open(path, "a+", encoding="utf-8"), 0, 0]
+        f = spill[0]
+        f.seek(0, os.SEEK_END)
+        f.write(f"{priority}\t{url}\n")
+        spill[2] += 1
+        self._spilled += 1
+
+    def _refill(self, depth):
+        spill = self._spills[depth]
+        f = spill[0]
+        f.flush()
+        f.seek(spill[1])
+        for _ in range(min(SPILL_CHUNK, spill[2])):
+            priority, url = f.readline().rstrip("\n").split("\t", 1)
+            heapq.heappush(self._heap, (depth, float(priority), next(self._order), *_split(url)))
+            spill[2] -= 1
+            self._spilled -= 1
+        spill[1] = f.tell()
+        if not spill[2]:
+            f.close()
+            os.remove(f.name)
+            del self._spills[depth]
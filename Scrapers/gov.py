@@ -1,11 +1,18 @@
 import os
 import csv
-import time
-import requests
 from bs4 import BeautifulSoup
 import logging
 from urllib.parse import urlparse
-from datetime import datetime
+
+import concurrency
+import dates
+import fetcher
+import labels
+import ledger
+import metrics
+import pipeline
+import quality
+from model import Article
 
 # ---------------- CONFIG ----------------
 BASE_URL = "https://catalog.data.gov"
@@ -14,15 +21,17 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; OpenDataScraper/1.0; +http://example.com/bot)"
 }
 OUTPUT_DIR = "scraped_data"
-os.makedirs(OUTPUT_DIR, exist_ok=True)
 OUTPUT_CSV = os.path.join(OUTPUT_DIR, "legal_gov.csv")
 LOG_FILE = os.path.join(OUTPUT_DIR, "scraper_errors.log")
 
 MAX_PAGES = 100  # Pages to scrape (adjust as needed)
-DELAY = 1        # Delay between requests
+WORKERS = concurrency.POOL_SIZE  # Thread ceiling; fetcher adapts per-host concurrency
+RATE = 4.0       # Max dataset-page requests per second
 
 # ✅ Required output fieldnames
 FIELDNAMES = ["title", "content", "date", "url", "author", "domain", "categories"]
+# Dataset notes are often a single sentence, and titles repeat across agencies
+QUALITY_RULES = quality.rules_with(min_length={"title": 3, "content": 20}, unique_title=False)
 
 # ---------------- HELPER FUNCTIONS ----------------
 def clean_text(text):
@@ -35,7 +44,7 @@ def extract_domain(url):
 def extract_tags_from_dataset_page(url):
     """Visit dataset detail page to extract category tags"""
     try:
-        res = requests.get(url, headers=HEADERS, timeout=15)
+        res = fetcher.get(url, headers=HEADERS, timeout=15)
         res.raise_for_status()
         soup = BeautifulSoup(res.text, 'html.parser')
         tags = soup.select("section.tags li a")
@@ -46,6 +55,7 @@ def extract_tags_from_dataset_page(url):
 
 # ---------------- PARSE ONE DATASET ITEM ----------------
 def parse_dataset_item(item):
+    """Listing-page fields for one dataset; tags are filled in by fetch_dataset_details."""
     try:
         title_tag = item.select_one("h3 a")
         desc_tag = item.select_one(".notes")
@@ -54,57 +64,52 @@ def parse_dataset_item(item):
         relative_url = title_tag.get("href") if title_tag else ""
         dataset_url = BASE_URL + relative_url if relative_url else "N/A"
         content = clean_text(desc_tag.text) if desc_tag else "N/A"
-        tags = extract_tags_from_dataset_page(dataset_url)
-        time.sleep(DELAY)
-
-        return {
-            "title": title,
-            "content": content,
-            "date": datetime.utcnow().strftime("%Y-%m-%d"),
-            "url": dataset_url,
-            "author": "data.gov",
-            "domain": extract_domain(dataset_url),
-            "categories": ", ".join(tags) if tags else "government, dataset"
-        }
+
+        return Article(
+            title=title,
+            content=content,
+            date=dates.today(),
+            url=dataset_url,
+            author="data.gov",
+            domain=extract_domain(dataset_url),
+            categories="government, dataset"
+        )
 
     except Exception as e:
         logging.error(f"Error processing dataset item: {e}")
         return None
 
+def fetch_dataset_details(parsed):
+    """Detail phase: visit the dataset page for its tags (validation happens in quality.apply)."""
+    tags = extract_tags_from_dataset_page(parsed["url"])
+    if tags:
+        parsed["categories"] = ", ".join(tags)
+    return parsed
+
 # ---------------- SCRAPE PAGE ----------------
 def scrape_dataset_list(page):
-    print(f"🔍 Scraping page {page}")
+    metrics.log("data.gov", page=page)
     page_url = f"{START_URL}?page={page}"
     try:
-        res = requests.get(page_url, headers=HEADERS, timeout=15)
+        res = fetcher.get(page_url, headers=HEADERS, timeout=15)
         res.raise_for_status()
         soup = BeautifulSoup(res.text, "html.parser")
         dataset_items = soup.select(".dataset-content")
-        results = []
-
-        for item in dataset_items:
-            parsed = parse_dataset_item(item)
-            if parsed and all(parsed.get(fld) for fld in FIELDNAMES):
-                results.append(parsed)
-
-        return results
+        return [parsed for parsed in map(parse_dataset_item, dataset_items) if parsed]
     except Exception as e:
         logging.error(f"Failed to parse page {page_url}: {e}")
         return []
 
 # ---------------- SCRAPE ALL ----------------
 def scrape_all_datasets():
-    all_data = []
-    for page in range(1, MAX_PAGES + 1):
-        page_data = scrape_dataset_list(page)
-        if not page_data:
-            break
-        all_data.extend(page_data)
-        time.sleep(DELAY)
-    return all_data
+    # Listing pages run ahead while dataset pages are fetched concurrently
+    return pipeline.run(range(1, MAX_PAGES + 1), scrape_dataset_list, fetch_dataset_details,
+                        workers=WORKERS, rate=RATE, name="data.gov")
 
 # ---------------- SAVE CLEAN CSV ----------------
 def deduplicate_and_save_csv(data, output_file):
+    data, _ = quality.apply(data, QUALITY_RULES, name="data.gov")
+    labels.apply(data, name="data.gov")
     seen = set()
     cleaned = []
 
@@ -114,20 +119,24 @@ def deduplicate_and_save_csv(data, output_file):
             seen.add(key)
             cleaned.append(row)
 
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
     with open(output_file, "w", newline='', encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
         writer.writeheader()
         writer.writerows(cleaned)
 
     print(f"\n✅ Saved {len(cleaned)} clean records to {output_file}")
+    return len(cleaned)
 
 # ---------------- MAIN ----------------
 def main():
     print("🚀 Scraping legal/government datasets from data.gov ...")
+    run = ledger.start("data.gov")
     datasets = scrape_all_datasets()
+    written = deduplicate_and_save_csv(datasets, OUTPUT_CSV) if datasets else 0
+    run.finish(discovered=len(datasets), written=written)
 
     if datasets:
-        deduplicate_and_save_csv(datasets, OUTPUT_CSV)
         print("\n📌 Sample Record:")
         for key, val in datasets[0].items():
             print(f"{key}: {val[:100]}{'...' if len(val) > 100 else ''}")
@@ -0,0 +1,142 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import concurrency
+import metrics
+import scraper
+
+try:
+    import yaml
+except ImportError:  # optional: JSON job files need only the standard library
+    yaml = None
+
+# ---------------- Config ----------------
+MAX_PARALLEL = 3           # scrapers running at the same time
+DRY_RUN_SOURCES = {"ap_news", "thenewglobalorder"}   # mains that understand --dry-run
+
+# Job file (YAML or JSON):
+#
+#   max_parallel: 2
+#   max_concurrency: 16          # per-host ceiling shared by every job
+#   jobs:
+#     - source: ap               # name from `scraper.py list`, or the module name
+#       args: ["--limit", "500", "--output", "ap.csv"]
+#     - source: gov
+#       set: {MAX_PAGES: 20}     # override module constants before main() runs
+
+
+def load(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".yaml", ".yml")):
+            if yaml is None:
+                raise SystemExit("❌ YAML job files need PyYAML (pip install pyyaml), or use JSON")
+            spec = yaml.safe_load(f)
+        else:
+            spec = json.load(f)
+    if not isinstance(spec, dict) or not isinstance(spec.get("jobs"), list):
+        raise SystemExit(f"❌ {path}: expected a mapping with a 'jobs' list")
+    for i, job in enumerate(spec["jobs"]):
+        if not isinstance(job, dict) or not job.get("source"):
+            raise SystemExit(f"❌ {path}: job #{i + 1} has no 'source'")
+        try:
+            scraper.module_name(job["source"])
+        except KeyError as e:
+            raise SystemExit(f"❌ {path}: job #{i + 1}: {e.args[0]}")
+    return spec
+
+
+# Jobs of one module take turns: `set` patches its globals, and its main() may keep module state
+_module_locks = defaultdict(threading.Lock)
+
+
+def run_job(job, dry_run=False):
+    """Run one job headless, with its fetches counted under its own metrics scope.
+
+    Returns (source, status, seconds).
+    """
+    source = job["source"]
+    module = scraper.module_name(source)
+    with _module_locks[module]:
+        return metrics.bind(_run_job, scope=source)(job, dry_run)
+
+
+def _run_job(job, dry_run):
+    source = job["source"]
+    t0 = time.time()
+    argv = [str(a) for a in job.get("args") or []]
+    settings = job.get("set") or {}
+    module = scraper.load(source) if settings else None
+    saved = {name: getattr(module, name) for name in settings if hasattr(module, name)}
+    try:
+        if dry_run:
+            if scraper.module_name(source) not in DRY_RUN_SOURCES:
+                print(f"🔍 {source}: would run with {argv or 'no arguments'} {job.get('set') or ''}")
+                return source, "planned", 0.0
+            argv.append("--dry-run")
+        print(f"▶️ {source} {' '.join(argv)}")
+        scraper.run(source, argv, job.get("set"))
+        status = "ok"
+    except SystemExit as e:   # argparse errors and explicit exits from a scraper's main
+        status = "ok" if e.code in (None, 0) else "error"
+    except Exception:
+        traceback.print_exc()
+        status = "error"
+    finally:
+        for name, value in saved.items():   # the next job for this module starts from its defaults
+            setattr(module, name, value)
+    elapsed = time.time() - t0
+    print(f"{'✅' if status == 'ok' else '❌'} {source}: {status} in {elapsed:.1f}s")
+    return source, status, elapsed
+
+
+def run(spec, dry_run=False, only=None):
+    """Run the jobs of a loaded spec, several at a time in this process.
+
+    All jobs share the process-wide fetcher session, per-host concurrency
+    controllers and robots cache, so two jobs hitting the same host are
+    limited together rather than each getting their own allowance. Each job
+    runs under its own metrics scope (ledger rows count only their own
+    fetches), and jobs for the same module run one after the other.
+    """
+    if spec.get("max_concurrency"):
+        concurrency.configure(max_limit=int(spec["max_concurrency"]))
+    jobs = [job for job in spec["jobs"] if not only or job["source"] in only]
+    dry_run = dry_run or bool(spec.get("dry_run"))
+    parallel = max(1, int(spec.get("max_parallel") or MAX_PARALLEL))
+    with ThreadPoolExecutor(max_workers=min(parallel, len(jobs) or 1)) as executor:
+        results = list(executor.map(lambda job: run_job(job, dry_run), jobs))
+    for source, status, _ in results:
+        metrics.inc("jobs.finished", status=status, source=source)
+
+    print("\n📋 Jobs:")
+    for source, status, elapsed in results:
+        print(f"  {source:<24} {status:<8} {elapsed:>8.1f}s")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run scrapers headless from a YAML/JSON job file")
+    parser.add_argument("jobfile")
+    parser.add_argument("--dry-run", action="store_true", help="Discover only; no articles are scraped or written")
+    parser.add_argument("--only", nargs="+", metavar="SOURCE", help="Run just these sources from the file")
+    args = parser.parse_args(argv)
+
+    # Scrapers import their siblings and write relative paths, so run from this directory
+    here = os.path.dirname(os.path.abspath(__file__))
+    jobfile = os.path.abspath(args.jobfile)
+    sys.path.insert(0, here)
+    os.chdir(here)
+    results = run(load(jobfile), args.dry_run, args.only)
+    if any(status == "error" for _, status, _ in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import html
+import json
+import re
+
+# Byte-level scans over the raw response: no decoding of the whole page and no DOM
+SCRIPT_RE = re.compile(rb"""<script[^>]*?type\s*=\s*["']?application/ld\+json["']?[^>]*>(.*?)</script\s*>""",
+                       re.IGNORECASE | re.DOTALL)
+META_RE = re.compile(rb"<meta\s[^>]*>", re.IGNORECASE)
+ATTR_RE = re.compile(rb"""([a-zA-Z:_-]+)\s*=\s*(?:"([^"]*)"|'([^']*)')""")
+HEAD_END_RE = re.compile(rb"</head\s*>", re.IGNORECASE)
+
+ARTICLE_TYPES = {"Article", "NewsArticle", "ReportageNews", "AnalysisNewsArticle", "BlogPosting",
+                 "OpinionNewsArticle", "ScholarlyArticle", "TechArticle", "Report"}
+
+
+def _decode(raw):
+    return html.unescape(raw.decode("utf-8", "replace"))
+
+
+def scan_jsonld(page):
+    """Yield every JSON object found in JSON-LD script blocks, flattening lists and @graph."""
+    for match in SCRIPT_RE.finditer(page):
+        try:
+            data = json.loads(match.group(1).decode("utf-8", "replace"), strict=False)
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, list):
+                stack.extend(reversed(node))
+            elif isinstance(node, dict):
+                yield node
+                if "@graph" in node:
+                    stack.append(node["@graph"])
+
+
+def scan_meta(page):
+    """Map meta property/name -> content (first occurrence wins), from the <head> only."""
+    end = HEAD_END_RE.search(page)
+    head = page[:end.start()] if end else page
+    meta = {}
+    for tag in META_RE.finditer(head):
+        attrs = {k.lower(): a or b for k, a, b in ATTR_RE.findall(tag.group(0))}
+        key = attrs.get(b"property") or attrs.get(b"name") or attrs.get(b"itemprop")
+        if key and b"content" in attrs:
+            meta.setdefault(_decode(key).lower(), _decode(attrs[b"content"]))
+    return meta
+
+
+def find_article(objects):
+    """First JSON-LD object whose @type is an article type."""
+    for obj in objects:
+        types = obj.get("@type")
+        types = types if isinstance(types, list) else [types]
+        if any(t in ARTICLE_TYPES for t in types):
+            return obj
+    return None
+
+
+def _names(value):
+    """Author/publisher field -> comma-separated names (handles str, dict and lists)."""
+    if isinstance(value, list):
+        return ", ".join(filter(None, (_names(v) for v in value)))
+    if isinstance(value, dict):
+        return value.get("name", "")
+    return value or ""
+
+
+def _keywords(value):
+    if isinstance(value, list):
+        return ", ".join(str(v) for v in value)
+    return value or ""
+
+
+def extract(page):
+    """Fast path: article fields from JSON-LD, falling back to OpenGraph/meta tags.
+
+    `page` is the raw response body (bytes). Returns a dict with title,
+    content, date, author, categories and description; fields that were not
+    found are empty strings. Callers only build a DOM when a field they
+    need (usually `content`, i.e. articleBody) came back empty.
+    """
+    if isinstance(page, str):
+        page = page.encode("utf-8")
+    article = find_article(scan_jsonld(page)) or {}
+    meta = None
+
+    def from_meta(*keys):
+        nonlocal meta
+        if meta is None:
+            meta = scan_meta(page)
+        return next((meta[k] for k in keys if meta.get(k)), "")
+
+    return {
+        "title": article.get("headline") or article.get("name") or from_meta("og:title", "twitter:title"),
+        "content": article.get("articleBody") or "",
+        "date": article.get("datePublished") or from_meta("article:published_time", "datepublished", "date"),
+        "author": _names(article.get("author")) or from_meta("author", "article:author"),
+        "categories": _keywords(article.get("articleSection") or article.get("keywords"))
+                      or from_meta("article:section", "keywords"),
+        "description": article.get("description") or from_meta("og:description", "description"),
+    }
@@ -0,0 +1,170 @@
+import functools
+import json
+import os
+import re
+import threading
+from collections import Counter
+
+import metrics
+
+# ---------------- Config ----------------
+TABLES_FILE = os.environ.get("SCRAPER_LABELS", "../Datasets/label_tables.json")
+CACHE_SIZE = 1 << 16       # distinct raw strings memoized per field
+MULTI_VALUED = ("author", "categories")
+ACRONYM_MAX = 4            # a single all-caps word up to this long is an acronym (IMF, NASA), not shouting
+PLACEHOLDERS = {"", "n/a", "none", "null", "unknown", "uncategorized", "multiple authors"}
+SPLIT_RE = {
+    # "A; B" / "A | B"; not "," ("Smith, John" is one author) nor "and"/"&" (organisation names)
+    "author": re.compile(r"\s*[;|]\s*"),
+    # "finance, investment" / "news/india" (Tribune URL segments); "&" stays inside a category
+    "categories": re.compile(r"\s*[,;|/]\s*"),
+}
+JOIN = {"author": "; ", "categories": ", "}   # labels written back to one CSV field; SPLIT_RE reads them back
+AUTHOR_PREFIX_RE = re.compile(r"^(?:by|written by|posted by)\s+", re.IGNORECASE)
+
+
+# ---------------- Canonical forms ----------------
+def canonical_author(raw):
+    """'By JANE DOE ' -> 'Jane Doe'; acronyms ('IMF'), other casing ('data.gov') kept; placeholders become ''."""
+    name = AUTHOR_PREFIX_RE.sub("", " ".join(raw.split())).strip(" .,")
+    if name.lower() in PLACEHOLDERS:
+        return ""
+    if name.isupper() and (" " in name or len(name) > ACRONYM_MAX):
+        name = name.title()
+    return name
+
+
+def canonical_category(raw):
+    """'Category:Machine_learning' / 'Machine-Learning' -> 'machine learning'."""
+    text = re.sub(r"^category:", "", raw.strip(), flags=re.IGNORECASE)
+    text = " ".join(text.replace("_", " ").replace("-", " ").split()).casefold()
+    return "" if text in PLACEHOLDERS else text
+
+
+class Table:
+    """raw label -> canonical label for one field.
+
+    Lookups go through an LRU cache in front of the alias dict, which is
+    loaded from and saved to TABLES_FILE. Only entries whose canonical form
+    differs from the raw string are persisted, so the file stays small and
+    doubles as a curation point: editing a value there (e.g. "econ" ->
+    "economics", or "" to drop a label) takes effect on the next run, and
+    aliases also apply to already-canonical forms.
+    """
+
+    def __init__(self, field, canonicalize, aliases=None):
+        self.field = field
+        self.canonicalize = canonicalize
+        self.aliases = dict(aliases or {})
+        self.added = 0
+        self._lock = threading.Lock()
+        self.lookup = functools.lru_cache(maxsize=CACHE_SIZE)(self._lookup)
+        self.values = functools.lru_cache(maxsize=CACHE_SIZE)(self._values)
+
+    def _lookup(self, raw):
+        canonical = self.aliases.get(raw)
+        if canonical is None:
+            canonical = self.canonicalize(raw)
+            canonical = self.aliases.get(canonical, canonical)
+            if canonical != raw:
+                with self._lock:
+                    self.aliases[raw] = canonical
+                    self.added += 1
+        return canonical
+
+    def _values(self, value):
+        """Field value -> tuple of distinct canonical labels, in first-seen order."""
+        labels = (self.lookup(part) for part in SPLIT_RE[self.field].split(value))
+        return tuple(dict.fromkeys(label for label in labels if label))
+
+
+_tables = None
+_tables_lock = threading.Lock()
+
+
+def tables(path=None):
+    """The per-field tables, loaded from TABLES_FILE on first use (not at import)."""
+    global _tables
+    if _tables is None:
+        with _tables_lock:
+            if _tables is None:
+                try:
+                    with open(path or TABLES_FILE, encoding="utf-8") as f:
+                        saved = json.load(f)
+                except (OSError, ValueError):
+                    saved = {}
+                _tables = {
+                    "author": Table("author", canonical_author, saved.get("author")),
+                    "categories": Table("categories", canonical_category, saved.get("categories")),
+                }
+    return _tables
+
+
+def values(field, value):
+    """Canonical labels of one multi-valued field as a tuple; () for empty/placeholder values."""
+    if not value:
+        return ()
+    if not isinstance(value, str):           # already a list, e.g. read back from a shard
+        value = JOIN[field].join(value)
+    return tables()[field].values(value)
+
+
+def save(path=None):
+    """Persist new table entries; entries already in the file (curated ones) win."""
+    path = path or TABLES_FILE
+    if _tables is None or not any(t.added for t in _tables.values()):
+        return
+    try:
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    for field, table in _tables.items():
+        saved[field] = {**table.aliases, **saved.get(field, {})}
+        table.added = 0
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(saved, f, indent=1, sort_keys=True, ensure_ascii=False)
+
+
+# ---------------- Stage ----------------
+def apply(records, name="labels"):
+    """Rewrite author/categories of each record to canonical labels joined with JOIN (in place).
+
+    CSV outputs keep one string per field; columnar outputs take `values()`
+    directly. Returns the records and a Counter of rewritten values per field.
+    """
+    changed = Counter()
+    for record in records:
+        for field in MULTI_VALUED:
+            raw = record.get(field)
+            # A value with no labels left (e.g. "Unknown") is kept as is; values() still yields ()
+            canonical = JOIN[field].join(values(field, raw)) or raw
+            if canonical != raw:
+                record[field] = canonical
+                changed[field] += 1
+    save()
+    for field, n in changed.items():
+        metrics.inc("labels.rewritten", n, field=field, source=name)
+    info = {field: table.values.cache_info() for field, table in tables().items()}
+    print(f"🏷️ {name}: normalized " + ", ".join(f"{field} {changed[field]} rewritten "
+                                                 f"({info[field].currsize} distinct, {info[field].hits} cache hits)"
+                                                 for field in MULTI_VALUED))
+    return records, changed
+
+
+# ---------------- Dictionary encoding ----------------
+def encode(rows):
+    """Lists of labels -> (offsets, codes, vocabulary), the layout of an Arrow list<dictionary> column.
+
+    Codes index `vocabulary`, which is sorted by frequency so the commonest
+    labels get the smallest codes; row i's labels are codes[offsets[i]:offsets[i + 1]].
+    """
+    counts = Counter(label for row in rows for label in row)
+    vocabulary = [label for label, _ in counts.most_common()]
+    code = {label: i for i, label in enumerate(vocabulary)}
+    offsets, codes = [0], []
+    for row in rows:
+        codes.extend(code[label] for label in row)
+        offsets.append(len(codes))
+    return offsets, codes, vocabulary
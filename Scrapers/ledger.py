@@ -0,0 +1,205 @@
+import argparse
+import os
+import socket
+import sqlite3
+import statistics
+import time
+
+import metrics
+
+# ---------------- Config ----------------
+LEDGER_FILE = os.environ.get("SCRAPER_LEDGER", "../Datasets/run_ledger.db")
+BASELINE_RUNS = 5          # previous runs a new run is compared against
+REGRESSION = 0.25          # flag when pages/sec drops this far below the baseline median
+ERROR_JUMP = 0.10          # flag when the error rate rises this many points above the baseline
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL,
+    status TEXT NOT NULL,                 -- running / ok / error (a crashed run stays 'running')
+    discovered INTEGER, fetched INTEGER, failed INTEGER, dead_letters INTEGER, written INTEGER,
+    bytes INTEGER, elapsed REAL, pages_per_sec REAL, host TEXT, note TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_source ON runs(source, started);
+"""
+
+COLUMNS = ["id", "source", "started", "status", "discovered", "fetched", "failed", "dead_letters", "written",
+           "bytes", "elapsed", "pages_per_sec"]
+
+
+def connect(path=LEDGER_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _totals(scope):
+    """Fetch counters of one run scope from the metrics registry, summed over the other labels."""
+    totals = {"fetch.requests": 0, "fetch.errors": 0, "fetch.bytes": 0, "retry.dead_letters": 0}
+    for (name, labels), metric in metrics.REGISTRY.snapshot():
+        if name in totals and dict(labels).get("scope") == scope:
+            totals[name] += metric.value
+    return totals
+
+
+class Run:
+    """One scraper run in the ledger.
+
+    `start()` inserts the row straight away (status 'running') and snapshots
+    the fetch counters; `finish()` stores the deltas: pages fetched, fetch
+    errors, dead letters, bytes, elapsed time and pages/sec. Discovered and
+    written counts come from the scraper, which is the only one that knows
+    them. Also usable as a context manager, which marks the run 'error' if
+    the body raises.
+
+    Counts are per run, not per process: `start()` makes the run the
+    calling thread's metrics scope, the pools fetching for it inherit the
+    scope (metrics.bind), and only counters labelled with it are totalled.
+    """
+
+    def __init__(self, source, path=LEDGER_FILE):
+        self.source = source
+        self.path = path
+        self.discovered = None
+        self.written = None
+        self.id = None
+        self.scope = source
+
+    def start(self):
+        self._t0 = time.time()
+        self._previous_scope = metrics.current_scope()
+        metrics.set_scope(self.scope)
+        self._before = _totals(self.scope)
+        conn = connect(self.path)
+        with conn:
+            self.id = conn.execute("INSERT INTO runs (source, started, status, host) VALUES (?, ?, 'running', ?)",
+                                   (self.source, self._t0, socket.gethostname())).lastrowid
+        conn.close()
+        return self
+
+    def finish(self, discovered=None, written=None, status="ok", note=None):
+        discovered = self.discovered if discovered is None else discovered
+        written = self.written if written is None else written
+        after = _totals(self.scope)
+        metrics.set_scope(self._previous_scope)
+        delta = {k: after[k] - self._before[k] for k in after}
+        elapsed = time.time() - self._t0
+        pages_per_sec = delta["fetch.requests"] / elapsed if elapsed > 0 else 0.0
+        conn = connect(self.path)
+        with conn:
+            conn.execute(
+                "UPDATE runs SET finished = ?, status = ?, discovered = ?, fetched = ?, failed = ?, "
+                "dead_letters = ?, written = ?, bytes = ?, elapsed = ?, pages_per_sec = ?, note = ? WHERE id = ?",
+                (time.time(), status, discovered, delta["fetch.requests"], delta["fetch.errors"],
+                 delta["retry.dead_letters"], written, delta["fetch.bytes"], elapsed, pages_per_sec, note, self.id))
+        print(f"📒 Run #{self.id} ({self.source}): {delta['fetch.requests']} fetched, {delta['fetch.errors']} failed, "
+              f"{written if written is not None else '?'} written, {pages_per_sec:.2f} pages/s in {elapsed:.1f}s")
+        for flag in check(conn, self.source):
+            print(f"⚠️ {flag}")
+        conn.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.finish(status="error" if exc_type else "ok", note=repr(exc) if exc else None)
+        return False
+
+
+def start(source, path=LEDGER_FILE):
+    return Run(source, path).start()
+
+
+# ---------------- Comparison ----------------
+def history(conn, source, limit=None):
+    sql = "SELECT " + ", ".join(COLUMNS) + " FROM runs WHERE source = ? AND status = 'ok' ORDER BY started DESC"
+    params = [source]
+    if limit:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [dict(zip(COLUMNS, row)) for row in conn.execute(sql, params)]
+
+
+def _error_rate(run):
+    return (run["failed"] or 0) / run["fetched"] if run["fetched"] else 0.0
+
+
+def check(conn, source, baseline_runs=BASELINE_RUNS, regression=REGRESSION, error_jump=ERROR_JUMP):
+    """Regression flags for the latest finished run of `source` against the runs before it."""
+    runs = history(conn, source, baseline_runs + 1)
+    if len(runs) < 2:
+        return []
+    latest, baseline = runs[0], runs[1:]
+    flags = []
+    rate = statistics.median(r["pages_per_sec"] or 0 for r in baseline)
+    if rate and (latest["pages_per_sec"] or 0) < rate * (1 - regression):
+        flags.append(f"{source}: throughput {latest['pages_per_sec']:.2f} pages/s vs median {rate:.2f} "
+                     f"over the previous {len(baseline)} runs")
+    errors = statistics.median(_error_rate(r) for r in baseline)
+    if _error_rate(latest) > errors + error_jump:
+        flags.append(f"{source}: error rate {_error_rate(latest):.0%} vs median {errors:.0%} (blocked or failing?)")
+    written = statistics.median(r["written"] or 0 for r in baseline)
+    if written and (latest["written"] or 0) < written * (1 - regression):
+        flags.append(f"{source}: wrote {latest['written']} records vs median {written:.0f}")
+    return flags
+
+
+# ---------------- CLI ----------------
+def main():
+    parser = argparse.ArgumentParser(description="Scraper run history and throughput regressions")
+    parser.add_argument("--db", default=LEDGER_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+    runs = sub.add_parser("runs", help="List recent runs")
+    runs.add_argument("source", nargs="?")
+    runs.add_argument("-n", "--limit", type=int, default=20)
+    compare = sub.add_parser("compare", help="Compare each source's latest run with its previous runs")
+    compare.add_argument("source", nargs="*")
+    compare.add_argument("--baseline", type=int, default=BASELINE_RUNS)
+    compare.add_argument("--threshold", type=float, default=REGRESSION, help="Allowed pages/sec drop (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "runs":
+        sql = "SELECT " + ", ".join(COLUMNS) + " FROM runs"
+        params = []
+        if args.source:
+            sql += " WHERE source = ?"
+            params.append(args.source)
+        sql += " ORDER BY started DESC LIMIT ?"
+        params.append(args.limit)
+        print(f"  {'id':>5} {'source':<16} {'started':<17} {'status':<8} {'found':>6} {'fetched':>7} "
+              f"{'failed':>6} {'written':>7} {'MB':>7} {'secs':>7} {'pages/s':>7}")
+        for r in (dict(zip(COLUMNS, row)) for row in conn.execute(sql, params)):
+            started = time.strftime("%Y-%m-%d %H:%M", time.localtime(r["started"]))
+            print(f"  {r['id']:>5} {r['source']:<16} {started:<17} {r['status']:<8} {r['discovered'] or '-':>6} "
+                  f"{r['fetched'] or 0:>7} {r['failed'] or 0:>6} {r['written'] or '-':>7} "
+                  f"{(r['bytes'] or 0) / 1e6:>7.1f} {r['elapsed'] or 0:>7.1f} {r['pages_per_sec'] or 0:>7.2f}")
+    else:
+        sources = args.source or [s for (s,) in conn.execute("SELECT DISTINCT source FROM runs ORDER BY source")]
+        regressions = 0
+        for source in sources:
+            runs = history(conn, source, args.baseline + 1)
+            if not runs:
+                continue
+            latest = runs[0]
+            base = statistics.median(r["pages_per_sec"] or 0 for r in runs[1:]) if len(runs) > 1 else None
+            change = f"{(latest['pages_per_sec'] or 0) / base - 1:+.0%}" if base else "n/a"
+            flags = check(conn, source, args.baseline, args.threshold)
+            regressions += bool(flags)
+            print(f"{'⚠️' if flags else '✅'} {source:<16} {latest['pages_per_sec'] or 0:.2f} pages/s "
+                  f"(baseline {base or 0:.2f}, {change}), {latest['written'] or 0} written")
+            for flag in flags:
+                print(f"     {flag}")
+        print(f"\n{regressions} of {len(sources)} sources regressed")
+        if regressions:
+            conn.close()
+            raise SystemExit(1)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+import argparse
+import re
+import time
+from html.parser import HTMLParser
+
+# ---------------- Config ----------------
+MIN_PARAGRAPH = 25         # chars of own text before a block counts as a paragraph
+MAX_LINK_SHARE = 0.5       # lines that are mostly link text are dropped from the output
+
+# Subtrees that never hold article text
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "canvas", "iframe", "object",
+             "nav", "aside", "footer", "form", "button", "select", "textarea", "video", "audio"}
+# Elements that start a new line of text and can be scored as containers
+BLOCK_TAGS = {"address", "article", "blockquote", "body", "dd", "details", "div", "dl", "dt",
+              "figcaption", "figure", "h1", "h2", "h3", "h4", "h5", "h6", "header", "li",
+              "main", "ol", "p", "pre", "section", "summary", "table", "tbody", "td", "th", "tr", "ul"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "param",
+             "source", "track", "wbr"}
+# class/id/role words for chrome: players, share bars, promos, comments, menus
+BOILERPLATE_RE = re.compile(
+    r"(?:ad|ads|advert\w*|banner|breadcrumbs?|comments?|cookie\w*|footer|jw\w*|menu|modal|nav\w*|"
+    r"newsletter|player|popup|promo\w*|related|share|sharing|sidebar|social|sponsor\w*|subscribe|"
+    r"toolbar|video\w*)",
+    re.IGNORECASE,
+)
+HINT_SPLIT_RE = re.compile(r"[-_\d]+")
+# Page wrappers: their classes describe the page ("single-post has-sidebar"), never skipped on hints
+CONTAINER_TAGS = {"article", "body", "main"}
+
+
+class _Block:
+    __slots__ = ("tag", "start", "end", "own", "commas", "score")
+
+    def __init__(self, tag, start):
+        self.tag = tag
+        self.start = start         # index of the first line inside this block
+        self.end = start
+        self.own = 0               # chars of text directly inside this block
+        self.commas = 0
+        self.score = 0.0
+
+
+class DensityParser(HTMLParser):
+    """Single pass over the markup that scores blocks by text and link density.
+
+    Text is cut into lines at block boundaries. Every block whose own text
+    reaches MIN_PARAGRAPH gives its parent a score (1 + commas + length
+    bonus) and its grandparent half of that. The winning container is the
+    one with the highest score after discounting its link density.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines = []            # (text, link chars)
+        self.title = ""
+        self.h1 = ""
+        self._buf, self._buf_links = [], 0
+        self._stack = [_Block("#root", 0)]
+        self._candidates = []
+        self._skip_stack = []      # open tags inside a skipped subtree
+        self._in_link = 0
+        self._in_title = False
+        self._h1_block = None
+
+    # ---- tree events ----
+    def handle_starttag(self, tag, attrs):
+        if self._skip_stack:
+            if tag not in VOID_TAGS:
+                self._skip_stack.append(tag)
+            return
+        if tag in SKIP_TAGS or (tag in BLOCK_TAGS and tag not in CONTAINER_TAGS and self._is_boilerplate(attrs)):
+            if tag not in VOID_TAGS:
+                self._skip_stack.append(tag)
+            return
+        if tag == "title":
+            self._in_title = True
+        elif tag == "a":
+            self._in_link += 1
+        elif tag in ("br", "hr"):
+            self._flush()
+        elif tag in BLOCK_TAGS:
+            self._flush()
+            block = _Block(tag, len(self.lines))
+            if tag == "h1" and not self.h1 and self._h1_block is None:
+                self._h1_block = block
+            self._stack.append(block)
+
+    def handle_startendtag(self, tag, attrs):
+        if not self._skip_stack and tag in ("br", "hr"):
+            self._flush()
+
+    def handle_endtag(self, tag):
+        if self._skip_stack:
+            if tag in self._skip_stack:
+                while self._skip_stack.pop() != tag:
+                    pass
+            return
+        if tag == "title":
+            self._in_title = False
+        elif tag == "a":
+            self._in_link = max(0, self._in_link - 1)
+        elif tag in BLOCK_TAGS and any(b.tag == tag for b in self._stack[1:]):
+            self._flush()
+            while self._stack[-1].tag != tag:
+                self._close(self._stack.pop())
+            self._close(self._stack.pop())
+
+    def handle_data(self, data):
+        if self._skip_stack:
+            return
+        if self._in_title:
+            self.title += data
+            return
+        if self._h1_block is not None:
+            self.h1 += data
+        # Inline markup splits data events mid-sentence; whitespace is normalised at flush
+        size = len(data.strip())
+        block = self._stack[-1]
+        block.own += size
+        block.commas += data.count(",")
+        self._buf.append(data)
+        if self._in_link:
+            self._buf_links += size
+
+    def close(self):
+        super().close()
+        self._flush()
+        while self._stack:
+            self._close(self._stack.pop())
+
+    # ---- helpers ----
+    @staticmethod
+    def _is_boilerplate(attrs):
+        """True when one class token, the id or the role is made only of chrome words.
+
+        "share-bar" or "sidebar" mark the element itself; a token that merely
+        mentions a hint ("video-post", "has-share-buttons") describes content
+        that happens to sit next to chrome, and keeps its text.
+        """
+        for name, value in attrs:
+            if name not in ("class", "id", "role") or not value:
+                continue
+            for token in value.split():
+                words = [w for w in HINT_SPLIT_RE.split(token) if w]
+                if words and all(BOILERPLATE_RE.fullmatch(w) for w in words):
+                    return True
+        return False
+
+    def _flush(self):
+        if self._buf:
+            text = " ".join("".join(self._buf).split())
+            if text:
+                self.lines.append((text, self._buf_links))
+            self._buf, self._buf_links = [], 0
+
+    def _close(self, block):
+        block.end = len(self.lines)
+        if block is self._h1_block:
+            self._h1_block = None
+        if block.own >= MIN_PARAGRAPH and self._stack:
+            points = 1 + block.commas + min(block.own / 100, 3)
+            self._stack[-1].score += points
+            if len(self._stack) > 1:
+                self._stack[-2].score += points / 2
+        if block.score:
+            self._candidates.append(block)
+
+    # ---- result ----
+    def best(self):
+        """Highest-scoring block after discounting link density (prefix sums keep this linear)."""
+        chars, links = [0], [0]
+        for text, n in self.lines:
+            chars.append(chars[-1] + len(text))
+            links.append(links[-1] + n)
+        best, best_score = None, 0.0
+        for block in self._candidates:
+            total = chars[block.end] - chars[block.start]
+            if not total:
+                continue
+            score = block.score * (1 - (links[block.end] - links[block.start]) / total)
+            if score > best_score:
+                best, best_score = block, score
+        return best
+
+    def text(self):
+        block = self.best()
+        if block is None:
+            return ""
+        return "\n".join(text for text, links in self.lines[block.start:block.end]
+                         if links <= len(text) * MAX_LINK_SHARE)
+
+
+def extract(page_html):
+    """Main content of a page as {"title", "content"} (content lines joined by newlines)."""
+    if isinstance(page_html, bytes):
+        page_html = page_html.decode("utf-8", "replace")
+    parser = DensityParser()
+    parser.feed(page_html)
+    parser.close()
+    return {"title": " ".join((parser.h1 or parser.title).split()), "content": parser.text()}
+
+
+def extract_text(page_html):
+    return extract(page_html)["content"]
+
+
+# ---------------- Benchmark ----------------
+def bench(paths, repeat=20):
+    """Time extraction over saved HTML files and report how much of each page is kept."""
+    total = 0.0
+    for path in paths:
+        with open(path, "rb") as f:
+            page = f.read()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = extract(page)
+        elapsed = (time.perf_counter() - start) / repeat
+        total += elapsed
+        print(f"  {path}: {elapsed * 1000:.2f} ms, {len(page)} bytes -> {len(result['content'])} chars "
+              f"({result['title'][:60]!r})")
+    if paths:
+        print(f"⏱ {total / len(paths) * 1000:.2f} ms/page average over {len(paths)} pages")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Main-content extractor")
+    parser.add_argument("files", nargs="+", help="Saved HTML pages")
+    parser.add_argument("--bench", action="store_true", help="Time extraction instead of printing the text")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.files, args.repeat)
+        return
+    for path in args.files:
+        with open(path, "rb") as f:
+            result = extract(f.read())
+        print(f"# {result['title']}\n{result['content']}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,257 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# ---------------- Config ----------------
+# Histogram bucket upper bounds in seconds (covers DNS lookups up to slow downloads)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+EXPORT_INTERVAL = 15      # seconds between periodic summary exports
+LOG_INTERVAL = 2.0        # min seconds between progress lines per log key
+
+
+# ---------------- Metric Types ----------------
+class Counter:
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+
+class Gauge:
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Approximate quantile from bucket counts (upper bound of the bucket)."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return self.buckets[i] if i < len(self.buckets) else float("inf")
+        return float("inf")
+
+
+# ---------------- Registry ----------------
+class Registry:
+    """Thread-safe store of counters, gauges and histograms keyed by (name, labels)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = {}
+
+    def _get(self, kind, name, labels):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.setdefault(key, kind())
+        return metric
+
+    def inc(self, name, amount=1, **labels):
+        metric = self._get(Counter, name, labels)
+        with self._lock:
+            metric.inc(amount)
+
+    def set(self, name, value, **labels):
+        self._get(Gauge, name, labels).set(value)
+
+    def observe(self, name, value, **labels):
+        metric = self._get(Histogram, name, labels)
+        with self._lock:
+            metric.observe(value)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    def snapshot(self):
+        with self._lock:
+            return list(self._metrics.items())
+
+    def reset(self):
+        with self._lock:
+            self._metrics.clear()
+
+    # ---------- Exporters ----------
+    def to_prometheus(self):
+        lines = []
+        for (name, labels), metric in sorted(self.snapshot(), key=lambda kv: kv[0]):
+            name = "scraper_" + name.replace(".", "_")
+            label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+            if isinstance(metric, Histogram):
+                sep = "," if label_str else ""
+                cumulative = 0
+                for bound, c in zip(metric.buckets + (float("inf"),), metric.counts):
+                    cumulative += c
+                    le = "+Inf" if bound == float("inf") else bound
+                    lines.append(f'{name}_bucket{{{label_str}{sep}le="{le}"}} {cumulative}')
+                lines.append(f"{name}_sum{{{label_str}}} {metric.sum:.6f}")
+                lines.append(f"{name}_count{{{label_str}}} {metric.count}")
+            else:
+                lines.append(f"{name}{{{label_str}}} {metric.value}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self):
+        out = {}
+        for (name, labels), metric in self.snapshot():
+            key = name + ("{" + ",".join(f"{k}={v}" for k, v in labels) + "}" if labels else "")
+            if isinstance(metric, Histogram):
+                out[key] = {
+                    "count": metric.count,
+                    "mean": round(metric.sum / metric.count, 6) if metric.count else 0.0,
+                    "p50": metric.quantile(0.5),
+                    "p95": metric.quantile(0.95),
+                }
+            else:
+                out[key] = metric.value
+        return dict(sorted(out.items()))
+
+    def error_rates(self):
+        """Per-domain error rate from the fetch.requests / fetch.errors counters."""
+        requests_by_domain, errors_by_domain = {}, {}
+        for (name, labels), metric in self.snapshot():
+            domain = dict(labels).get("domain")
+            if name == "fetch.requests":
+                requests_by_domain[domain] = requests_by_domain.get(domain, 0) + metric.value
+            elif name == "fetch.errors":
+                errors_by_domain[domain] = errors_by_domain.get(domain, 0) + metric.value
+        return {d: round(errors_by_domain.get(d, 0) / n, 4) for d, n in requests_by_domain.items() if n}
+
+
+REGISTRY = Registry()
+inc = REGISTRY.inc
+set_gauge = REGISTRY.set
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+
+
+# ---------------- Scopes ----------------
+# The run a thread is working for (see ledger.Run). Fetch counters carry it as
+# a `scope` label so per-run totals don't include other runs in the process.
+_scope = threading.local()
+
+
+def set_scope(name):
+    _scope.name = name
+
+
+def current_scope():
+    return getattr(_scope, "name", None)
+
+
+def bind(func, scope=None):
+    """`func` running under `scope` (default: the caller's), for work handed to pool threads."""
+    scope = current_scope() if scope is None else scope
+    if scope is None:
+        return func
+
+    def run(*args, **kwargs):
+        previous = current_scope()
+        _scope.name = scope
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _scope.name = previous
+    return run
+
+
+# ---------------- Periodic Export ----------------
+def write_summary(path, registry=REGISTRY):
+    """Write the current metrics to `path` (.prom -> Prometheus text, otherwise JSON)."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        if path.endswith(".prom"):
+            f.write(registry.to_prometheus())
+        else:
+            json.dump({"ts": time.time(), "metrics": registry.summary(),
+                       "error_rates": registry.error_rates()}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def start_exporter(path, interval=EXPORT_INTERVAL, registry=REGISTRY):
+    """Export a summary every `interval` seconds from a daemon thread. Returns a stop() callable."""
+    stop_event = threading.Event()
+
+    def loop():
+        while not stop_event.wait(interval):
+            write_summary(path, registry)
+
+    threading.Thread(target=loop, name="metrics-exporter", daemon=True).start()
+
+    def stop():
+        stop_event.set()
+        write_summary(path, registry)
+
+    return stop
+
+
+def serve_prometheus(port=9108, registry=REGISTRY):
+    """Serve /metrics in Prometheus text format from a background thread."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer   # only needed when serving
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = registry.to_prometheus().encode("utf-8")
+            self.send_response(200 if self.path.startswith("/metrics") else 404)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+# ---------------- Rate-Limited Logging ----------------
+_log_lock = threading.Lock()
+_last_logged = {}
+
+
+def log(key, message=None, interval=LOG_INTERVAL, **fields):
+    """Print one structured progress line per `key` at most every `interval` seconds.
+
+    Returns True if the line was printed. Callers pass the current totals as
+    fields, so dropped lines lose nothing but intermediate values.
+    """
+    now = time.monotonic()
+    with _log_lock:
+        if now - _last_logged.get(key, 0.0) < interval:
+            return False
+        _last_logged[key] = now
+    parts = [f"[{key}]"]
+    if message:
+        parts.append(message)
+    parts += [f"{k}={v}" for k, v in fields.items()]
+    print(" ".join(parts), flush=True)
+    return True
@@ -0,0 +1,128 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import concurrency
+import metrics
+import retry
+from crawler import RateLimiter
+from model import Batch
+
+# ---------------- Config ----------------
+WORKERS = concurrency.POOL_SIZE   # thread ceiling; fetcher adapts per-host concurrency
+LOOKAHEAD = 2             # listing may run this many pool-widths ahead of the details
+
+
+def run(pages, parse_listing, fetch_detail, max_items=None, workers=WORKERS,
+        rate=None, lookahead=LOOKAHEAD, name="pipeline", on_record=None, stop_on_empty=True):
+    """Two-phase listing -> detail pipeline.
+
+    The calling thread walks `pages` and turns each into detail items with
+    `parse_listing(page)`; an empty result ends pagination unless
+    `stop_on_empty` is False (for page sources that aren't a single
+    paginated listing, e.g. a budget-driven discovery generator). Items are handed
+    straight to a pool running `fetch_detail(item)` (returns a record or None),
+    so detail pages download while the next listing page is still in flight.
+    Listing stays at most `workers * lookahead` items ahead, and `rate`
+    (requests/sec) caps how fast detail fetches start. Stops as soon as
+    `max_items` records have been collected. `on_record(record)` is called for
+    each kept record as it arrives (e.g. search.Indexer.add).
+
+    Transient detail failures are retried with jittered backoff on a timer
+    thread, so the pool keeps working meanwhile; items that keep failing are
+    written to the dead-letter file under `name`.
+    """
+    records = Batch()
+    pending = [0]
+    lock = threading.Condition()
+    done = threading.Event()
+    slots = threading.Semaphore(workers * lookahead)
+    limiter = RateLimiter(rate) if rate else None
+
+    def detail(item, attempt=1):
+        try:
+            if done.is_set():
+                return
+            if limiter:
+                limiter.wait()
+            record = fetch_detail(item)
+            if record:
+                with lock:
+                    kept = max_items is None or len(records) < max_items
+                    if kept:
+                        records.append(record)
+                    if max_items is not None and len(records) >= max_items:
+                        done.set()
+                    metrics.log(name, collected=len(records))
+                if kept and on_record:
+                    on_record(record)
+        except Exception as e:
+            metrics.inc("extract.errors", source=name)
+            metrics.log(f"{name}-error", item=str(item)[:120], error=repr(e), attempt=attempt, interval=0.5)
+            if not done.is_set():
+                retries.failed(item, e, attempt)
+        finally:
+            with lock:
+                pending[0] -= 1
+                lock.notify_all()
+            if attempt == 1:
+                slots.release()
+
+    # Details run on pool and retry-timer threads; keep them counted under the caller's run
+    detail = metrics.bind(detail)
+
+    def submit(item, attempt=1):
+        with lock:
+            pending[0] += 1
+        executor.submit(detail, item, attempt)
+
+    def acquire_slot():
+        while not slots.acquire(timeout=0.5):
+            if done.is_set():
+                return False
+        return not done.is_set()
+
+    def list_page(page):
+        for attempt in range(1, retry.MAX_ATTEMPTS + 1):
+            try:
+                with metrics.timer("listing", source=name):
+                    return parse_listing(page)
+            except Exception as e:
+                metrics.inc("listing.errors", source=name)
+                metrics.log(f"{name}-error", page=page, error=repr(e), attempt=attempt, interval=0)
+                if retry.classify(e) not in retry.RETRYABLE or attempt == retry.MAX_ATTEMPTS:
+                    retry.record_failure(f"{name}:listing", page, e, attempt)
+                    return None
+                # Details already submitted keep running while the listing backs off
+                time.sleep(retry.backoff(attempt))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        retries = retry.RetryScheduler(submit, source=name)
+        for page in pages:
+            if done.is_set():
+                break
+            items = list_page(page)
+            if not items:
+                if stop_on_empty:
+                    break
+                continue
+            for item in items:
+                if not acquire_slot():
+                    break
+                submit(item)
+            metrics.set_gauge("queue.depth", pending[0], source=name)
+
+        # Wait for in-flight details and any retries still on the timer
+        with lock:
+            while not done.is_set() and (pending[0] or retries.pending):
+                lock.wait(timeout=0.5)
+        retries.close()
+
+    if max_items is not None:
+        del records[max_items:]
+    return records
+
+
+def run_items(items, fetch_detail, **kwargs):
+    """Detail-only variant of `run` for sources whose item list is already known."""
+    return run([list(items)], lambda batch: batch, fetch_detail, **kwargs)
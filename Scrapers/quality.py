@@ -0,0 +1,138 @@
+import os
+import re
+from collections import Counter
+from multiprocessing import Pool
+
+import metrics
+from model import FIELDS, Batch
+
+# ---------------- Config ----------------
+WORKERS = os.cpu_count() or 1
+BATCH_SIZE = 1000          # records per worker task; smaller inputs are checked inline
+
+# Declarative rules; scrapers override individual keys, e.g. {"min_length": {"content": 30}}
+RULES = {
+    "required": FIELDS,                            # non-empty and not "N/A"
+    "min_length": {"title": 3, "content": 50},     # characters
+    "language": "en",                              # None disables the check
+    "max_boilerplate": 0.5,                        # share of content in boilerplate lines
+    "unique_title": True,                          # drop later records repeating a title
+}
+
+MISSING = {"", "N/A", "None"}
+MIN_WORDS = 20             # below this the language check passes (too little text to judge)
+SAMPLE_CHARS = 4000        # language check looks at the start of the content only
+STOPWORDS = {
+    "en": (frozenset("the of and to in a is that for it as was with be by on not he this are or his from "
+                     "at which but have an they you were her she there been one all we their has would "
+                     "when if can more will also its than into other these some what about only".split()),
+           0.12),          # (stopword set, minimum share of words)
+}
+WORD_RE = re.compile(r"[^\W\d_]+")
+BOILERPLATE_RE = re.compile(
+    r"cookie|subscribe|newsletter|sign (?:up|in)|log ?in|all rights reserved|advertisement|"
+    r"share (?:this|on)|follow us|privacy policy|terms of (?:use|service)|read more|click here|"
+    r"skip to (?:main )?content|javascript", re.IGNORECASE)
+
+
+# ---------------- Rules ----------------
+def language_ok(text, language):
+    if language not in STOPWORDS:
+        raise ValueError(f"no stopword list for language {language!r}")
+    stopwords, min_share = STOPWORDS[language]
+    words = WORD_RE.findall(text[:SAMPLE_CHARS].lower())
+    if len(words) < MIN_WORDS:
+        return True
+    return sum(w in stopwords for w in words) / len(words) >= min_share
+
+
+def boilerplate_ratio(text):
+    """Share of characters in lines that look like site chrome or repeat an earlier line."""
+    total = boiler = 0
+    seen = set()
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        total += len(line)
+        if line in seen or (len(line) < 200 and BOILERPLATE_RE.search(line)):
+            boiler += len(line)
+        seen.add(line)
+    return boiler / total if total else 0.0
+
+
+def check(record, rules=RULES):
+    """Name of the first rule `record` fails, or None if it passes.
+
+    Covers every per-record rule; `unique_title` needs the whole run and is
+    applied by `apply`.
+    """
+    for field in rules.get("required") or ():
+        value = record.get(field)
+        if value is None or str(value).strip() in MISSING:
+            return "required"
+    for field, minimum in (rules.get("min_length") or {}).items():
+        if len(str(record.get(field) or "")) < minimum:
+            return "min_length"
+    content = str(record.get("content") or "")
+    if rules.get("language") and not language_ok(content, rules["language"]):
+        return "language"
+    limit = rules.get("max_boilerplate")
+    if limit is not None and boilerplate_ratio(content) > limit:
+        return "boilerplate"
+    return None
+
+
+def passes(record, rules=RULES):
+    return check(record, rules) is None
+
+
+def _check_batch(job):
+    """Worker: verdicts only go back to the parent, not the records."""
+    batch, rules = job
+    return [check(record, rules) for record in batch]
+
+
+def rules_with(**overrides):
+    """RULES with some keys replaced, e.g. rules_with(language=None)."""
+    return {**RULES, **overrides}
+
+
+# ---------------- Stage ----------------
+def apply(records, rules=None, name="quality", workers=WORKERS, batch_size=BATCH_SIZE):
+    """Filter records through `rules` in a process pool. Returns (kept Batch, drop Counter).
+
+    Batches are checked in parallel; duplicate titles are resolved in the
+    parent afterwards so the first occurrence wins regardless of which
+    worker saw it. Drops are counted per rule in metrics
+    (`quality.dropped{rule=...}`) and summarised on stdout.
+    """
+    rules = RULES if rules is None else rules
+    records = list(records)
+    batches = [(records[i:i + batch_size], rules) for i in range(0, len(records), batch_size)]
+    with metrics.timer("quality", source=name):
+        if workers > 1 and len(batches) > 1:
+            with Pool(min(workers, len(batches))) as pool:
+                verdicts = pool.map(_check_batch, batches)
+        else:
+            verdicts = [_check_batch(job) for job in batches]
+
+    kept, drops, titles = Batch(), Counter(), set()
+    for (batch, _), reasons in zip(batches, verdicts):
+        for record, reason in zip(batch, reasons):
+            if reason is None and rules.get("unique_title"):
+                title = " ".join(str(record.get("title")).lower().split())
+                if title in titles:
+                    reason = "duplicate_title"
+                titles.add(title)
+            if reason:
+                drops[reason] += 1
+            else:
+                kept.append(record)
+
+    for rule, n in drops.items():
+        metrics.inc("quality.dropped", n, rule=rule, source=name)
+    metrics.inc("quality.kept", len(kept), source=name)
+    summary = ", ".join(f"{rule} {n}" for rule, n in drops.most_common()) or "none"
+    print(f"🧹 {name}: kept {len(kept)}/{len(records)} records (dropped: {summary})")
+    return kept, drops
@@ -0,0 +1,214 @@
+import argparse
+import heapq
+import itertools
+import json
+import os
+import random
+import threading
+import time
+from collections import Counter
+
+import requests
+
+import metrics
+
+# ---------------- Config ----------------
+MAX_ATTEMPTS = 4           # first try + 3 retries
+BASE_DELAY = 2.0           # seconds before the first retry
+MAX_DELAY = 120.0
+DEAD_LETTER_FILE = "dead_letters.jsonl"
+
+RETRYABLE = {"timeout", "connection", "http_5xx", "throttled"}
+
+
+class ParseError(Exception):
+    """The page was fetched but required content was missing or malformed."""
+
+
+# ---------------- Classification ----------------
+def classify(exc):
+    """Bucket an exception as timeout / connection / throttled / http_4xx / http_5xx / parse / other."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        code = exc.response.status_code
+        if code == 429:
+            return "throttled"
+        if code == 408:
+            return "timeout"
+        return "http_5xx" if code >= 500 else "http_4xx"
+    if isinstance(exc, requests.Timeout):
+        return "timeout"
+    if isinstance(exc, requests.ConnectionError):
+        return "connection"
+    if isinstance(exc, (ParseError, AttributeError, KeyError, IndexError, TypeError, ValueError)):
+        return "parse"
+    return "other"
+
+
+def backoff(attempt, base=BASE_DELAY, cap=MAX_DELAY):
+    """Exponential backoff with jitter for the given (1-based) retry attempt."""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay * random.uniform(0.5, 1.5)
+
+
+# ---------------- Dead Letters ----------------
+class DeadLetterQueue:
+    """Append-only JSONL file of items that exhausted their retries."""
+
+    def __init__(self, path=DEAD_LETTER_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def add(self, source, item, kind, error, attempts):
+        entry = {"ts": time.time(), "source": source, "item": item, "kind": kind,
+                 "error": repr(error), "attempts": attempts}
+        line = json.dumps(entry, default=str, ensure_ascii=False)
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+        metrics.inc("retry.dead_letters", source=source, kind=kind, scope=metrics.current_scope() or "-")
+
+
+DEAD_LETTERS = DeadLetterQueue()
+
+
+def record_failure(source, item, exc, attempts=1, dead_letters=None):
+    """Classify a final failure and persist it for later replay. Returns the error kind."""
+    kind = classify(exc)
+    metrics.inc("retry.failures", source=source, kind=kind)
+    (dead_letters or DEAD_LETTERS).add(source, item, kind, exc, attempts)
+    return kind
+
+
+def load(path=DEAD_LETTER_FILE, source=None):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+    return [e for e in entries if source is None or e["source"] == source]
+
+
+def replay(func, source, path=DEAD_LETTER_FILE):
+    """Re-run `func(item)` for every dead letter of `source`.
+
+    Recovered items are removed from the file; items that fail again are
+    kept with a bumped attempt count. Returns the list of recovered results.
+    """
+    entries = load(path)
+    keep, results = [], []
+    for entry in entries:
+        if entry["source"] != source:
+            keep.append(entry)
+            continue
+        try:
+            result = func(entry["item"])
+            if result:
+                results.append(result)
+        except Exception as e:
+            entry.update(ts=time.time(), kind=classify(e), error=repr(e), attempts=entry["attempts"] + 1)
+            keep.append(entry)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for entry in keep:
+            f.write(json.dumps(entry, default=str, ensure_ascii=False) + "\n")
+    os.replace(tmp, path)
+    print(f"🔁 Replayed {source}: {len(results)} recovered, {sum(e['source'] == source for e in keep)} still failing")
+    return results
+
+
+# ---------------- Retry Scheduling ----------------
+class RetryScheduler:
+    """Schedules retries on a timer thread instead of sleeping in workers.
+
+    `failed(item, exc, attempt)` either queues the item to be handed back
+    through `resubmit(item, next_attempt)` once its jittered backoff expires,
+    or writes it to the dead-letter file. Other work keeps flowing meanwhile.
+    """
+
+    def __init__(self, resubmit, source, max_attempts=MAX_ATTEMPTS, dead_letters=None):
+        self.resubmit = resubmit
+        self.source = source
+        self.max_attempts = max_attempts
+        self.dead_letters = dead_letters or DEAD_LETTERS
+        self._heap = []
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._in_transit = 0       # popped from the heap, being handed back
+        self._closed = False
+        self._thread = None
+
+    @property
+    def pending(self):
+        """Retries not yet handed back; never 0 while one is in transit."""
+        with self._cond:
+            return len(self._heap) + self._in_transit
+
+    def failed(self, item, exc, attempt=1):
+        """Handle a failed attempt. Returns True if a retry was scheduled."""
+        kind = classify(exc)
+        if kind not in RETRYABLE or attempt >= self.max_attempts:
+            record_failure(self.source, item, exc, attempt, self.dead_letters)
+            return False
+        metrics.inc("retry.scheduled", source=self.source, kind=kind)
+        with self._cond:
+            heapq.heappush(self._heap, (time.monotonic() + backoff(attempt), next(self._order), item, attempt + 1))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"retry-{self.source}", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed and (not self._heap or self._heap[0][0] > time.monotonic()):
+                    self._cond.wait(timeout=self._heap[0][0] - time.monotonic() if self._heap else None)
+                if self._closed:
+                    return
+                _, _, item, attempt = heapq.heappop(self._heap)
+                self._in_transit += 1
+            # Resubmit outside the lock: it takes the caller's own lock, which may be held
+            # by a thread reading `pending`
+            try:
+                self.resubmit(item, attempt)
+            except Exception as e:
+                record_failure(self.source, item, e, attempt - 1, self.dead_letters)
+            finally:
+                with self._cond:
+                    self._in_transit -= 1
+                    self._cond.notify_all()
+
+    def close(self):
+        """Stop the timer thread; anything still queued goes to the dead-letter file.
+
+        A retry already popped is handed back before this returns, so the
+        caller can shut its pool down right after; nothing is resubmitted later.
+        """
+        with self._cond:
+            self._closed = True
+            leftovers, self._heap = self._heap, []
+            self._cond.notify_all()
+            while self._in_transit:
+                self._cond.wait()
+        for _, _, item, attempt in leftovers:
+            record_failure(self.source, item, RuntimeError("retry abandoned at shutdown"), attempt - 1,
+                           self.dead_letters)
+
+
+# ---------------- CLI ----------------
+def main():
+    parser = argparse.ArgumentParser(description="Inspect the dead-letter file")
+    parser.add_argument("path", nargs="?", default=DEAD_LETTER_FILE)
+    parser.add_argument("--source", help="Only show one source")
+    parser.add_argument("--list", action="store_true", help="Print every entry, not just counts")
+    args = parser.parse_args()
+
+    entries = load(args.path, args.source)
+    print(f"📬 {len(entries)} dead letters in {args.path}")
+    for (source, kind), n in sorted(Counter((e["source"], e["kind"]) for e in entries).items()):
+        print(f"  {source:<20} {kind:<12} {n}")
+    if args.list:
+        for e in entries:
+            print(f"  [{e['source']}/{e['kind']} x{e['attempts']}] {e['item']} — {e['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import threading
+import time
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+
+import concurrency
+import fetcher
+import metrics
+
+# ---------------- Config ----------------
+USER_AGENT = "SuperScraper"
+TTL = 6 * 3600             # seconds before a host's robots.txt is re-fetched
+TIMEOUT = 10
+
+
+def _fractional_delays(lines):
+    """Crawl-delay values per user agent, including fractions the stdlib parser drops."""
+    delays, agents, in_rules = {}, [], False
+    for line in lines:
+        key, _, value = line.split("#", 1)[0].partition(":")
+        key, value = key.strip().lower(), value.strip()
+        if key == "user-agent":
+            if in_rules:
+                agents, in_rules = [], False
+            agents.append(value.lower())
+        elif key:
+            in_rules = True
+            if key == "crawl-delay":
+                try:
+                    delays.update({agent: float(value) for agent in agents})
+                except ValueError:
+                    pass
+    return delays
+
+
+class HostRules:
+    """Parsed robots.txt for one scheme://host, with its fetch time."""
+
+    def __init__(self, parser, fetched_at, delays=None):
+        self.parser = parser
+        self.fetched_at = fetched_at
+        self.delays = delays or {}
+
+    def allowed(self, url, user_agent=USER_AGENT):
+        return self.parser.can_fetch(user_agent, url)
+
+    def crawl_delay(self, user_agent=USER_AGENT):
+        delay = self.delays.get(user_agent.lower(), self.delays.get("*"))
+        if delay is None:
+            delay = self.parser.crawl_delay(user_agent)
+        if delay is None:
+            rate = self.parser.request_rate(user_agent)
+            delay = rate.seconds / rate.requests if rate else None
+        return float(delay) if delay else None
+
+
+def _fetch_rules(origin):
+    parser = RobotFileParser(origin + "/robots.txt")
+    delays = {}
+    try:
+        res = fetcher.get(origin + "/robots.txt", timeout=TIMEOUT)
+        if res.status_code in (401, 403):
+            parser.disallow_all = True
+        elif res.status_code >= 400:
+            parser.allow_all = True
+        else:
+            lines = res.text.splitlines()
+            parser.parse(lines)
+            delays = _fractional_delays(lines)
+    except Exception as e:
+        # Unreachable robots.txt: treat as allow-all, like most crawlers
+        metrics.log("robots-error", origin=origin, error=repr(e), interval=0)
+        parser.allow_all = True
+    return HostRules(parser, time.time(), delays)
+
+
+class RobotsPolicy:
+    """Per-host cache of robots.txt rules with a TTL.
+
+    Each origin is fetched once per TTL even when many threads ask at the
+    same time; later lookups are pure in-memory checks. Loading a host's
+    rules also applies its Crawl-delay to that host's concurrency controller.
+    """
+
+    def __init__(self, user_agent=USER_AGENT, ttl=TTL):
+        self.user_agent = user_agent
+        self.ttl = ttl
+        self._rules = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def rules(self, url):
+        parts = urlparse(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        rules = self._rules.get(origin)
+        if rules is not None and time.time() - rules.fetched_at < self.ttl:
+            return rules
+        with self._lock:
+            host_lock = self._locks.setdefault(origin, threading.Lock())
+        with host_lock:
+            rules = self._rules.get(origin)
+            if rules is None or time.time() - rules.fetched_at >= self.ttl:
+                rules = self._rules[origin] = _fetch_rules(origin)
+                # Feed Crawl-delay into the host's scheduler in the fetch layer
+                concurrency.for_host(parts.hostname).set_min_interval(rules.crawl_delay(self.user_agent))
+        return rules
+
+    def allowed(self, url):
+        ok = self.rules(url).allowed(url, self.user_agent)
+        if not ok:
+            metrics.inc("robots.disallowed", domain=urlparse(url).hostname)
+        return ok
+
+    def crawl_delay(self, url):
+        return self.rules(url).crawl_delay(self.user_agent)
+
+
+POLICY = RobotsPolicy()
+allowed = POLICY.allowed
+crawl_delay = POLICY.crawl_delay
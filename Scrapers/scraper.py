@@ -0,0 +1,152 @@
+import argparse
+import importlib
+import inspect
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# ---------------- Config ----------------
+# name: (module, description). Modules are imported only when their source is run,
+# so `list`, `--help` and job dispatch never pay for another scraper's imports.
+SOURCES = {
+    "ap": ("ap_news", "AP News archives and topic hubs"),
+    "arxiv": ("arxiv", "arXiv API harvest (resumable)"),
+    "finance": ("finance", "Investopedia, World Bank, IMF and Reuters"),
+    "gov": ("gov", "data.gov dataset catalog"),
+    "papers": ("papers", "arXiv, bioRxiv, PLOS and Nature"),
+    "sciencedaily": ("sciencedaily", "ScienceDaily releases from a local sitemap"),
+    "tech_docs": ("tech_doc_scraper", "MDN, Python, Kubernetes and Docker docs"),
+    "tngo": ("thenewglobalorder", "The New Global Order world news"),
+    "tribune": ("tribuneindia", "The Tribune India"),
+    "wanderingearl": ("wanderingearl_scraper", "Wandering Earl blog (selenium)"),
+    "wikipedia": ("wikipedia_scraper", "Wikipedia category crawl (HTML)"),
+    "wikipedia_api": ("wikipedia_api", "Wikipedia category crawl (MediaWiki API)"),
+    "wikipedia_dump": ("wikipedia_dump", "Wikipedia XML dump"),
+    "worldhistory": ("worldhistory", "World History Encyclopedia"),
+}
+HEAVY_MODULES = ("playwright", "selenium")     # must never load just by importing a scraper
+BENCH_REPEAT = 3
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def module_name(source):
+    """Module for a source name; module names themselves are accepted too."""
+    if source in SOURCES:
+        return SOURCES[source][0]
+    if any(module == source for module, _ in SOURCES.values()):
+        return source
+    raise KeyError(f"unknown source {source!r} (see `scraper.py list`)")
+
+
+def load(source):
+    return importlib.import_module(module_name(source))
+
+
+def run(source, argv=(), settings=None):
+    """Import one source, override module constants from `settings` and call its main().
+
+    Sources without a command line take no `argv`.
+    """
+    module = load(source)
+    for name, value in (settings or {}).items():
+        if not hasattr(module, name):
+            raise AttributeError(f"{module.__name__} has no setting {name}")
+        setattr(module, name, value)
+    if inspect.signature(module.main).parameters:
+        return module.main(list(argv))
+    if argv:
+        raise ValueError(f"{module.__name__} takes no command-line arguments (use settings instead)")
+    return module.main()
+
+
+# ---------------- Import-time benchmark ----------------
+def import_time(module, repeat=BENCH_REPEAT):
+    """(median cumulative import ms, heavy modules loaded, files created) for `module` in a fresh interpreter.
+
+    The import runs from an empty temporary directory, so anything the
+    module writes at import time (directories, logs, CSVs) shows up.
+    """
+    code = f"import sys; sys.path.insert(0, {HERE!r}); import {module}"
+    times, heavy, created = [], set(), []
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as cwd:
+            proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd,
+                                  capture_output=True, text=True)
+            created = sorted(os.listdir(cwd))
+        if proc.returncode != 0:
+            raise ImportError(proc.stderr.strip().splitlines()[-1])
+        for line in proc.stderr.splitlines():
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            _, cumulative, name = line.split("|")
+            name = name.strip()
+            if name.split(".")[0] in HEAVY_MODULES:
+                heavy.add(name.split(".")[0])
+            if name == module:
+                times.append(int(cumulative) / 1000)
+    return statistics.median(times), sorted(heavy), created
+
+
+def bench(sources, repeat=BENCH_REPEAT, budget_ms=None):
+    """Print import cost per source; returns the number of sources that failed a check."""
+    failures = 0
+    print(f"  {'source':<16} {'module':<24} {'import ms':>9}  notes")
+    for source in sources:
+        module = module_name(source)
+        try:
+            ms, heavy, created = import_time(module, repeat)
+        except ImportError as e:
+            print(f"  {source:<16} {module:<24} {'-':>9}  ⚠️ {e}")
+            continue
+        notes = []
+        if heavy:
+            notes.append("loads " + ", ".join(heavy))
+        if created:
+            notes.append("writes " + ", ".join(created))
+        if budget_ms and ms > budget_ms:
+            notes.append(f"over {budget_ms:.0f} ms budget")
+        failures += bool(notes)
+        print(f"  {source:<16} {module:<24} {ms:>9.1f}  {'❌ ' + '; '.join(notes) if notes else '✅'}")
+    return failures
+
+
+# ---------------- CLI ----------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="scraper", description="Single entry point for every scraper")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List available sources")
+    run_p = sub.add_parser("run", help="Run one source; remaining arguments go to its own CLI")
+    run_p.add_argument("source")
+    run_p.add_argument("args", nargs=argparse.REMAINDER)
+    jobs_p = sub.add_parser("jobs", help="Run a YAML/JSON job file (see jobs.py)")
+    jobs_p.add_argument("args", nargs=argparse.REMAINDER)
+    bench_p = sub.add_parser("bench", help="Measure import time per source with -X importtime")
+    bench_p.add_argument("source", nargs="*", help="Default: all sources")
+    bench_p.add_argument("--repeat", type=int, default=BENCH_REPEAT)
+    bench_p.add_argument("--budget", type=float, help="Fail when a source takes longer than this many ms to import")
+    args = parser.parse_args(argv)
+
+    # Sources import their siblings and write relative paths, so run from this directory
+    sys.path.insert(0, HERE)
+    if args.command == "list":
+        for name, (module, description) in SOURCES.items():
+            print(f"  {name:<16} {module:<24} {description}")
+    elif args.command == "run":
+        try:
+            module_name(args.source)
+        except KeyError as e:
+            parser.error(e.args[0])
+        os.chdir(HERE)
+        run(args.source, args.args)
+    elif args.command == "jobs":
+        import jobs
+        jobs.main(args.args)
+    else:
+        if bench(args.source or list(SOURCES), args.repeat, args.budget):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
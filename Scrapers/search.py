@@ -0,0 +1,235 @@
+import argparse
+import csv
+import glob
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+import metrics
+
+# ---------------- Config ----------------
+INDEX_FILE = "../Datasets/corpus_search.db"
+BATCH_SIZE = 500           # records per write transaction
+FLUSH_INTERVAL = 2.0       # seconds before a partial batch is written anyway
+BUSY_TIMEOUT_MS = 10000    # wait this long for another writer's lock before "database is locked"
+WRITE_ATTEMPTS = 3         # tries per batch before the Indexer gives it up
+FIELDS = ["title", "content", "date", "url", "author", "domain", "categories"]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    title TEXT, content TEXT, date TEXT, author TEXT, domain TEXT, categories TEXT, source TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_domain ON docs(domain);
+CREATE INDEX IF NOT EXISTS docs_date ON docs(date);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, content, content='docs', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS docs_ai AFTER INSERT ON docs BEGIN
+    INSERT INTO docs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_ad AFTER DELETE ON docs BEGIN
+    INSERT INTO docs_fts(docs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS docs_au AFTER UPDATE ON docs BEGIN
+    INSERT INTO docs_fts(docs_fts, rowid, title, content) VALUES ('delete', old.id, old.title, old.content);
+    INSERT INTO docs_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+END;
+"""
+
+UPSERT = """
+INSERT INTO docs (url, title, content, date, author, domain, categories, source)
+VALUES (:url, :title, :content, :date, :author, :domain, :categories, :source)
+ON CONFLICT(url) DO UPDATE SET
+    title = excluded.title, content = excluded.content, date = excluded.date, author = excluded.author,
+    domain = excluded.domain, categories = excluded.categories, source = excluded.source
+"""
+
+
+def connect(path=INDEX_FILE):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False, timeout=BUSY_TIMEOUT_MS / 1000)
+    conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA journal_mode=WAL")    # readers keep querying while scrapers write
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _row(record, source):
+    row = {field: record.get(field) for field in FIELDS}
+    row["source"] = source
+    return row
+
+
+def add(conn, records, source=None):
+    """Upsert records (keyed by url) into the index in one transaction. Returns the count."""
+    rows = [_row(r, source) for r in records if r and r.get("url")]
+    with conn:
+        conn.executemany(UPSERT, rows)
+    metrics.inc("search.indexed", len(rows), source=source or "-")
+    return len(rows)
+
+
+class Indexer:
+    """Streams records into the index from any thread, batching writes.
+
+    `add(record)` only enqueues; a single writer thread commits every
+    BATCH_SIZE records or FLUSH_INTERVAL seconds. Pass `indexer.add` as a
+    pipeline/crawler `on_record` hook and call `close()` when the run ends.
+
+    A batch that fails to write (locked or unwritable index) is retried
+    WRITE_ATTEMPTS times, then counted under `search.errors` and dropped;
+    the thread keeps draining the queue either way, so `close()` returns.
+    Dropped rows are still in the dataset CSV (`search.py index`).
+    """
+
+    def __init__(self, source=None, path=INDEX_FILE):
+        self.source = source
+        self.path = path
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name=f"indexer-{source}", daemon=True)
+        self._thread.start()
+
+    def add(self, record):
+        self._queue.put(record)
+
+    def _write(self, conn, batch):
+        """Write one batch, reconnecting between attempts. Returns the connection to keep using."""
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                conn = conn or connect(self.path)
+                add(conn, batch, self.source)
+                return conn
+            except Exception as e:
+                metrics.inc("search.errors", source=self.source or "-", kind=type(e).__name__)
+                metrics.log(f"indexer-{self.source}-error", error=repr(e), rows=len(batch),
+                            attempt=attempt, interval=0)
+                if not isinstance(e, sqlite3.OperationalError):   # bad rows fail the same way again
+                    break
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                if attempt < WRITE_ATTEMPTS:
+                    time.sleep(attempt)
+        metrics.inc("search.dropped", len(batch), source=self.source or "-")
+        return None
+
+    def _run(self):
+        conn = None
+        batch, closing = [], False
+        while not closing:
+            try:
+                item = self._queue.get(timeout=FLUSH_INTERVAL)
+                if item is None:
+                    closing = True
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                pass
+            if batch and (closing or len(batch) >= BATCH_SIZE or self._queue.empty()):
+                conn = self._write(conn, batch)
+                batch = []
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+def index_csv(conn, path, source=None):
+    """Bulk-load an existing dataset CSV. Returns the number of rows indexed."""
+    source = source or os.path.splitext(os.path.basename(path))[0]
+    csv.field_size_limit(sys.maxsize)
+    total, batch = 0, []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            batch.append(row)
+            if len(batch) >= BATCH_SIZE * 10:
+                total += add(conn, batch, source)
+                batch = []
+    total += add(conn, batch, source)
+    return total
+
+
+def search(conn, query, domain=None, category=None, since=None, until=None, source=None, limit=20):
+    """Ranked full-text search over title/content with optional column filters.
+
+    `query` uses FTS5 syntax (phrases in quotes, AND/OR/NOT, prefix*).
+    `since`/`until` compare against the stored date string, so they are only
+    meaningful for ISO-8601 dates.
+    """
+    sql = ["SELECT d.title, d.url, d.date, d.domain, d.categories,",
+           "snippet(docs_fts, 1, '[', ']', ' … ', 16) AS snippet, bm25(docs_fts, 5.0, 1.0) AS rank",
+           "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid WHERE docs_fts MATCH ?"]
+    params = [query]
+    if domain:
+        sql.append("AND d.domain = ?")
+        params.append(domain)
+    if category:
+        sql.append("AND d.categories LIKE ?")
+        params.append(f"%{category}%")
+    if since:
+        sql.append("AND d.date >= ?")
+        params.append(since)
+    if until:
+        sql.append("AND d.date <= ?")
+        params.append(until)
+    if source:
+        sql.append("AND d.source = ?")
+        params.append(source)
+    sql.append("ORDER BY rank LIMIT ?")
+    params.append(limit)
+    cursor = conn.cursor()
+    cursor.row_factory = sqlite3.Row
+    with metrics.timer("search.query"):
+        return [dict(row) for row in cursor.execute(" ".join(sql), params)]
+
+
+# ---------------- CLI ----------------
+def main():
+    parser = argparse.ArgumentParser(description="Full-text search over the scraped corpus")
+    parser.add_argument("--db", default=INDEX_FILE)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("index", help="Index dataset CSVs (re-indexing a URL replaces it)")
+    build.add_argument("csv", nargs="*", help="CSV files (default: ../Datasets/*.csv)")
+
+    query = sub.add_parser("query", help="Search the index")
+    query.add_argument("query", help='FTS5 query, e.g. \'"interest rate" AND inflation\'')
+    query.add_argument("--domain")
+    query.add_argument("--category")
+    query.add_argument("--since", help="ISO date lower bound")
+    query.add_argument("--until", help="ISO date upper bound")
+    query.add_argument("--source")
+    query.add_argument("-n", "--limit", type=int, default=20)
+
+    sub.add_parser("stats", help="Documents per source and domain")
+    args = parser.parse_args()
+
+    conn = connect(args.db)
+    if args.command == "index":
+        for path in args.csv or sorted(glob.glob("../Datasets/*.csv")):
+            print(f"📥 {path}: {index_csv(conn, path)} rows")
+        conn.execute("INSERT INTO docs_fts(docs_fts) VALUES ('optimize')")
+        conn.commit()
+    elif args.command == "query":
+        results = search(conn, args.query, args.domain, args.category, args.since, args.until,
+                         args.source, args.limit)
+        for r in results:
+            print(f"\n🔎 {r['title']}  ({r['domain']}, {r['date']})\n   {r['url']}\n   {r['snippet']}")
+        print(f"\n{len(results)} results")
+    else:
+        for source, domain, n in conn.execute(
+                "SELECT source, domain, COUNT(*) FROM docs GROUP BY source, domain ORDER BY 3 DESC"):
+            print(f"  {source or '-':<24} {domain or '-':<32} {n}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,32 @@
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
-from collections import deque
-from datetime import datetime
+from urllib.parse import urlparse
 import csv
-import os
-import time
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import concurrency
+import crawler
+import dates
+import labels
+import ledger
+import maintext
+import metrics
+import quality
+import search
+from model import Article
 
 # ------------------ Config ------------------ #
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; TechDocsScraper/1.0)"
 }
 OUTPUT_FILE = "../Datasets/tech_docs.csv"
-os.makedirs("scraped_data", exist_ok=True)
 FIELDNAMES = ["title", "content", "date", "url", "author", "domain", "categories"]
-SESSION = requests.Session()
+QUALITY_RULES = quality.rules_with(unique_title=False)   # "Introduction", "Overview"... repeat across sites
+WORKERS = concurrency.POOL_SIZE  # thread ceiling; fetcher adapts per-host concurrency
+RATE = 4.0      # max requests per second per site
 
 # ------------------ Utils ------------------ #
 def get_date():
-    return datetime.utcnow().strftime("%Y-%m-%d")
+    return dates.today()
 
 def clean_text(text):
     return text.strip().replace("\n", " ").replace("\r", "")[:5000] if text else "N/A"
@@ -28,72 +35,40 @@ def extract_domain(url):
     return urlparse(url).netloc
 
 # ------------------ Scraper Core ------------------ #
+def parse_doc_page(html, url, source_name):
+    """Turn one documentation page into a record, or None if it has no usable body."""
+    # Density-scored main content: no per-site selectors, no nav/sidebar/footer text
+    with metrics.timer("parse", domain=extract_domain(url)):
+        page = maintext.extract(html)
+
+    title = clean_text(page["title"]) if page["title"] else "Untitled"
+    body = clean_text(page["content"])
+    if len(body) < 50:
+        return None
+
+    return Article(
+        title=title,
+        content=body,
+        date=get_date(),
+        url=url,
+        author=source_name + " Docs Team",
+        domain=extract_domain(url),
+        categories=source_name.lower()
+    )
+
 def scrape_site(start_urls, base_url, source_name, path_func, max_pages, max_depth=2):
-    print(f"🔍 Scraping: {source_name}")
-    content = []
-    visited = set()
-    queue = deque([(url, 0) for url in start_urls])
-    count = 0
-
-    while queue and count < max_pages:
-        url, depth = queue.popleft()
-        if url in visited or depth > max_depth:
-            continue
-        visited.add(url)
-
-        try:
-            response = SESSION.get(url, headers=HEADERS, timeout=15)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-
-            # Title
-            title_tag = soup.find("h1")
-            title = clean_text(title_tag.get_text()) if title_tag else "Untitled"
-
-            # Content
-            main = soup.find("main") or soup.select_one("div.body") or soup.select_one("div.content")
-            if not main:
-                continue
-
-            for bad in main.select("nav, aside, footer, script, style"):
-                bad.decompose()
-
-            body = clean_text(main.get_text(separator="\n", strip=True))
-            if len(body) < 50:
-                continue
-
-            record = {
-                "title": title,
-                "content": body,
-                "date": get_date(),
-                "url": url,
-                "author": source_name + " Docs Team",
-                "domain": extract_domain(url),
-                "categories": source_name.lower()
-            }
-
-            content.append(record)
-            count += 1
-            print(f"[+] ({count}) {title[:60]}...")
-
-            if count >= max_pages:
-                break
-
-            # Enqueue sub-URLs
-            for a in soup.find_all("a", href=True):
-                href = a["href"]
-                if path_func(href):
-                    full_url = urljoin(base_url, href)
-                    if full_url not in visited:
-                        queue.append((full_url, depth + 1))
-
-            time.sleep(0.5)
-
-        except Exception as e:
-            print(f"[❌] Failed to scrape {url}: {str(e)}")
-            continue
-
-    return content
+    print(f"🔍 Scraping: {source_name} ({WORKERS} workers, {RATE} req/s)")
+    indexer = search.Indexer(source=source_name)
+    try:
+        return crawler.crawl(
+            start_urls, base_url, path_func,
+            extract=lambda url, html: parse_doc_page(html, url, source_name),
+            max_pages=max_pages, max_depth=max_depth,
+            workers=WORKERS, rate=RATE, headers=HEADERS, timeout=15, name=source_name,
+            on_record=indexer.add,
+        )
+    finally:
+        indexer.close()
 
 # ------------------ Site Definitions ------------------ #
 def scrape_mdn(max_pages=400):
@@ -118,40 +93,57 @@ def scrape_docker_docs(max_pages=300):
 
 # ------------------ Saver ------------------ #
 def save_to_csv(data):
+    data, _ = quality.apply(data, QUALITY_RULES, name="tech_docs")
+    labels.apply(data, name="tech_docs")
     unique = []
     seen = set()
     for row in data:
         key = (row["url"].strip(), row["title"])
-        if all(row[f] and row[f] != "N/A" for f in FIELDNAMES) and key not in seen:
+        if key not in seen:
             unique.append(row)
             seen.add(key)
 
-    with open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
+    with metrics.timer("write"), open(OUTPUT_FILE, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
         writer.writeheader()
         writer.writerows(unique)
     print(f"\n✅ Saved {len(unique)} unique technical docs to {OUTPUT_FILE}")
+    return len(unique)
 
 # ------------------ Main ------------------ #
-def main():
+def main(argv=None):
+    global WORKERS, RATE
     parser = argparse.ArgumentParser(description="Scrape technical documentation into structured CSV")
     parser.add_argument("--max_mdn", type=int, default=400)
     parser.add_argument("--max_python", type=int, default=400)
     parser.add_argument("--max_k8s", type=int, default=300)
     parser.add_argument("--max_docker", type=int, default=300)
-    args = parser.parse_args()
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Thread ceiling per site")
+    parser.add_argument("--max_concurrency", type=int, default=concurrency.MAX_LIMIT,
+                        help="Upper bound for the adaptive per-host concurrency")
+    parser.add_argument("--rate", type=float, default=RATE, help="Max requests per second per site")
+    args = parser.parse_args(argv)
+    WORKERS, RATE = args.workers, args.rate
+    concurrency.configure(max_limit=args.max_concurrency)
 
     print(f"🏁 Starting scrape to collect ~1000–1500 entries...\n")
-
+    run = ledger.start("tech_docs")
+
+    # Sites are independent, so crawl them side by side (each keeps its own rate limit)
+    sites = [
+        (scrape_mdn, args.max_mdn),
+        (scrape_python_docs, args.max_python),
+        (scrape_kubernetes_docs, args.max_k8s),
+        (scrape_docker_docs, args.max_docker),
+    ]
     data = []
-    data += scrape_mdn(args.max_mdn)
-    data += scrape_python_docs(args.max_python)
-    data += scrape_kubernetes_docs(args.max_k8s)
-    data += scrape_docker_docs(args.max_docker)
+    with ThreadPoolExecutor(max_workers=len(sites)) as executor:
+        for site_data in executor.map(metrics.bind(lambda job: job[0](job[1])), sites):
+            data += site_data
 
     print(f"\n📦 Total collected before deduplication: {len(data)}")
 
-    save_to_csv(data)
+    run.finish(discovered=len(data), written=save_to_csv(data))
 
     if data:
         print("\n📌 Sample:")
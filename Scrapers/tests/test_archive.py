@@ -0,0 +1,28 @@
+import archive
+
+
+def test_round_trip_with_awkward_urls(tmp_path):
+    urls = ["https://example.org/a", "https://example.org/tab\there", "https://example.org/new\nline",
+            "https://example.org/%20escaped"]
+    writer = archive.PageArchive(str(tmp_path))
+    for url in urls:
+        writer.put(url, f"<html>{url}</html>".encode())
+    writer.put(urls[0], b"newer copy")
+    writer.close()
+
+    reader = archive.PageArchive(str(tmp_path))
+    assert sorted(reader.urls()) == sorted(urls)
+    assert reader.get(urls[0]) == b"newer copy"
+    assert reader.get(urls[2]) == f"<html>{urls[2]}</html>".encode()
+    assert len(list(reader)) == 5
+    reader.close()
+
+
+def test_torn_last_record_ends_the_segment(tmp_path):
+    writer = archive.PageArchive(str(tmp_path))
+    writer.put("https://example.org/a", b"complete")
+    segment = writer._segment.name
+    writer.close()
+    with open(segment, "ab") as f:
+        f.write(archive.HEADER.pack(archive.MAGIC, archive.CODEC_ZLIB, 21, 100, 100) + b"https://exa")
+    assert list(archive.iter_segment(segment)) == [("https://example.org/a", b"complete")]
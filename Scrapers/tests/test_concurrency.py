@@ -0,0 +1,37 @@
+import os
+import signal
+import threading
+
+import pytest
+
+import concurrency
+
+
+def test_limit_grows_when_latency_is_flat_and_halves_on_throttling():
+    controller = concurrency.HostController("example.org", initial=2, max_limit=4)
+    for _ in range(concurrency.WINDOW):
+        controller.acquire()
+        controller.acquire()
+        controller.release(0.1)
+        controller.release(0.1)
+    assert controller.limit == 3
+    controller.acquire()
+    controller.release(5.0, "throttled", retry_after=0)
+    assert controller.limit == 1.5
+    assert controller.in_flight == 0
+
+
+def test_interrupted_crawl_delay_gives_the_slot_back():
+    controller = concurrency.HostController("example.org")
+    controller.set_min_interval(5)
+    controller.acquire()
+    controller.release(0.1)
+    threading.Timer(0.2, os.kill, (os.getpid(), signal.SIGINT)).start()
+    with pytest.raises(KeyboardInterrupt):
+        controller.acquire()                                # sleeps for the Crawl-delay
+    assert controller.in_flight == 0
+
+
+def test_classify():
+    statuses = (200, 404, 429, 500, 503)
+    assert [concurrency.classify(s) for s in statuses] == ["ok", "ok", "throttled", "error", "throttled"]
@@ -0,0 +1,35 @@
+import pytest
+
+import dates
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2025-10-06", "2025-10-06"),
+    ("2025-10-06T10:00:00Z", "2025-10-06"),
+    ("October 6, 2025", "2025-10-06"),
+    ("Mon, 06 Oct 2025 10:00:00 GMT", "2025-10-06"),
+    ("Mon, 06 Oct 2025 10:00:00 +0000", "2025-10-06"),
+    ("Published: October 6, 2025", "2025-10-06"),
+    ("March 2020", "2020-03"),
+    ("2025-07", "2025-07"),
+    ("2021", "2021"),
+])
+def test_normalize(value, expected):
+    assert dates.normalize(value) == expected
+    assert dates.NORMALIZED_RE.match(expected)
+
+
+def test_normalize_unparsed_returns_default():
+    assert dates.normalize("not a date") is None
+    assert dates.normalize("not a date", default="") == ""
+
+
+def test_parse_refuses_partial_dates():
+    assert dates.parse("March 2020") is None
+    assert dates.parse("2021") is None
+
+
+def test_normalize_many_keeps_or_blanks_unparsed():
+    values = ["2025-10-06", "garbage", "2025-10-06"]
+    assert dates.normalize_many(values) == ["2025-10-06", "garbage", "2025-10-06"]
+    assert dates.normalize_many(values, keep_unparsed=False) == ["2025-10-06", "", "2025-10-06"]
@@ -0,0 +1,36 @@
+from frontier import Frontier
+
+
+def test_dedup_ignores_fragments():
+    frontier = Frontier()
+    assert frontier.push("https://example.org/a")
+    assert not frontier.push("https://example.org/a#section")
+    assert frontier.seen("https://example.org/a#other")
+    assert frontier.pop() == ("https://example.org/a", 0)
+    assert frontier.pop() is None
+
+
+def test_dedup_and_depth_order_across_a_spill(tmp_path):
+    frontier = Frontier(max_depth=2, hot_limit=3, spill_dir=str(tmp_path))
+    urls = [f"https://example.org/{i}" for i in range(10)]
+    for url in urls:
+        assert frontier.push(url, depth=1)
+    assert frontier.spilled == 7
+    assert frontier.push("https://example.org/root", depth=0)
+    assert not frontier.push("https://example.org/3", depth=1)       # dedup sees spilled URLs too
+    assert not frontier.push("https://example.org/deep", depth=3)
+
+    popped = [frontier.pop() for _ in range(len(frontier))]
+    assert popped[0] == ("https://example.org/root", 0)
+    assert sorted(url for url, _ in popped[1:]) == sorted(urls)
+    assert {depth for _, depth in popped[1:]} == {1}
+    assert frontier.pop() is None
+    frontier.close()
+    assert not list(tmp_path.iterdir())
+
+
+def test_allow_filter_is_applied_on_push():
+    frontier = Frontier(allow=lambda url: "/private" not in url)
+    assert not frontier.push("https://example.org/private/x")
+    assert frontier.push("https://example.org/public")
+    assert len(frontier) == 1
@@ -0,0 +1,53 @@
+import pytest
+
+import labels
+
+
+@pytest.fixture(autouse=True)
+def fresh_tables(tmp_path, monkeypatch):
+    """Empty alias tables saved under tmp_path, never the dataset's label_tables.json."""
+    monkeypatch.setattr(labels, "TABLES_FILE", str(tmp_path / "label_tables.json"))
+    monkeypatch.setattr(labels, "_tables", None)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("By JANE DOE ", "Jane Doe"),
+    ("WORLD BANK GROUP", "World Bank Group"),
+    ("REUTERS", "Reuters"),
+    ("IMF", "IMF"),
+    ("NASA", "NASA"),
+    ("AP", "AP"),
+    ("data.gov", "data.gov"),
+    ("posted by @handle", "@handle"),
+    ("Unknown", ""),
+])
+def test_canonical_author(raw, expected):
+    assert labels.canonical_author(raw) == expected
+
+
+def test_canonical_category():
+    assert labels.canonical_category("Category:Machine_learning") == "machine learning"
+    assert labels.canonical_category("Uncategorized") == ""
+
+
+def test_author_values_do_not_split_on_commas():
+    assert labels.values("author", "Smith, John; IMF") == ("Smith, John", "IMF")
+    assert labels.values("author", ["Smith, John", "IMF"]) == ("Smith, John", "IMF")
+
+
+def test_category_values_dedupe_in_order():
+    assert labels.values("categories", "Finance, news/india, finance") == ("finance", "news", "india")
+
+
+def test_apply_round_trips_through_csv_form():
+    records = [{"author": "By JANE DOE; Smith, John", "categories": "Finance|Econ"}]
+    labels.apply(records)
+    assert records == [{"author": "Jane Doe; Smith, John", "categories": "finance, econ"}]
+    assert labels.values("author", records[0]["author"]) == ("Jane Doe", "Smith, John")
+
+
+def test_encode():
+    offsets, codes, vocabulary = labels.encode([["a", "b"], [], ["b"]])
+    assert vocabulary == ["b", "a"]
+    assert offsets == [0, 2, 2, 3]
+    assert [vocabulary[c] for c in codes] == ["a", "b", "b"]
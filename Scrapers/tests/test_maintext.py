@@ -0,0 +1,33 @@
+import pytest
+
+import maintext
+
+PARAGRAPHS = "".join(f"<p>Paragraph {i} of the story, with enough words, commas, and detail to count as text.</p>"
+                     for i in range(3))
+CHROME = ('<div class="share-bar"><p>Share this story on every network, today, right now, please.</p></div>'
+          '<div id="sidebar"><p>Sidebar promotion text that is long enough to be scored, too.</p></div>'
+          '<nav><p>Home, News, Sport, Weather, and every other section of the site.</p></nav>')
+
+
+@pytest.mark.parametrize("page", [
+    '<body class="single-post has-sidebar">{}</body>',
+    '<body><div class="site-content video-post">{}</div></body>',
+    '<body><article class="post has-share-buttons">{}</article></body>',
+    '<body><main class="social-layout">{}</main></body>',
+])
+def test_wrapper_classes_keep_their_text(page):
+    content = maintext.extract_text(page.format(PARAGRAPHS))
+    assert len(content.splitlines()) == 3
+
+
+def test_chrome_blocks_are_dropped():
+    page = f"<html><head><title>Story</title></head><body><div class='main'>{PARAGRAPHS}</div>{CHROME}</body></html>"
+    result = maintext.extract(page)
+    assert result["title"] == "Story"
+    assert len(result["content"].splitlines()) == 3
+    assert "Share" not in result["content"] and "Sidebar" not in result["content"]
+
+
+def test_h1_wins_over_title_and_bytes_are_accepted():
+    page = f"<title>Site | Story</title><body><h1>The Story</h1><div>{PARAGRAPHS}</div></body>".encode()
+    assert maintext.extract(page)["title"] == "The Story"
@@ -0,0 +1,48 @@
+import quality
+
+TEXT = ("The central bank raised interest rates again this quarter, and analysts expect "
+        "that the pace of inflation will slow down over the next year as demand cools.")
+
+
+def record(title, content=TEXT, **fields):
+    return {"title": title, "content": content, "date": "2025-10-06", "url": f"https://example.org/{title}",
+            "author": "Jane Doe", "domain": "example.org", "categories": "finance", **fields}
+
+
+def test_check_reports_first_failed_rule():
+    assert quality.check(record("Rates")) is None
+    assert quality.check(record("Rates", author="N/A")) == "required"
+    assert quality.check(record("Rates", content="Too short.")) == "min_length"
+    german = "Der Rat hat die Zinsen erneut erhöht, und die Bank sagt, dass die Inflation in diesem Jahr sinken wird. "
+    assert quality.check(record("Rates", content=german * 2)) == "language"
+
+
+def test_apply_drops_duplicate_titles_keeping_the_first():
+    kept, drops = quality.apply([record("Rates"), record("rates "), record("Other")], workers=1)
+    assert [r["title"] for r in kept] == ["Rates", "Other"]
+    assert drops == {"duplicate_title": 1}
+
+
+def test_apply_uses_the_rules_it_is_given():
+    short = record("Indicator", content="GDP growth, annual percent change.")   # 35 chars
+    relaxed = quality.rules_with(min_length={"title": 3, "content": 30})
+    assert not quality.apply([short], workers=1)[0]
+    assert quality.apply([short], relaxed, workers=1)[0] == [short]
+
+
+def test_apply_in_a_process_pool_matches_inline():
+    records = [record(f"Title {i}", content=TEXT if i % 3 else "short") for i in range(30)]
+    inline, inline_drops = quality.apply(records, workers=1, batch_size=7)
+    pooled, pooled_drops = quality.apply(records, workers=2, batch_size=7)
+    assert pooled == inline and pooled_drops == inline_drops == {"min_length": 10}
+
+
+def test_finance_applies_per_source_rules(tmp_path, monkeypatch):
+    import finance
+    import labels
+    from model import Article
+    monkeypatch.setattr(labels, "TABLES_FILE", str(tmp_path / "label_tables.json"))
+    monkeypatch.setattr(labels, "_tables", None)
+    rows = [Article(**record("Indicator", content="GDP growth, annual percent change.", domain="data.worldbank.org")),
+            Article(**record("Report", content="GDP growth, annual percent change.", domain="imf.org"))]
+    assert finance.save_to_csv(rows, str(tmp_path / "finance.csv")) == 1
@@ -0,0 +1,50 @@
+import time
+
+import metrics
+import search
+
+
+def record(url, title, content, **fields):
+    return {"url": url, "title": title, "content": content, "date": "2025-10-06", "author": "Jane Doe",
+            "domain": "example.org", "categories": "finance", **fields}
+
+
+def test_indexer_upserts_by_url(tmp_path):
+    path = str(tmp_path / "index.db")
+    indexer = search.Indexer("test", path)
+    indexer.add(record("https://example.org/a", "Rates", "The central bank raised interest rates."))
+    indexer.add(record("https://example.org/b", "Harvest", "Farmers expect a record wheat harvest."))
+    indexer.add(record("https://example.org/a", "Rates again", "The central bank cut interest rates."))
+    indexer.add({"title": "no url"})
+    indexer.close()
+
+    conn = search.connect(path)
+    assert conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0] == 2
+    hits = search.search(conn, "interest")
+    assert [(h["url"], h["title"]) for h in hits] == [("https://example.org/a", "Rates again")]
+    assert search.search(conn, "raised") == []             # the replaced text left the FTS index
+    assert search.search(conn, "harvest", source="test")[0]["url"] == "https://example.org/b"
+    assert search.search(conn, "harvest", domain="other.org") == []
+    conn.close()
+
+
+def dropped(source):
+    return sum(metric.value for (name, labels), metric in metrics.REGISTRY.snapshot()
+               if name == "search.dropped" and dict(labels)["source"] == source)
+
+
+def test_indexer_survives_a_failed_batch(tmp_path, monkeypatch):
+    monkeypatch.setattr(search, "WRITE_ATTEMPTS", 1)
+    path = str(tmp_path / "index.db")
+    indexer = search.Indexer("survivor", path)
+    indexer.add(5)                                          # not a record: its batch is dropped
+    deadline = time.monotonic() + 5
+    while not dropped("survivor") and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert dropped("survivor") == 1
+
+    indexer.add(record("https://example.org/c", "Later", "Written after the failure."))
+    indexer.close()
+    conn = search.connect(path)
+    assert [h["url"] for h in search.search(conn, "failure")] == ["https://example.org/c"]
+    conn.close()
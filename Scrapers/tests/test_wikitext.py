@@ -0,0 +1,32 @@
+import wikitext
+
+ARTICLE = """{{Infobox person|name=Ada Lovelace|born=1815}}
+'''Ada Lovelace''' was an English [[mathematician]] and [[Writer|writer]].<ref>{{cite book|title=Ada}}</ref>
+<!-- hidden note -->
+[[File:Ada.jpg|thumb|A portrait]]
+
+== Early life ==
+* She was born in [[London]] &amp; raised by her mother.
+{| class="wikitable"
+| cell
+|}
+See the [https://example.org archive page].
+
+== References ==
+{{reflist}}
+[[Category:Mathematicians]]
+"""
+
+
+def test_to_plain_text():
+    text = wikitext.to_plain_text(ARTICLE)
+    assert text.splitlines() == [
+        "Ada Lovelace was an English mathematician and writer.",
+        "Early life",
+        "She was born in London & raised by her mother.",
+        "See the archive page.",
+    ]
+
+
+def test_extract_categories():
+    assert wikitext.extract_categories(ARTICLE) == ["Mathematicians"]
@@ -1,19 +1,31 @@
-import requests
+import argparse
 from bs4 import BeautifulSoup
 import csv
-import time
-import random
-from datetime import datetime
 from xml.etree import ElementTree as ET
 from urllib.parse import urlparse
 
+import changes
+import dates
+import fetcher
+import ledger
+import metrics
+import pipeline
+import robots
+import search
+from model import Article
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
 }
+RATE = 1.0                # article requests per second
+SITEMAP_URL = "https://thenewglobalorder.com/sitemap-1.xml"
+LIMIT = 500               # sitemap URLs per run
+CSV_FILE = "tngo_articles.csv"
+FIELDS = ["title", "content", "date", "url", "author", "domain", "categories"]
 
-def fetch_sitemap_urls(sitemap_url, limit=1000):
+def fetch_sitemap_urls(sitemap_url, limit=None):
     print(f"Fetching sitemap: {sitemap_url}")
-    res = requests.get(sitemap_url, headers=HEADERS, timeout=20)
+    res = fetcher.get(sitemap_url, headers=HEADERS, timeout=20)
     res.raise_for_status()
     root = ET.fromstring(res.text)
 
@@ -23,16 +35,22 @@ def fetch_sitemap_urls(sitemap_url, limit=1000):
         loc = url_el.find("ns:loc", ns).text
         if "/world-news" in loc:  # Year-based filter
             urls.append(loc)
-        if len(urls) >= limit:
+        if limit and len(urls) >= limit:
             break
 
     print(f"[+] Collected {len(urls)} article URLs")
     return urls
 
-def extract_article_data(url):
-    print(f"Scraping: {url}")
-    res = requests.get(url, headers=HEADERS, timeout=15)
-    soup = BeautifulSoup(res.text, "html.parser")
+def fetch_article(url):
+    res = fetcher.get(url, headers=HEADERS, timeout=15)
+    res.raise_for_status()
+    return res
+
+def extract_article_data(url, page=None):
+    if page is None:
+        page = fetch_article(url).text
+    with metrics.timer("parse", domain=urlparse(url).netloc):
+        soup = BeautifulSoup(page, "html.parser")
 
     # Title
     title_tag = soup.select_one("h1.entry-title")
@@ -44,12 +62,9 @@ def extract_article_data(url):
 
     # Date
     date_tag = soup.select_one("time.published")
-    if date_tag and date_tag.has_attr("datetime"):
-        try:
-            dt = datetime.fromisoformat(date_tag["datetime"].replace("Z", "+00:00"))
-            date = dt.strftime("%B %d, %Y")
-        except ValueError:
-            date = date_tag.get_text(strip=True)
+    if date_tag:
+        raw = date_tag.get("datetime") or date_tag.get_text(strip=True)
+        date = dates.normalize(raw, urlparse(url).netloc, default=raw)
     else:
         date = None
 
@@ -70,52 +85,63 @@ def extract_article_data(url):
     # Domain
     domain = urlparse(url).netloc
 
-    return {
-        "title": title,
-        "content": content,
-        "date": date,
-        "url": url,
-        "author": author,
-        "domain": domain,
-        "categories": category
-    }
-
-def save_csv(records, filename="tngo_articles.csv"):
-    keys = ["title", "content", "date", "url", "author", "domain", "categories"]
+    return Article(
+        title=title,
+        content=content,
+        date=date,
+        url=url,
+        author=author,
+        domain=domain,
+        categories=category
+    )
+
+def save_csv(records, filename=CSV_FILE):
     with open(filename, "w", encoding="utf-8", newline="") as file:
-        writer = csv.DictWriter(file, fieldnames=keys)
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
         writer.writeheader()
         writer.writerows(records)
     print(f"[✓] Saved {len(records)} records to '{filename}'")
 
-def main():
-    sitemap_url = "https://thenewglobalorder.com/sitemap-1.xml"
-    limit = 500  # Set to 1000 if needed
-
-    urls = fetch_sitemap_urls(sitemap_url, limit=limit)
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape The New Global Order world-news articles")
+    parser.add_argument("--limit", type=int, default=LIMIT, help="Max sitemap URLs to scrape")
+    parser.add_argument("--output", default=CSV_FILE, help="CSV to patch in place")
+    parser.add_argument("--rate", type=float, default=RATE, help="Max article requests per second")
+    parser.add_argument("--dry-run", action="store_true", help="List the article URLs, then stop")
+    args = parser.parse_args(argv)
+
+    # The full listing decides removals; --limit and robots.txt only narrow what is scraped
+    listed = fetch_sitemap_urls(SITEMAP_URL)
+    urls = [u for u in listed[:args.limit] if robots.allowed(u)]
     print(f"\nFound {len(urls)} article URLs. Sample:")
     for u in urls[:5]:
         print(f"  → {u}")
-
-    confirmation = input("\nType 'yes' to proceed with scraping (or anything else to abort): ").strip().lower()
-    if confirmation != "yes":
-        print("❌ Aborted by user")
+    if args.dry_run:
+        print("🔍 Dry run: nothing scraped")
         return
 
+    run = ledger.start("tngo")
     print("\n⏳ Starting article scraping...")
-    data_records = []
-    for i, url in enumerate(urls, 1):
-        try:
-            print(f"Processing {i}/{len(urls)}: {url[:80]}...")
-            record = extract_article_data(url)
-            if record and record.get("content"):
-                data_records.append(record)
-        except Exception as e:
-            print(f"⚠️ Error on {url}: {e}")
-
-        time.sleep(0.75 + random.random() * 0.5)
-
-    save_csv(data_records)
+    index = changes.for_dataset(args.output)
+
+    def scrape(url):
+        res = fetch_article(url)
+        # Byte-identical page: nothing to parse or rewrite
+        if index.body_unchanged(url, res.content):
+            return None
+        record = extract_article_data(url, res.text)
+        if not record.get("content") or index.observe(record) == "unchanged":
+            return None
+        return record
+
+    # Failed articles are retried in the background and dead-lettered under "tngo".
+    # Only added/updated articles come back; the CSV is patched in place.
+    indexer = search.Indexer(source="tngo")
+    changed = pipeline.run_items(urls, scrape, rate=args.rate, name="tngo", on_record=indexer.add)
+    indexer.close()
+    _, removed = index.commit(current=listed)
+    changes.merge_csv(args.output, FIELDS, changed, removed)
+    run.finish(discovered=len(urls), written=len(changed))
     print("✅ Done!")
 
 if __name__ == "__main__":
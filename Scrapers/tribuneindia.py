@@ -1,17 +1,27 @@
-import requests
 import xml.etree.ElementTree as ET
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import json
 import csv
-import time
+
+import dates
+import fetcher
+import jsonld
+import ledger
+import metrics
+import pipeline
+import retry
+import robots
+import search
+from model import Article
 
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 SITEMAP_INDEX = "https://www.tribuneindia.com/sitemap.xml"
+RATE = 3.0                # article requests per second
 
 def get_sitemap_urls(url):
     try:
-        r = requests.get(url, headers=HEADERS, timeout=10)
+        r = fetcher.get(url, headers=HEADERS, timeout=10)
         r.raise_for_status()
     except Exception as e:
         print(f"❌ Failed to fetch {url}: {e}")
@@ -19,41 +29,47 @@ def get_sitemap_urls(url):
     root = ET.fromstring(r.content)
     return [loc.text for loc in root.findall(".//{*}loc") if loc.text]
 
-def extract_article_data(url):
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=10)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.content, "html.parser")
-
-        json_ld = soup.find("script", type="application/ld+json")
-        if not json_ld:
-            print(f"⚠️ No JSON-LD found for {url}")
-            return None
-
-        data = json.loads(json_ld.string)
-
-        title = data.get("headline", "")
-        author = data.get("author", {}).get("name", "Unknown")
-        date = data.get("datePublished", "")
-        content = data.get("articleBody", "")
-        domain = urlparse(url).netloc
-        category = url.split("/")[3] if len(url.split("/")) > 3 else "Uncategorized"
+def parse_jsonld_dom(page):
+    """Slow path: locate the JSON-LD block through a full DOM parse."""
+    soup = BeautifulSoup(page, "html.parser")
+    json_ld = soup.find("script", type="application/ld+json")
+    if not json_ld:
+        raise retry.ParseError("no JSON-LD block")
+    data = json.loads(json_ld.string)
+    return {
+        "title": data.get("headline", ""),
+        "content": data.get("articleBody", ""),
+        "date": data.get("datePublished", ""),
+        "author": data.get("author", {}).get("name", ""),
+    }
 
-        return {
-            "title": title,
-            "content": content,
-            "date": date,
-            "author": author,
-            "url": url,
-            "domain": domain,
-            "categories": category,
-        }
-
-    except Exception as e:
-        print(f"❌ Failed to scrape {url}: {e}")
-        return None
+def extract_article_data(url):
+    r = fetcher.get(url, headers=HEADERS, timeout=10)
+    r.raise_for_status()
+    domain = urlparse(url).netloc
+
+    # Byte scan for JSON-LD first; only build a DOM if articleBody wasn't found
+    with metrics.timer("scan", domain=domain):
+        fields = jsonld.extract(r.content)
+    if not fields["content"]:
+        metrics.inc("extract.fallback", domain=domain)
+        with metrics.timer("parse", domain=domain):
+            fields = parse_jsonld_dom(r.content)
+
+    category = url.split("/")[3] if len(url.split("/")) > 3 else "Uncategorized"
+
+    return Article(
+        title=fields["title"],
+        content=fields["content"],
+        date=dates.normalize(fields["date"], domain, default=fields["date"]),
+        author=fields["author"] or "Unknown",
+        url=url,
+        domain=domain,
+        categories=category,
+    )
 
 def main():
+    run = ledger.start("tribune")
     print("🔍 Fetching sitemap index...")
     sitemaps = get_sitemap_urls(SITEMAP_INDEX)
 
@@ -63,25 +79,25 @@ def main():
         urls += get_sitemap_urls(sm)
 
     print(f"🔎 Filtering URLs for '/news'...")
-    news_urls = [u for u in urls if "/news" in u]
+    news_urls = [u for u in urls if "/news" in u and robots.allowed(u)]
     print(f"\n✅ Found {len(news_urls)} '/news' URLs.")
 
+    # Failed articles are retried in the background and dead-lettered under "tribune"
+    indexer = search.Indexer(source="tribune")
+    records = pipeline.run_items(news_urls, extract_article_data, rate=RATE, name="tribune",
+                                 on_record=indexer.add)
+    indexer.close()
+
     print(f"\n💾 Saving scraped articles to 'tribunal_docs.csv'...\n")
     with open("tribunal_docs.csv", mode="w", newline='', encoding="utf-8") as csvfile:
         fieldnames = ["title", "content", "date", "author", "url", "domain", "categories"]
         writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
         writer.writeheader()
+        with metrics.timer("write"):
+            writer.writerows(records)
 
-        for i, url in enumerate(news_urls, 1):
-            data = extract_article_data(url)
-            if data:
-                print(f"✅ Article {i}: {data['title'][:80]}...")
-                writer.writerow(data)
-
-            # optional polite delay
-            time.sleep(0.3)
-
-    print(f"\n✅ Finished scraping {i} articles into 'tribunal_docs.csv'.")
+    run.finish(discovered=len(news_urls), written=len(records))
+    print(f"\n✅ Finished scraping {len(records)} articles into 'tribunal_docs.csv'.")
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,14 @@
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
 import csv
 import time
 
+import fetcher
+import ledger
+import metrics
+import retry
+from model import Article
+
 BASE_URL = "https://wanderingearl.com"
 BLOG_URL = f"{BASE_URL}/blog/"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
@@ -18,7 +21,7 @@ def get_all_blog_post_links():
     while True:
         url = f"{BLOG_URL}page/{page}/"
         print(f"[*] Scanning {url}")
-        res = requests.get(url, headers=HEADERS)
+        res = fetcher.get(url, headers=HEADERS)
         if res.status_code != 200:
             break
 
@@ -40,6 +43,10 @@ def get_all_blog_post_links():
     return list(post_urls)
 
 def setup_driver():
+    # Imported here so listing or importing the scraper doesn't load selenium
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options
+
     options = Options()
     options.add_argument("--headless")
     options.add_argument("--no-sandbox")
@@ -47,7 +54,6 @@ def setup_driver():
     return webdriver.Chrome(options=options)
 
 def extract_post_data(driver, url):
-    print(f"[+] Extracting: {url}")
     try:
         driver.get(url)
         time.sleep(2)
@@ -84,17 +90,20 @@ def extract_post_data(driver, url):
 
         domain = urlparse(url).netloc
 
-        return {
-            "title": title,
-            "content": content,
-            "date": date,
-            "url": url,
-            "author": author,
-            "domain": domain,
-            "categories": "Travel"
-        }
+        return Article(
+            title=title,
+            content=content,
+            date=date,
+            url=url,
+            author=author,
+            domain=domain,
+            categories="Travel"
+        )
     except Exception as e:
-        print(f"[!] Error extracting {url}: {e}")
+        metrics.inc("extract.errors", domain=urlparse(url).netloc)
+        metrics.log("wanderingearl-error", url=url, error=repr(e), interval=0.5)
+        # One shared browser, so no in-run retries; keep it for `retry.replay`
+        retry.record_failure("wanderingearl", url, e)
         return None
 
 def save_to_csv(data, filename="wanderingearl_all_posts.csv"):
@@ -109,6 +118,7 @@ def save_to_csv(data, filename="wanderingearl_all_posts.csv"):
 
 def main():
     driver = setup_driver()
+    run = ledger.start("wanderingearl")
     try:
         blog_links = get_all_blog_post_links()
         blog_data = []
@@ -116,13 +126,14 @@ def main():
         print(f"[+] Total URLs fetched: {len(blog_links)} — limiting to first 10")
 
         for i, link in enumerate(blog_links):
-            print(f"({i+1}/10)")
+            metrics.log("wanderingearl", processed=i + 1, total=len(blog_links))
             data = extract_post_data(driver, link)
             if data:
                 blog_data.append(data)
             time.sleep(1)
 
         save_to_csv(blog_data, filename= "../Datasets/wanderingearl.csv")
+        run.finish(discovered=len(blog_links), written=len(blog_data))
     finally:
         driver.quit()
 
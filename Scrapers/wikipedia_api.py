@@ -0,0 +1,196 @@
+import argparse
+import csv
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+
+import fetcher
+import ledger
+import metrics
+import wikitext
+from model import Article
+from wikipedia_scraper import BASE_URL, FIELDS, HEADERS, MAX_ARTICLES, MAX_SUBCATEGORIES
+
+# ------------ CONFIGURATION ------------ #
+API_URL = f"{BASE_URL}/w/api.php"
+START_CATEGORY = "Category:Computer science"
+OUTPUT_FILE = "../Datasets/wikipedia_articles_api.csv"
+BATCH_SIZE = 50                # titles per query (API maximum for non-bots)
+WORKERS = 4                    # concurrent batch queries
+TIMEOUT = 30
+
+
+# ------------ API CLIENT ------------ #
+def api_query(params, api_url=API_URL, session=None):
+    """Run one `action=query` request and follow `continue` until exhausted.
+
+    Yields each response's `query` block, so callers can merge pages from
+    continuation rounds (e.g. categories that did not fit the first reply).
+    """
+    params = {"action": "query", "format": "json", "formatversion": 2, "maxlag": 5, **params}
+    cont = {}
+    while True:
+        res = fetcher.get(api_url, session=session, headers=HEADERS, timeout=TIMEOUT, params={**params, **cont})
+        res.raise_for_status()
+        data = res.json()
+        if "error" in data:
+            if data["error"].get("code") == "maxlag":
+                time.sleep(int(res.headers.get("Retry-After", 5)))
+                continue
+            raise RuntimeError(f"MediaWiki API error: {data['error']}")
+        if "query" in data:
+            yield data["query"]
+        if "continue" not in data:
+            return
+        cont = data["continue"]
+
+
+def get_category_titles(category=START_CATEGORY, max_articles=MAX_ARTICLES,
+                        max_subcategories=MAX_SUBCATEGORIES, api_url=API_URL, session=None):
+    """Breadth-first walk of a category tree via `list=categorymembers`."""
+    print(f"🔍 Listing up to {max_articles} articles under {category} via the API...")
+    titles = []
+    seen_titles = set()
+    seen_subcats = {category}
+    queue = deque([category])
+
+    while queue and len(titles) < max_articles:
+        cat = queue.popleft()
+        params = {"list": "categorymembers", "cmtitle": cat, "cmtype": "page|subcat",
+                  "cmnamespace": "0|14", "cmlimit": "max"}
+        try:
+            for block in api_query(params, api_url, session):
+                for member in block.get("categorymembers", []):
+                    title = member["title"]
+                    if member["ns"] == 14:
+                        if title not in seen_subcats and len(seen_subcats) < max_subcategories:
+                            seen_subcats.add(title)
+                            queue.append(title)
+                    elif title not in seen_titles:
+                        seen_titles.add(title)
+                        titles.append(title)
+                if len(titles) >= max_articles:
+                    break
+        except Exception as e:
+            metrics.inc("discover.errors")
+            metrics.log("discover", "error", category=cat, error=repr(e), interval=0)
+        metrics.set_gauge("queue.depth", len(queue), stage="category")
+        metrics.log("discover", articles=len(titles), subcats_queued=len(queue))
+
+    return titles[:max_articles]
+
+
+def _batches(items, size=BATCH_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def get_touched(titles, api_url=API_URL, session=None):
+    """Map title -> `touched` timestamp, 50 titles per request (no content transferred)."""
+    touched = {}
+    for batch in _batches(titles):
+        for block in api_query({"prop": "info", "titles": "|".join(batch)}, api_url, session):
+            for page in block.get("pages", []):
+                if "touched" in page:
+                    touched[page["title"]] = page["touched"]
+    return touched
+
+
+def fetch_batch(titles, api_url=API_URL, session=None):
+    """Fetch content, categories and timestamps for up to 50 titles in one query."""
+    params = {
+        "prop": "revisions|categories|info",
+        "rvprop": "content|timestamp",
+        "rvslots": "main",
+        "clshow": "!hidden",
+        "cllimit": "max",
+        "redirects": 1,
+        "titles": "|".join(titles),
+    }
+    pages = {}
+    with metrics.timer("fetch_batch"):
+        for block in api_query(params, api_url, session):
+            for page in block.get("pages", []):
+                merged = pages.setdefault(page["title"], {"categories": []})
+                merged["categories"] += page.get("categories", [])
+                for key in ("revisions", "touched", "missing", "ns"):
+                    if key in page:
+                        merged[key] = page[key]
+
+    records = []
+    for title, page in pages.items():
+        if page.get("missing") or page.get("ns", 0) != 0 or not page.get("revisions"):
+            continue
+        rev = page["revisions"][0]
+        with metrics.timer("extract", stage="wikitext"):
+            content = wikitext.to_plain_text(rev["slots"]["main"].get("content", ""))
+        if not content:
+            continue
+        cats = [c["title"].split(":", 1)[-1] for c in page["categories"]]
+        records.append(Article(
+            title=title,
+            content=content,
+            date=wikitext.format_timestamp(rev["timestamp"]),
+            url=f"{BASE_URL}/wiki/{quote(title.replace(' ', '_'))}",
+            author="Wikipedia Contributors",
+            domain=BASE_URL.split("//", 1)[-1],
+            categories=", ".join(cats),
+        ))
+    return records
+
+
+def fetch_articles(titles, api_url=API_URL, session=None, workers=WORKERS):
+    """Fetch all `titles` in 50-title batches, a few batches in flight at once."""
+    records = []
+
+    def run(batch):
+        try:
+            return fetch_batch(batch, api_url, session)
+        except Exception as e:
+            metrics.inc("extract.errors", domain="api")
+            metrics.log("extract-error", batch=f"{batch[0]}..", error=repr(e), interval=0)
+            return []
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for idx, batch_records in enumerate(executor.map(metrics.bind(run), _batches(titles)), 1):
+            records += batch_records
+            metrics.log("extract", batches=idx, valid=len(records))
+    return records
+
+
+def save_csv(records, output_file=OUTPUT_FILE):
+    with metrics.timer("write"), open(output_file, "w", newline='', encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(records)
+    print(f"\n📁 Saved {len(records)} records to {output_file}")
+
+
+# ------------ MAIN SCRIPT ------------ #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk Wikipedia ingestion through the MediaWiki API")
+    parser.add_argument("--category", default=START_CATEGORY)
+    parser.add_argument("--max_articles", type=int, default=MAX_ARTICLES)
+    parser.add_argument("--api_url", default=API_URL, help="Point at a recorded/local stand-in API for testing")
+    parser.add_argument("--since", help="Only fetch pages touched after this ISO timestamp")
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args(argv)
+
+    t0 = time.time()
+    run = ledger.start("wikipedia_api")
+    titles = get_category_titles(args.category, args.max_articles, api_url=args.api_url)
+    if args.since:
+        touched = get_touched(titles, api_url=args.api_url)
+        titles = [t for t in titles if touched.get(t, "") > args.since]
+        print(f"🔁 {len(titles)} pages touched since {args.since}")
+
+    print(f"\n🚀 Fetching {len(titles)} articles in batches of {BATCH_SIZE}...\n")
+    records = fetch_articles(titles, api_url=args.api_url)
+    save_csv(records, args.output)
+    run.finish(discovered=len(titles), written=len(records))
+    print(f"\n⏱ Finished in {round(time.time() - t0, 2)} sec")
+
+
+if __name__ == "__main__":
+    main()
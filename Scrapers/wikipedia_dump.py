@@ -0,0 +1,160 @@
+import argparse
+import bz2
+import csv
+import json
+import os
+import time
+from collections import defaultdict, deque
+from multiprocessing import Pool
+from urllib.parse import quote
+from xml.etree.ElementTree import iterparse
+
+import ledger
+import metrics
+import wikitext
+from model import Article
+from wikipedia_scraper import BASE_URL, FIELDS, MAX_ARTICLES, MAX_SUBCATEGORIES
+
+# ------------ CONFIGURATION ------------ #
+DUMP_FILE = "enwiki-latest-pages-articles.xml.bz2"
+START_CATEGORY = "Computer science"
+OUTPUT_FILE = "../Datasets/wikipedia_articles_dump.csv"
+WORKERS = os.cpu_count() or 1
+CHUNK_SIZE = 64                # pages handed to a worker at a time
+
+
+# ------------ DUMP READING ------------ #
+def _local(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_pages(path, namespaces=(0, 14)):
+    """Stream (ns, title, timestamp, wikitext) for non-redirect pages in `namespaces`.
+
+    Uses iterparse over the bz2 stream and clears every finished <page>, so
+    memory stays flat regardless of dump size.
+    """
+    opener = bz2.open if path.endswith(".bz2") else open
+    with opener(path, "rb") as f:
+        context = iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        page = {}
+        for event, elem in context:
+            if event != "end":
+                continue
+            tag = _local(elem.tag)
+            if tag in ("title", "ns", "timestamp", "text"):
+                page[tag] = elem.text or ""
+            elif tag == "redirect":
+                page["redirect"] = True
+            elif tag == "page":
+                ns = int(page.get("ns", -1))
+                if ns in namespaces and not page.get("redirect"):
+                    yield ns, page.get("title", ""), page.get("timestamp", ""), page.get("text", "")
+                page = {}
+                root.clear()
+
+
+# ------------ CATEGORY SET ------------ #
+def build_category_set(path, start_category=START_CATEGORY, max_subcategories=MAX_SUBCATEGORIES):
+    """Category names under `start_category`, from the [[Category:]] links of category pages."""
+    print(f"🗂  Building category tree under '{start_category}' from {path}...")
+    children = defaultdict(list)
+    for ns, title, _, text in iter_pages(path, namespaces=(14,)):
+        name = title.split(":", 1)[-1]
+        for parent in wikitext.extract_categories(text):
+            children[parent].append(name)
+
+    selected = {start_category}
+    queue = deque([start_category])
+    while queue and len(selected) < max_subcategories:
+        for child in children.get(queue.popleft(), ()):
+            if child not in selected:
+                selected.add(child)
+                queue.append(child)
+    print(f"  🌐 {len(selected)} categories selected")
+    return selected
+
+
+def load_category_set(path, start_category, cache_file=None):
+    """Like build_category_set, but reuses a JSON cache so reruns skip the extra dump pass."""
+    if cache_file and os.path.exists(cache_file):
+        with open(cache_file, encoding="utf-8") as f:
+            cached = json.load(f)
+        if cached.get("dump") == os.path.basename(path) and cached.get("start") == start_category:
+            return set(cached["categories"])
+    categories = build_category_set(path, start_category)
+    if cache_file:
+        with open(cache_file, "w", encoding="utf-8") as f:
+            json.dump({"dump": os.path.basename(path), "start": start_category,
+                       "categories": sorted(categories)}, f)
+    return categories
+
+
+# ------------ CONVERSION ------------ #
+def to_record(page):
+    """Worker: (title, timestamp, wikitext, cats) -> record in the extract_article schema."""
+    title, timestamp, text, cats = page
+    content = wikitext.to_plain_text(text)
+    if not content:
+        return None
+    return Article(
+        title=title,
+        content=content,
+        date=wikitext.format_timestamp(timestamp) if timestamp else "N/A",
+        url=f"{BASE_URL}/wiki/{quote(title.replace(' ', '_'))}",
+        author="Wikipedia Contributors",
+        domain=BASE_URL.split("//", 1)[-1],
+        categories=", ".join(cats),
+    )
+
+
+def iter_matching_pages(path, categories):
+    for _, title, timestamp, text in iter_pages(path, namespaces=(0,)):
+        cats = wikitext.extract_categories(text)
+        if categories.intersection(cats):
+            yield title, timestamp, text, cats
+
+
+def ingest(path, categories, output_file=OUTPUT_FILE, max_articles=MAX_ARTICLES, workers=WORKERS):
+    """Convert matching articles in a process pool and stream them to `output_file`."""
+    written = 0
+    t0 = time.time()
+    with open(output_file, "w", newline="", encoding="utf-8") as f, Pool(workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for record in pool.imap(to_record, iter_matching_pages(path, categories), chunksize=CHUNK_SIZE):
+            if record is None:
+                continue
+            writer.writerow(record)
+            written += 1
+            metrics.log("dump", written=written, rate=f"{written / (time.time() - t0):.0f}/s")
+            if written >= max_articles:
+                pool.terminate()
+                break
+    return written
+
+
+# ------------ MAIN SCRIPT ------------ #
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline Wikipedia ingestion from a pages-articles dump")
+    parser.add_argument("--dump", default=DUMP_FILE, help="Path to pages-articles.xml.bz2")
+    parser.add_argument("--category", default=START_CATEGORY, help="Root category name (no 'Category:' prefix)")
+    parser.add_argument("--category_cache", help="JSON file caching the computed category set")
+    parser.add_argument("--max_articles", type=int, default=MAX_ARTICLES)
+    parser.add_argument("--workers", type=int, default=WORKERS)
+    parser.add_argument("--output", default=OUTPUT_FILE)
+    args = parser.parse_args(argv)
+
+    t0 = time.time()
+    run = ledger.start("wikipedia_dump")
+    print("== 📦 Offline Wikipedia Dump Ingestion ==\n")
+    categories = load_category_set(args.dump, args.category, args.category_cache)
+    written = ingest(args.dump, categories, args.output, args.max_articles, args.workers)
+    run.finish(written=written)
+    print(f"\n📁 Saved {written} records to {args.output}")
+    print(f"⏱ Finished in {round(time.time() - t0, 2)} sec")
+
+
+if __name__ == "__main__":
+    main()
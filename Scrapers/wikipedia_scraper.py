@@ -1,10 +1,18 @@
-import requests
 from bs4 import BeautifulSoup
 import csv
 import time
 from urllib.parse import urljoin, urlparse
-from collections import deque
-from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import concurrency
+import dates
+import fetcher
+import ledger
+import metrics
+import pipeline
+import robots
+import search
+from frontier import Frontier
+from model import Article
 
 # ------------ CONFIGURATION ------------ #
 BASE_URL = "https://en.wikipedia.org"
@@ -15,93 +23,102 @@ HEADERS = {"User-Agent": "Mozilla/5.0 (compatible; SuperScraper/5.0)"}
 
 MAX_ARTICLES = 10000
 MAX_SUBCATEGORIES = 10000
-MAX_THREADS = 120              # 💥 High parallelism
+MAX_THREADS = concurrency.POOL_SIZE   # pool ceiling; fetcher adapts per-host concurrency
 TIMEOUT = 10
 DELAY = 0.05                   # tiny polite delay
+METRICS_FILE = "wikipedia_metrics.json"   # use a .prom suffix for Prometheus text
 
 # ------------ SCRAPING FUNCTIONS ------------ #
 def get_all_article_links(start_url):
     print(f"🔍 Scanning for up to {MAX_ARTICLES} Wiki article URLs...")
 
-    seen_articles = set()
-    seen_subcats = set()
-    queue = deque([start_url])
+    # Articles are capped at MAX_ARTICLES; the category BFS lives in a bounded,
+    # disk-spilling frontier so a large MAX_SUBCATEGORIES cannot exhaust memory
+    seen_articles = {}
+    categories = Frontier(allow=robots.allowed)
+    categories.push(start_url)
+    visited = 0
 
-    while queue and len(seen_articles) < MAX_ARTICLES and len(seen_subcats) < MAX_SUBCATEGORIES:
-        url = queue.popleft()
-        if url in seen_subcats:
-            continue
-        seen_subcats.add(url)
+    while len(seen_articles) < MAX_ARTICLES and visited < MAX_SUBCATEGORIES:
+        item = categories.pop()
+        if item is None:
+            break
+        url, depth = item
+        visited += 1
 
         try:
-            response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            soup = BeautifulSoup(response.text, "html.parser")
+            response = fetcher.get(url, headers=HEADERS, timeout=TIMEOUT)
+            with metrics.timer("parse", stage="category"):
+                soup = BeautifulSoup(response.text, "html.parser")
 
             # Extract articles
             for link in soup.select("#mw-pages a[href^='/wiki/']"):
                 href = link['href']
                 if (not any(href.startswith(f"/wiki/{p}") for p in ["Category:", "File:", "Template:", "Special:", "Help:", "Wikipedia:"])
                         and len(seen_articles) < MAX_ARTICLES):
-                    seen_articles.add(urljoin(BASE_URL, href))
+                    article_url = urljoin(BASE_URL, href)
+                    if article_url not in seen_articles and robots.allowed(article_url):
+                        seen_articles[article_url] = None
 
             # Discover new subcategories
             for sc_link in soup.select("#mw-subcategories a[href^='/wiki/Category:']"):
-                subcat_url = urljoin(BASE_URL, sc_link["href"])
-                if subcat_url not in seen_subcats:
-                    queue.append(subcat_url)
+                categories.push(urljoin(BASE_URL, sc_link["href"]), depth + 1)
 
             # Handle pagination
             next_page = soup.find("a", string=lambda t: t and "next page" in t.lower())
             if next_page and next_page.get("href"):
-                queue.append(urljoin(BASE_URL, next_page["href"]))
+                # Same depth, ahead of that depth's other categories
+                categories.push(urljoin(BASE_URL, next_page["href"]), depth, priority=-1)
 
         except Exception as e:
-            print(f"[!] Error scanning {url}: {e}")
+            metrics.inc("discover.errors")
+            metrics.log("discover", "error", url=url, error=repr(e), interval=0)
             continue
 
-        print(f"  🌐 Articles: {len(seen_articles)} | Subcats queued: {len(queue)}")
+        metrics.set_gauge("queue.depth", len(categories), stage="category")
+        metrics.log("discover", articles=len(seen_articles), subcats_queued=len(categories),
+                    spilled=categories.spilled)
 
+    categories.close()
     return list(seen_articles)
 
 
 def extract_article(url):
-    try:
-        res = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-        res.raise_for_status()
+    res = fetcher.get(url, headers=HEADERS, timeout=TIMEOUT)
+    res.raise_for_status()
+    with metrics.timer("parse", stage="article"):
         soup = BeautifulSoup(res.text, "html.parser")
 
-        title = soup.find("h1", id="firstHeading").text.strip()
-        content_div = soup.find("div", class_="mw-parser-output")
-        if not content_div:
-            return None
-
-        for tag in content_div.select(".reflist, table, script, .navbox, .toc, style, .infobox, .mw-editsection"):
-            tag.decompose()
-        content = content_div.get_text(separator="\n", strip=True)
-
-        # Metadata
-        mod = soup.find("li", id="footer-info-lastmod")
-        date = mod.text.replace("This page was last edited on ", "").split(",")[0] if mod else "N/A"
-
-        cat_div = soup.find("div", id="catlinks")
-        cats = [a.text.strip() for a in cat_div.select("a[href^='/wiki/Category:']")] if cat_div else []
-
-        return {
-            "title": title,
-            "content": content,
-            "date": date,
-            "url": url,
-            "author": "Wikipedia Contributors",
-            "domain": urlparse(url).netloc,
-            "categories": ", ".join(cats)
-        }
-
-    except Exception as e:
-        print(f"[!] {url} failed: {e}")
+    t0 = time.perf_counter()
+    title = soup.find("h1", id="firstHeading").text.strip()
+    content_div = soup.find("div", class_="mw-parser-output")
+    if not content_div:
         return None
 
+    for tag in content_div.select(".reflist, table, script, .navbox, .toc, style, .infobox, .mw-editsection"):
+        tag.decompose()
+    content = content_div.get_text(separator="\n", strip=True)
+
+    # Metadata
+    mod = soup.find("li", id="footer-info-lastmod")
+    date = dates.normalize(mod.text, urlparse(url).netloc, default="N/A") if mod else "N/A"
+
+    cat_div = soup.find("div", id="catlinks")
+    cats = [a.text.strip() for a in cat_div.select("a[href^='/wiki/Category:']")] if cat_div else []
+    metrics.observe("extract", time.perf_counter() - t0, stage="article")
+
+    return Article(
+        title=title,
+        content=content,
+        date=date,
+        url=url,
+        author="Wikipedia Contributors",
+        domain=urlparse(url).netloc,
+        categories=", ".join(cats)
+    )
+
 def save_csv(records):
-    with open(OUTPUT_FILE, "w", newline='', encoding="utf-8") as f:
+    with metrics.timer("write"), open(OUTPUT_FILE, "w", newline='', encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=FIELDS)
         writer.writeheader()
         writer.writerows(records)
@@ -110,28 +127,23 @@ def save_csv(records):
 # ------------ MAIN SCRIPT ------------ #
 def main():
     t0 = time.time()
+    run = ledger.start("wikipedia")
+    stop_exporter = metrics.start_exporter(METRICS_FILE)
     print("== 🧠 High-Speed Wikipedia Scraper (10k+) ==\n")
     urls = get_all_article_links(START_CATEGORY)
 
-    seen_urls = set()
-    entries = []
-
-    print(f"\n🚀 Extracting {len(urls)} articles in parallel using {MAX_THREADS} threads...\n")
+    print(f"\n🚀 Extracting {len(urls)} articles in parallel (up to {MAX_THREADS} threads, adaptive per host)...\n")
 
-    with ThreadPoolExecutor(max_workers=MAX_THREADS) as executor:
-        futures = {executor.submit(extract_article, url): url for url in urls}
-        for idx, future in enumerate(as_completed(futures), 1):
-            result = future.result()
-            if result and result["url"] not in seen_urls:
-                entries.append(result)
-                seen_urls.add(result["url"])
-            if idx % 100 == 0 or len(entries) >= MAX_ARTICLES:
-                print(f"  ✅ Processed: {idx} | Valid: {len(entries)}")
-            if len(entries) >= MAX_ARTICLES:
-                break
+    # Failed articles are retried in the background and dead-lettered under "extract"
+    indexer = search.Indexer(source="wikipedia")
+    entries = pipeline.run_items(urls, extract_article, max_items=MAX_ARTICLES, workers=MAX_THREADS, name="extract",
+                                 on_record=indexer.add)
+    indexer.close()
 
     save_csv(entries)
-    print(f"\n⏱ Finished in {round(time.time() - t0, 2)} sec")
+    run.finish(discovered=len(urls), written=len(entries))
+    stop_exporter()
+    print(f"\n⏱ Finished in {round(time.time() - t0, 2)} sec (metrics: {METRICS_FILE})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,76 @@
+import html
+import re
+from datetime import datetime
+
+# ---------------- Patterns ----------------
+COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+REF_RE = re.compile(r"<ref[^>/]*?/>|<ref[^>]*?>.*?</ref>", re.DOTALL | re.IGNORECASE)
+DROP_BLOCK_RE = re.compile(r"<(gallery|math|score|syntaxhighlight|timeline|table)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+TEMPLATE_RE = re.compile(r"\{\{[^{}]*\}\}")
+TABLE_RE = re.compile(r"\{\|[^{]*?\|\}", re.DOTALL)
+LINK_RE = re.compile(r"\[\[([^\[\]]*)\]\]")
+EXT_LINK_RE = re.compile(r"\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]")
+TAG_RE = re.compile(r"</?[a-zA-Z][^>]*>")
+HEADING_RE = re.compile(r"^(=+)\s*(.*?)\s*\1\s*$", re.MULTILINE)
+QUOTES_RE = re.compile(r"'{2,}")
+LIST_RE = re.compile(r"^[*#:;]+\s*", re.MULTILINE)
+CATEGORY_RE = re.compile(r"\[\[\s*Category\s*:\s*([^|\]]+)", re.IGNORECASE)
+
+# Link namespaces whose target is dropped entirely rather than kept as text
+DROP_LINK_PREFIXES = ("file:", "image:", "category:", "media:")
+
+# Sections that are pure boilerplate in plain text (mirrors the .reflist/.navbox stripping)
+TRAILING_SECTIONS = ("References", "External links", "See also", "Further reading", "Notes", "Bibliography")
+TRAILING_RE = re.compile(r"^==\s*(?:%s)\s*==\s*$" % "|".join(TRAILING_SECTIONS), re.MULTILINE)
+
+
+# ---------------- Conversion ----------------
+def _replace_link(match):
+    inner = match.group(1)
+    if inner.lower().lstrip(": ").startswith(DROP_LINK_PREFIXES):
+        return ""
+    return inner.rsplit("|", 1)[-1]
+
+
+def _strip_nested(pattern, text, repl=""):
+    """Apply `pattern` until nothing matches, peeling nested constructs innermost-first."""
+    n = 1
+    while n:
+        text, n = pattern.subn(repl, text)
+    return text
+
+
+def extract_categories(wikitext):
+    """Category names declared in the page source (without the 'Category:' prefix)."""
+    names = (c.strip().replace("_", " ") for c in CATEGORY_RE.findall(wikitext))
+    return list(dict.fromkeys(n[:1].upper() + n[1:] for n in names if n))
+
+
+def format_timestamp(timestamp):
+    """'2025-05-12T10:00:00Z' -> '12 May 2025', matching the scraped 'last edited' footer."""
+    dt = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ")
+    return f"{dt.day} {dt:%B %Y}"
+
+
+def to_plain_text(wikitext):
+    """Convert article wikitext to readable plain text.
+
+    Drops templates (infoboxes, navboxes), tables, references, files and
+    categories, keeps link labels, and cuts the trailing reference sections.
+    """
+    cut = TRAILING_RE.search(wikitext)
+    if cut:
+        wikitext = wikitext[:cut.start()]
+    text = COMMENT_RE.sub("", wikitext)
+    text = REF_RE.sub("", text)
+    text = DROP_BLOCK_RE.sub("", text)
+    text = _strip_nested(TEMPLATE_RE, text)
+    text = _strip_nested(TABLE_RE, text)
+    text = _strip_nested(LINK_RE, text, _replace_link)
+    text = EXT_LINK_RE.sub(r"\1", text)
+    text = HEADING_RE.sub(r"\2", text)
+    text = QUOTES_RE.sub("", text)
+    text = TAG_RE.sub("", text)
+    text = LIST_RE.sub("", text)
+    text = html.unescape(text)
+    return "\n".join(line for line in (l.strip() for l in text.split("\n")) if line)
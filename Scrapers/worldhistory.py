@@ -1,100 +1,130 @@
-import requests
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 import csv
-import time
+
+import changes
+import dates
+import fetcher
+import ledger
+import metrics
+import pipeline
+import robots
+import search
+from model import Article
 
 HEADERS = {"User-Agent": "Mozilla/5.0"}
 SITEMAP_URL = "https://www.worldhistory.org/sitemap.xml"
 CSV_FILE = "worldhistory.csv"
+FIELDS = ["title", "content", "date", "author", "url", "domain", "categories"]
+RATE = 1.0                # article requests per second
 
 def get_sitemap_entries(sitemap_url):
+    """<loc> entries of one sitemap, or None if it could not be fetched or parsed."""
     try:
-        r = requests.get(sitemap_url, headers=HEADERS, timeout=10)
+        r = fetcher.get(sitemap_url, headers=HEADERS, timeout=10)
         r.raise_for_status()
         root = ET.fromstring(r.content)
         return [loc.text for loc in root.findall(".//{*}loc") if loc.text]
     except Exception as e:
         print(f"❌ Failed to fetch {sitemap_url}: {e}")
-        return []
+        return None
 
 def crawl_sitemaps(sitemap_url):
+    """Article URLs under `sitemap_url` and whether every sitemap in the tree was read."""
     entries = get_sitemap_entries(sitemap_url)
-    urls = []
-    if not entries:
-        return urls
+    if entries is None:
+        return [], False
 
-    if all(e.endswith(".xml") for e in entries):
+    urls, complete = [], True
+    if entries and all(e.endswith(".xml") for e in entries):
         for child_sitemap in entries:
-            urls += crawl_sitemaps(child_sitemap)
+            child_urls, child_complete = crawl_sitemaps(child_sitemap)
+            urls += child_urls
+            complete = complete and child_complete
     else:
         urls += [url for url in entries if "/article/" in url]
 
-    return urls
-
-def extract_article_data(url):
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=15)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.content, "html.parser")
-
-        # Title
-        title_tag = soup.select_one('div#title_bar h1#page_title_text')
-        title = title_tag.get_text(strip=True) if title_tag else ""
-
-        # Content
-        content_container = soup.select_one('div.text.body article')
-        content_paragraphs = content_container.find_all("p") if content_container else []
-        content = "\n".join(p.get_text(strip=True) for p in content_paragraphs)
-
-        # Author from <meta>
-        author_tag = soup.find("meta", attrs={"name": "author"})
-        author = author_tag["content"] if author_tag and "content" in author_tag.attrs else ""
-
-        # Date from <time>
-        date = ""
-        date_tag = soup.find("time")
-        if date_tag:
-            date = date_tag.get_text(strip=True)
-
-        return {
-            "title": title,
-            "content": content,
-            "date": date,
-            "author": author,
-            "url": url,
-            "domain": urlparse(url).netloc,
-            "categories": "History"
-        }
-    except Exception as e:
-        print(f"⚠️ Error extracting {url}: {e}")
-        return None
+    return urls, complete
+
+def fetch_article(url):
+    r = fetcher.get(url, headers=HEADERS, timeout=15)
+    r.raise_for_status()
+    return r
+
+def extract_article_data(url, page=None):
+    if page is None:
+        page = fetch_article(url).content
+    with metrics.timer("parse", domain=urlparse(url).netloc):
+        soup = BeautifulSoup(page, "html.parser")
+
+    # Title
+    title_tag = soup.select_one('div#title_bar h1#page_title_text')
+    title = title_tag.get_text(strip=True) if title_tag else ""
+
+    # Content
+    content_container = soup.select_one('div.text.body article')
+    content_paragraphs = content_container.find_all("p") if content_container else []
+    content = "\n".join(p.get_text(strip=True) for p in content_paragraphs)
+
+    # Author from <meta>
+    author_tag = soup.find("meta", attrs={"name": "author"})
+    author = author_tag["content"] if author_tag and "content" in author_tag.attrs else ""
+
+    # Date from <time>
+    date = ""
+    date_tag = soup.find("time")
+    if date_tag:
+        raw = date_tag.get("datetime") or date_tag.get_text(strip=True)
+        date = dates.normalize(raw, urlparse(url).netloc, default=raw)
+
+    return Article(
+        title=title,
+        content=content,
+        date=date,
+        author=author,
+        url=url,
+        domain=urlparse(url).netloc,
+        categories="History"
+    )
 
 def save_to_csv(data, filename):
-    keys = ["title", "content", "date", "author", "url", "domain", "categories"]
     with open(filename, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=keys)
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
         writer.writeheader()
         for row in data:
             if row:
                 writer.writerow(row)
 
 def main():
+    run = ledger.start("worldhistory")
     print(f"🌐 Crawling sitemaps from: {SITEMAP_URL}")
-    all_article_urls = crawl_sitemaps(SITEMAP_URL)
+    listed, complete = crawl_sitemaps(SITEMAP_URL)
+    all_article_urls = [u for u in listed if robots.allowed(u)]
     print(f"✅ Found {len(all_article_urls)} article URLs")
-
-    scraped_data = []
-    for i, url in enumerate(all_article_urls, start=1):
-        print(f"🔍 [{i}/{len(all_article_urls)}] Scraping: {url}")
-        data = extract_article_data(url)
-        if data:
-            scraped_data.append(data)
-        time.sleep(1)  # be polite to the server
-
-    print(f"\n💾 Saving {len(scraped_data)} articles to {CSV_FILE}")
-    save_to_csv(scraped_data, CSV_FILE)
+    if not complete:
+        print("⚠️ Some sitemaps failed; no articles will be treated as removed this run")
+
+    index = changes.for_dataset(CSV_FILE)
+
+    def scrape(url):
+        r = fetch_article(url)
+        if index.body_unchanged(url, r.content):
+            return None
+        record = extract_article_data(url, r.content)
+        return record if index.observe(record) != "unchanged" else None
+
+    # Failed articles are retried in the background and dead-lettered under "worldhistory".
+    # Only added/updated articles come back; the CSV is patched in place.
+    indexer = search.Indexer(source="worldhistory")
+    changed = pipeline.run_items(all_article_urls, scrape, rate=RATE, name="worldhistory",
+                                 on_record=indexer.add)
+    indexer.close()
+    # Removals only from a complete listing: a failed sitemap must not delete its slice of the CSV.
+    # The unfiltered listing is used so robots.txt hiccups don't count as removals either.
+    _, removed = index.commit(current=listed if complete and listed else None)
+    changes.merge_csv(CSV_FILE, FIELDS, changed, removed)
+    run.finish(discovered=len(all_article_urls), written=len(changed))
     print("✅ Done!")
 
 if __name__ == "__main__":